@@ -5,16 +5,57 @@ import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import duckdb
 
+from . import pyarrow_parquet_backend
+
+# COMPRESSION values DuckDB's COPY accepts, and the codecs run.py benchmarks by default.
+CODECS = ("uncompressed", "snappy", "gzip", "zstd", "brotli", "lz4", "lz4_raw")
+DEFAULT_CODECS = ("zstd", "snappy", "uncompressed")
+
 
 @dataclass
 class ParquetOptions:
     codec: str = "zstd"          # zstd, snappy, gzip, uncompressed
     row_group_size: int = 128_000
     compression_level: Optional[int] = None  # codec-dependent; DuckDB supports for some codecs
+    writer: str = "duckdb"       # duckdb (COPY) or pyarrow (needed for gzip/brotli levels)
+    # Multi-file layouts (DuckDB writer only); any of these writes a directory instead of one file.
+    partition_by: Optional[str] = None       # hive partitioning column: <dir>/<col>=<value>/*.parquet
+    per_thread_output: bool = False          # one file per writer thread
+    file_size_bytes: Optional[int] = None    # roll over to a new file past this size
+    # Point-lookup structures. DuckDB builds a bloom filter for every dictionary-encoded column
+    # chunk by default; pyarrow builds none unless asked. Page indexes need writer="pyarrow".
+    bloom_filter: Optional[bool] = None              # None: the writer's default
+    bloom_filter_fpp: Optional[float] = None         # false-positive ratio (DuckDB default: 0.01)
+    bloom_filter_columns: Optional[List[str]] = None  # pyarrow: columns to build filters for (default: all)
+    bloom_filter_ndv: Optional[Dict[str, int]] = None  # pyarrow: known NDV per column (e.g. the run's profile)
+    dictionary_size_limit: Optional[int] = None      # DuckDB: max dictionary entries per column chunk
+    dictionary_page_size: Optional[int] = None       # max dictionary page bytes before falling back to plain
+    page_index: bool = False                         # pyarrow: ColumnIndex/OffsetIndex (page-level min/max)
+    data_page_size: Optional[int] = None             # pyarrow: target data page bytes
+
+    @property
+    def multi_file(self) -> bool:
+        return bool(self.partition_by or self.per_thread_output or self.file_size_bytes)
+
+
+def layout_name(opts: ParquetOptions) -> str:
+    """'single', or the multi-file options joined, e.g. 'hive=city+per_thread'."""
+    parts = []
+    if opts.partition_by:
+        parts.append(f"hive={opts.partition_by}")
+    if opts.per_thread_output:
+        parts.append("per_thread")
+    if opts.file_size_bytes:
+        parts.append(f"file_size={opts.file_size_bytes}")
+    return "+".join(parts) or "single"
+
+
+# Refuse hive partitioning into more directories than this (one file each, at least).
+MAX_PARTITIONS = 10_000
 
 
 def _dir_size_bytes(p: Path) -> int:
@@ -27,21 +68,100 @@ def _dir_size_bytes(p: Path) -> int:
     return total
 
 
+def _bloom_filter_options(
+    con: duckdb.DuckDBPyConnection, table_name: str, opts: ParquetOptions
+) -> Dict[str, Dict[str, Any]]:
+    """
+    pyarrow bloom_filter_options: {col: {"ndv", "fpp"}}, sized for one row group's distinct values.
+
+    NDVs come from opts.bloom_filter_ndv; columns missing there are estimated together in
+    one approx_count_distinct scan.
+    """
+    columns = opts.bloom_filter_columns or [name for name, *_ in con.execute(f"DESCRIBE {table_name};").fetchall()]
+    ndvs = {col: opts.bloom_filter_ndv[col] for col in columns if col in (opts.bloom_filter_ndv or {})}
+    missing = [col for col in columns if col not in ndvs]
+    if missing:
+        select = ", ".join(f"approx_count_distinct({_quote_ident(col)})" for col in missing)
+        ndvs.update(zip(missing, con.execute(f"SELECT {select} FROM {table_name};").fetchone()))
+    out: Dict[str, Dict[str, Any]] = {}
+    for col in columns:
+        # pyarrow's default ndv (1M) makes every filter ~1 MiB, mostly empty for small row groups.
+        spec: Dict[str, Any] = {"ndv": max(1, min(int(ndvs[col] or 0), opts.row_group_size))}
+        if opts.bloom_filter_fpp is not None:
+            spec["fpp"] = opts.bloom_filter_fpp
+        out[col] = spec
+    return out
+
+
+def _write_pyarrow(con: duckdb.DuckDBPyConnection, table_name: str, out: Path, opts: ParquetOptions) -> None:
+    # DuckDB only honours COMPRESSION_LEVEL for zstd; pyarrow exposes levels for gzip/brotli too,
+    # and is the only writer here that can emit page indexes.
+    if not pyarrow_parquet_backend.available():
+        raise RuntimeError("writer='pyarrow' requires pyarrow")
+    kwargs: Dict[str, Any] = {"write_page_index": opts.page_index}
+    if opts.bloom_filter:
+        kwargs["bloom_filter_options"] = _bloom_filter_options(con, table_name, opts)
+    if opts.dictionary_page_size is not None:
+        kwargs["dictionary_pagesize_limit"] = opts.dictionary_page_size
+    if opts.data_page_size is not None:
+        kwargs["data_page_size"] = opts.data_page_size
+    pyarrow_parquet_backend.stream_write(
+        con,
+        table_name,
+        out,
+        opts.row_group_size,
+        compression=opts.codec,
+        compression_level=opts.compression_level,
+        **kwargs,
+    )
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
 def write(con: duckdb.DuckDBPyConnection, table_name: str, out_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
     """
     Contract: Write compressed Parquet from a DuckDB table and return:
       - compression_time_s
       - output_size_bytes
-      - metadata (codec, row_group_size, compression_level)
+      - metadata (codec, row_group_size, compression_level, layout, file_count,
+        bloom filter bytes and columns, page_index)
+
+    A single file by default. With partition_by / per_thread_output / file_size_bytes the
+    output is a directory (out_path without its .parquet suffix) of Parquet files.
     """
     out = Path(out_path)
     out.parent.mkdir(parents=True, exist_ok=True)
 
     opts = ParquetOptions(**options)
+    if opts.writer == "duckdb":
+        if opts.page_index or opts.data_page_size is not None:
+            raise ValueError("DuckDB's Parquet writer cannot write page indexes or size data pages; use writer='pyarrow'")
+        if opts.bloom_filter_columns:
+            raise ValueError("DuckDB builds bloom filters for every dictionary-encoded column; bloom_filter_columns needs writer='pyarrow'")
+    elif opts.dictionary_size_limit is not None:
+        raise ValueError("dictionary_size_limit is a DuckDB COPY option; use dictionary_page_size with writer='pyarrow'")
 
-    # We'll write a single parquet file for simplicity.
-    # If you prefer partitioned/folder output, change out_path and size calc still works.
-    if out.suffix.lower() != ".parquet":
+    partition_types: Optional[Dict[str, str]] = None
+    if opts.multi_file:
+        if opts.writer != "duckdb":
+            raise ValueError("Multi-file Parquet layouts need writer='duckdb'")
+        if opts.partition_by:
+            types = {name: col_type for name, col_type, *_ in con.execute(f"DESCRIBE {table_name};").fetchall()}
+            if opts.partition_by not in types:
+                raise ValueError(f"Partition column '{opts.partition_by}' not in {table_name}")
+            partition_types = {opts.partition_by: types[opts.partition_by]}
+            ndv = con.execute(
+                f"SELECT count(DISTINCT {_quote_ident(opts.partition_by)}) FROM {table_name};"
+            ).fetchone()[0]
+            if ndv > MAX_PARTITIONS:
+                raise ValueError(
+                    f"Partition column '{opts.partition_by}' has {ndv:,} distinct values (max {MAX_PARTITIONS:,})"
+                )
+        if out.suffix.lower() == ".parquet":
+            out = out.with_suffix("")
+    elif out.suffix.lower() != ".parquet":
         out = out / f"{table_name}.parquet"
         out.parent.mkdir(parents=True, exist_ok=True)
 
@@ -54,22 +174,47 @@ def write(con: duckdb.DuckDBPyConnection, table_name: str, out_path: str, option
     ]
     if opts.compression_level is not None:
         copy_parts.append(f", COMPRESSION_LEVEL {int(opts.compression_level)}")
+    if opts.partition_by:
+        copy_parts.append(f", PARTITION_BY ({_quote_ident(opts.partition_by)})")
+    if opts.per_thread_output:
+        copy_parts.append(", PER_THREAD_OUTPUT TRUE")
+    if opts.file_size_bytes:
+        copy_parts.append(f", FILE_SIZE_BYTES {int(opts.file_size_bytes)}")
+    if opts.bloom_filter is not None:
+        copy_parts.append(f", WRITE_BLOOM_FILTER {'true' if opts.bloom_filter else 'false'}")
+    if opts.bloom_filter_fpp is not None:
+        copy_parts.append(f", BLOOM_FILTER_FALSE_POSITIVE_RATIO {float(opts.bloom_filter_fpp)}")
+    if opts.dictionary_size_limit is not None:
+        copy_parts.append(f", DICTIONARY_SIZE_LIMIT {int(opts.dictionary_size_limit)}")
+    if opts.dictionary_page_size is not None:
+        copy_parts.append(f", STRING_DICTIONARY_PAGE_SIZE_LIMIT {int(opts.dictionary_page_size)}")
     copy_parts.append(");")
     sql = "".join(copy_parts)
 
     t0 = time.perf_counter()
-    con.execute(sql)
+    if opts.writer == "pyarrow":
+        _write_pyarrow(con, table_name, out, opts)
+    else:
+        con.execute(sql)
     t1 = time.perf_counter()
 
     size = _dir_size_bytes(out)
+    files = parquet_files(str(out))
     row_group_count = None
+    bloom_filter_bytes = None
+    bloom_filter_columns: Optional[List[str]] = None
     try:
-        rel = con.execute(f"PRAGMA parquet_metadata('{str(out)}')")
-        cols = [d[0] for d in rel.description]
-        rows = rel.fetchall()
-        if "row_group_id" in cols:
-            idx = cols.index("row_group_id")
-            row_group_count = len({r[idx] for r in rows})
+        # parquet_metadata is a table function; PRAGMA syntax is rejected by current DuckDB.
+        # Row-group ids restart per file, so count (file, row group) pairs.
+        row_group_count, bloom_filter_bytes, bloom_filter_columns = con.execute(
+            f"""
+            SELECT
+              count(DISTINCT (file_name, row_group_id)),
+              coalesce(sum(bloom_filter_length), 0),
+              coalesce(list(DISTINCT path_in_schema ORDER BY path_in_schema) FILTER (WHERE bloom_filter_length > 0), [])
+            FROM parquet_metadata({_file_list_sql(files)})
+            """
+        ).fetchone()
     except Exception:
         row_group_count = None
 
@@ -79,18 +224,112 @@ def write(con: duckdb.DuckDBPyConnection, table_name: str, out_path: str, option
         "codec": opts.codec,
         "row_group_size": opts.row_group_size,
         "compression_level": opts.compression_level,
+        "writer": opts.writer,
         "parquet_path": str(out),
         "row_group_count": row_group_count,
+        "layout": layout_name(opts),
+        "partition_by": opts.partition_by,
+        "partition_types": partition_types,
+        "per_thread_output": opts.per_thread_output,
+        "file_size_bytes": opts.file_size_bytes,
+        "file_count": len(files),
+        "partition_count": len({f.parent for f in files}) if opts.partition_by else None,
+        "bloom_filter_bytes": bloom_filter_bytes,
+        "bloom_filter_columns": bloom_filter_columns,
+        "page_index": opts.page_index,
     }
 
 
-def scan_expr(out_path: str) -> str:
+def parquet_files(out_path: str) -> List[Path]:
+    """The Parquet files of a written output (the file itself, or every file under the directory)."""
+    p = Path(out_path)
+    if p.is_dir():
+        return sorted(p.rglob("*.parquet"))
+    return [p] if p.exists() else []
+
+
+def _file_list_sql(files: List[Path]) -> str:
+    return "[" + ", ".join("'" + str(f).replace("'", "''") + "'" for f in files) + "]"
+
+
+def scan_expr(out_path: str, partition_types: Optional[Dict[str, str]] = None, filename: bool = False) -> str:
     """
     Contract: return SQL FROM expression for reading the compressed data.
+
+    partition_types ({col: type}, from write()'s metadata) marks a hive-partitioned
+    directory; the partition column comes back from the paths with its original type.
+    filename adds the source file of each row as a `filename` column.
     """
     p = Path(out_path)
+    extra = ", filename=true" if filename else ""
     if p.is_dir():
         # if output is a folder, read all parquet files in it
-        return f"read_parquet('{str(p)}/**/*.parquet')"
+        if partition_types:
+            types = ", ".join(f"'{col}': '{col_type}'" for col, col_type in partition_types.items())
+            return f"read_parquet('{str(p)}/**/*.parquet', hive_partitioning=true, hive_types={{{types}}}{extra})"
+        return f"read_parquet('{str(p)}/**/*.parquet', hive_partitioning=false{extra})"
     # single file
-    return f"read_parquet('{str(p)}')"
+    return f"read_parquet('{str(p)}'{extra})"
+
+
+def row_group_pruning(
+    con: duckdb.DuckDBPyConnection,
+    parquet_path: str,
+    col: str,
+    value_sql: str,
+    col_type: str,
+) -> Dict[str, Any]:
+    """
+    Count row groups an equality predicate `col = value` can skip via min/max statistics.
+
+    A row group is prunable when its stats exclude the value; row groups without
+    usable stats are counted as scanned, matching what the reader can skip.
+    parquet_path may be a multi-file output directory.
+    """
+    col_sql = col.replace("'", "''")
+    total, pruned = con.execute(
+        f"""
+        SELECT
+          count(DISTINCT (file_name, row_group_id)),
+          count(DISTINCT (file_name, row_group_id)) FILTER (
+            WHERE NOT (TRY_CAST(stats_min_value AS {col_type}) <= {value_sql}
+                       AND {value_sql} <= TRY_CAST(stats_max_value AS {col_type}))
+          )
+        FROM parquet_metadata({_file_list_sql(parquet_files(parquet_path))})
+        WHERE path_in_schema = '{col_sql}'
+        """
+    ).fetchone()
+    return {
+        "row_groups": total,
+        "pruned_row_groups": pruned,
+        "pruned_fraction": (pruned / total) if total else None,
+    }
+
+
+def bloom_filter_pruning(
+    con: duckdb.DuckDBPyConnection,
+    parquet_path: str,
+    col: str,
+    value_sql: str,
+) -> Dict[str, Any]:
+    """
+    Count row groups whose bloom filter rules out `col = value` (DuckDB's parquet_bloom_probe).
+
+    Row groups without a filter for col are never excluded. Complements row_group_pruning:
+    bloom filters exclude values that fall inside a row group's min/max range.
+    """
+    col_sql = col.replace("'", "''")
+    total = excluded = 0
+    for f in parquet_files(parquet_path):
+        path_sql = str(f).replace("'", "''")
+        n, n_excluded = con.execute(
+            f"SELECT count(*), count(*) FILTER (WHERE bloom_filter_excludes) "
+            f"FROM parquet_bloom_probe('{path_sql}', '{col_sql}', {value_sql})"
+        ).fetchone()
+        total += n
+        excluded += n_excluded
+    return {
+        "row_groups": total,
+        "excluded_row_groups": excluded,
+        "excluded_fraction": (excluded / total) if total else None,
+    }
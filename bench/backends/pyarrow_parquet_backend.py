@@ -0,0 +1,215 @@
+# bench/backends/pyarrow_parquet_backend.py
+"""Parquet written by Arrow's C++ writer (pyarrow.parquet.ParquetWriter).
+
+parquet_backend writes with DuckDB's COPY; this backend writes the way Arrow
+producers do. The base table is streamed out of DuckDB as Arrow record batches
+and regrouped into full row groups, because ParquetWriter starts a new row group
+on every write call. Only one row group is held in memory at a time. The result
+is one .parquet file, read back with parquet_backend.scan_expr, so queries
+measure the writer and not a different reader.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import duckdb
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # optional: pyarrow is not in requirements.txt
+    pa = None
+    pq = None
+
+# Rows per Arrow record batch fetched from DuckDB.
+DEFAULT_BATCH_ROWS = 131_072
+# The repo's codec names (DuckDB's COMPRESSION values) -> ParquetWriter's compression names.
+CODECS = {
+    "uncompressed": "none",
+    "snappy": "snappy",
+    "gzip": "gzip",
+    "zstd": "zstd",
+    "brotli": "brotli",
+    "lz4": "lz4",
+    "lz4_raw": "lz4_raw",
+}
+# Encodings ParquetWriter accepts in column_encoding (dictionary encoding is use_dictionary).
+ENCODINGS = ("PLAIN", "BYTE_STREAM_SPLIT", "DELTA_BINARY_PACKED", "DELTA_LENGTH_BYTE_ARRAY", "DELTA_BYTE_ARRAY")
+
+
+@dataclass
+class PyArrowParquetOptions:
+    codec: str = "zstd"          # a CODECS key: zstd, snappy, gzip, brotli, lz4, lz4_raw, uncompressed
+    row_group_size: int = 128_000
+    compression_level: Optional[int] = None
+    batch_rows: int = DEFAULT_BATCH_ROWS
+    data_page_size: Optional[int] = None     # target data page bytes (pyarrow default: 1 MiB)
+    use_dictionary: bool = True              # columns given an explicit encoding never use a dictionary
+    # {col: encoding}, or "auto": DELTA_BINARY_PACKED for integers, BYTE_STREAM_SPLIT for floats.
+    column_encoding: Optional[Union[str, Dict[str, str]]] = None
+    write_statistics: Union[bool, List[str]] = True   # min/max/null count for all, none, or these columns
+
+
+def available() -> bool:
+    return pq is not None
+
+
+def pyarrow_codec(codec: str) -> str:
+    """A repo codec name ('uncompressed', 'zstd', ...) -> the compression name ParquetWriter expects."""
+    name = CODECS.get(codec.strip().lower())
+    if name is None:
+        raise ValueError(f"Unknown Parquet codec '{codec}' for the pyarrow writer (expected one of {', '.join(CODECS)})")
+    return name
+
+
+def parse_column_encoding(spec: str) -> Union[str, Dict[str, str]]:
+    """'auto' or 'id=DELTA_BINARY_PACKED,amount=BYTE_STREAM_SPLIT' -> column_encoding option."""
+    if spec.strip().lower() == "auto":
+        return "auto"
+    out: Dict[str, str] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        col, sep, encoding = part.partition("=")
+        encoding = encoding.strip().upper()
+        if not sep or not col.strip():
+            raise ValueError(f"Expected col=ENCODING, got '{part}'")
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding '{encoding}' for {col.strip()} (expected one of {', '.join(ENCODINGS)})")
+        out[col.strip()] = encoding
+    return out
+
+
+def resolve_column_encoding(schema, column_encoding: Optional[Union[str, Dict[str, str]]]) -> Dict[str, str]:
+    """Expand "auto" against an Arrow schema and check explicit columns exist."""
+    if not column_encoding:
+        return {}
+    if column_encoding == "auto":
+        out = {}
+        for field in schema:
+            if pa.types.is_integer(field.type):
+                out[field.name] = "DELTA_BINARY_PACKED"
+            elif pa.types.is_floating(field.type):
+                out[field.name] = "BYTE_STREAM_SPLIT"
+        return out
+    missing = [col for col in column_encoding if col not in schema.names]
+    if missing:
+        raise ValueError(f"column_encoding names unknown columns: {', '.join(missing)}")
+    return dict(column_encoding)
+
+
+def _row_groups(reader, row_group_size: int) -> Iterator[Any]:
+    """Regroup a RecordBatchReader's batches into tables of exactly row_group_size rows (the last may be short)."""
+    pending: List[Any] = []
+    rows = 0
+    for batch in reader:
+        while batch.num_rows:
+            take = min(batch.num_rows, row_group_size - rows)
+            pending.append(batch.slice(0, take))
+            rows += take
+            batch = batch.slice(take)
+            if rows == row_group_size:
+                yield pa.Table.from_batches(pending, schema=reader.schema)
+                pending, rows = [], 0
+    if pending:
+        yield pa.Table.from_batches(pending, schema=reader.schema)
+
+
+def stream_write(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    out: Path,
+    row_group_size: int,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    column_encoding: Optional[Union[str, Dict[str, str]]] = None,
+    use_dictionary: bool = True,
+    **writer_kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Stream table_name into one Parquet file with ParquetWriter; writer_kwargs go to ParquetWriter,
+    except that `compression` takes the repo's codec names (see CODECS).
+
+    Returns {"rows", "row_groups", "column_encoding"} (the resolved per-column encodings).
+    """
+    if pq is None:
+        raise RuntimeError("The pyarrow Parquet writer requires pyarrow")
+    if "compression" in writer_kwargs:
+        writer_kwargs["compression"] = pyarrow_codec(writer_kwargs["compression"])
+    reader = con.execute(f"SELECT * FROM {table_name}").to_arrow_reader(batch_rows)
+    encodings = resolve_column_encoding(reader.schema, column_encoding)
+    if encodings:
+        # ParquetWriter rejects column_encoding for dictionary-encoded columns.
+        writer_kwargs["column_encoding"] = encodings
+        dictionary: Union[bool, List[str]] = (
+            [name for name in reader.schema.names if name not in encodings] if use_dictionary else False
+        )
+    else:
+        dictionary = use_dictionary
+    rows = row_groups = 0
+    with pq.ParquetWriter(str(out), reader.schema, use_dictionary=dictionary, **writer_kwargs) as writer:
+        for group in _row_groups(reader, row_group_size):
+            writer.write_table(group, row_group_size=row_group_size)
+            rows += group.num_rows
+            row_groups += 1
+    return {"rows": rows, "row_groups": row_groups, "column_encoding": encodings}
+
+
+def write(con: duckdb.DuckDBPyConnection, table_name: str, out_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Contract: Write compressed Parquet from a DuckDB table with pyarrow and return:
+      - compression_time_s
+      - output_size_bytes
+      - metadata (codec, row_group_size, compression_level, the pyarrow writer options)
+
+    Same metadata keys as parquet_backend.write for a single file, so the result can
+    be scanned and reported like any other Parquet format.
+    """
+    opts = PyArrowParquetOptions(**options)
+    out = Path(out_path)
+    if out.suffix.lower() != ".parquet":
+        out = out / f"{table_name}.parquet"
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    writer_kwargs: Dict[str, Any] = {
+        "compression": opts.codec,
+        "compression_level": opts.compression_level,
+        "write_statistics": opts.write_statistics,
+    }
+    if opts.data_page_size is not None:
+        writer_kwargs["data_page_size"] = opts.data_page_size
+
+    t0 = time.perf_counter()
+    written = stream_write(
+        con,
+        table_name,
+        out,
+        opts.row_group_size,
+        batch_rows=opts.batch_rows,
+        column_encoding=opts.column_encoding,
+        use_dictionary=opts.use_dictionary,
+        **writer_kwargs,
+    )
+    t1 = time.perf_counter()
+
+    return {
+        "compression_time_s": t1 - t0,
+        "output_size_bytes": out.stat().st_size,
+        "codec": opts.codec,
+        "row_group_size": opts.row_group_size,
+        "compression_level": opts.compression_level,
+        "writer": "pyarrow",
+        "writer_version": pa.__version__,
+        "parquet_path": str(out),
+        "row_group_count": written["row_groups"],
+        "layout": "single",
+        "partition_types": None,
+        "file_count": 1,
+        "batch_rows": opts.batch_rows,
+        "data_page_size": opts.data_page_size,
+        "use_dictionary": opts.use_dictionary,
+        "column_encoding": written["column_encoding"],
+        "write_statistics": opts.write_statistics,
+    }
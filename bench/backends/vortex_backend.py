@@ -29,6 +29,7 @@ import duckdb
 class VortexOptions:
     # DuckDB public docs currently show only FORMAT vortex. We keep "compact" for
     # compatibility/labeling; it is not translated into a DuckDB COPY option.
+    # vortex_native_backend writes a real compact file with the vortex package.
     compact: bool = False
 
 
@@ -0,0 +1,145 @@
+"""bench/backends/vortex_native_backend.py
+
+Vortex through the `vortex` Python package (vortex-data), without DuckDB's extension.
+
+vortex_backend writes and reads Vortex with the DuckDB extension (`COPY ... (FORMAT
+vortex)`, `read_vortex()`), so its numbers mix the format with the extension's
+integration. This backend calls the Vortex writer and scanner directly:
+
+  write: the base table is streamed out of DuckDB as Arrow record batches into
+         vortex.io.VortexWriteOptions.<strategy>().write(...)
+  scan:  vx.open(path).to_dataset() is a pyarrow-Dataset-style view; to_table() /
+         head() push the column projection and the filter expression into the Vortex
+         scan and return Arrow.
+
+Write strategies (vortex.io.VortexWriteOptions constructors):
+  default  Vortex's default layout and compressor
+  compact  the compact strategy, trading write and decode speed for a smaller file
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import duckdb
+
+try:
+    import vortex as vx
+    import vortex.io as vxio
+except Exception:  # optional: the vortex package is not in requirements.txt
+    vx = None
+    vxio = None
+
+try:
+    import pyarrow.compute as pc
+except Exception:  # vortex depends on pyarrow, so this only fails together with it
+    pc = None
+
+STRATEGIES = ("default", "compact")
+# Rows per Arrow record batch fetched from DuckDB.
+DEFAULT_BATCH_ROWS = 131_072
+
+
+@dataclass
+class VortexNativeOptions:
+    strategy: str = "default"    # default or compact (VortexWriteOptions constructors)
+    batch_rows: int = DEFAULT_BATCH_ROWS
+
+
+def available() -> bool:
+    return vx is not None and pc is not None
+
+
+def get_version_info() -> Dict[str, Optional[str]]:
+    return {"vortex": getattr(vx, "__version__", None) if vx is not None else None}
+
+
+def parse_strategies(spec: str) -> List[str]:
+    """'default,compact' -> strategies, in the given order."""
+    out: List[str] = []
+    for part in spec.split(","):
+        name = part.strip().lower()
+        if not name:
+            continue
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown Vortex write strategy '{name}' (expected one of {', '.join(STRATEGIES)})")
+        if name not in out:
+            out.append(name)
+    return out
+
+
+def _write_options(strategy: str) -> Any:
+    # VortexWriteOptions.default() / .compact(); a missing constructor means an older vortex.
+    factory = getattr(vxio.VortexWriteOptions, strategy, None)
+    if factory is None:
+        raise RuntimeError(f"vortex {get_version_info()['vortex']} has no '{strategy}' write strategy")
+    return factory()
+
+
+def write(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    out_path: str,
+    options: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Stream a DuckDB table into a Vortex file with the vortex package's writer."""
+    if not available():
+        raise RuntimeError("The native Vortex backend requires the vortex package (pip install vortex-data)")
+    opts = VortexNativeOptions(**options)
+    if opts.strategy not in STRATEGIES:
+        raise ValueError(f"Unknown Vortex write strategy '{opts.strategy}'")
+
+    out = Path(out_path)
+    if out.suffix.lower() != ".vortex":
+        out = out / f"{table_name}_{opts.strategy}.vortex"
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    writer = _write_options(opts.strategy)
+    t0 = time.perf_counter()
+    reader = con.execute(f"SELECT * FROM {table_name}").to_arrow_reader(opts.batch_rows)
+    writer.write(reader, str(out))
+    t1 = time.perf_counter()
+
+    return {
+        "format": "vortex",
+        "variant": f"vortex_native_{opts.strategy}",
+        "writer": "vortex-python",
+        "strategy": opts.strategy,
+        "compression_time_s": t1 - t0,
+        "output_size_bytes": out.stat().st_size,
+        "vortex_path": str(out),
+        "batch_rows": opts.batch_rows,
+        **get_version_info(),
+    }
+
+
+def open_dataset(path: str) -> Any:
+    """A pyarrow-Dataset-style view of a Vortex file; scans push projection and filter into Vortex."""
+    return vx.open(str(path)).to_dataset()
+
+
+def scan(
+    dataset: Any,
+    columns: Optional[List[str]] = None,
+    filter: Any = None,
+    limit: Optional[int] = None,
+) -> Any:
+    """
+    Read `columns` (all when None) of the rows matching `filter` (a pyarrow.compute
+    expression) into an Arrow table; limit stops after that many rows.
+    """
+    if limit is not None:
+        return dataset.head(limit, columns=columns, filter=filter)
+    return dataset.to_table(columns=columns, filter=filter)
+
+
+def equals(col: str, value: Any) -> Any:
+    """pyarrow.compute expression for `col = value`."""
+    return pc.field(col) == value
+
+
+def column_min(table: Any, col: str) -> Any:
+    return pc.min(table.column(col)).as_py()
@@ -0,0 +1,174 @@
+# bench/cold_cache.py
+"""Cold-cache query timing.
+
+Each cold sample evicts the scanned files from the OS page cache and then runs
+the query in a fresh Python process on a fresh DuckDB connection, so neither
+the page cache nor DuckDB's metadata/buffer caches are warm. The worker's
+connection gets the benchmark connection's threads, memory_limit and spill
+directory, and reports the bytes it read from storage (/proc/self/io
+read_bytes) during the query: the eviction method is only named in cold_method
+when the cold run actually went to storage. Run as a script, this module is
+the per-sample worker: it reads a JSON job from stdin and prints the timing as
+JSON.
+"""
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import duckdb
+
+from utils_run import _read_proc_kv, configure_connection
+
+
+def _iter_files(paths: List[str]) -> List[Path]:
+    out: List[Path] = []
+    for raw in paths:
+        p = Path(raw)
+        if p.is_dir():
+            out.extend(f for f in sorted(p.rglob("*")) if f.is_file())
+        elif p.is_file():
+            out.append(p)
+    return out
+
+
+def eviction_method() -> str:
+    if hasattr(os, "posix_fadvise") and hasattr(os, "POSIX_FADV_DONTNEED"):
+        return "posix_fadvise_dontneed"
+    return "none"
+
+
+def evict_file_pages(paths: List[str]) -> str:
+    """
+    Drop cached pages of the given files (and files under given directories).
+
+    Returns the eviction method label; "none" when the platform has no
+    posix_fadvise, in which case cold samples only get a fresh process and
+    connection. Dirty pages are flushed first because DONTNEED skips them.
+    """
+    method = eviction_method()
+    if method == "none":
+        return method
+    for f in _iter_files(paths):
+        try:
+            fd = os.open(str(f), os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return method
+
+
+def run_cold_query(
+    sql: str,
+    files: List[str],
+    setup_sql: Optional[List[str]] = None,
+    samples: int = 1,
+    settings: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Time `samples` cold runs of sql, each after eviction in a new process.
+
+    settings are utils_run.configure_connection arguments (threads, memory_limit,
+    temp_directory) for the worker's connection; it spills into a "cold" subdirectory
+    of temp_directory so it never shares temp files with the benchmark connection.
+    cold_method is "process+<eviction>" only when every sample read from storage,
+    "process+eviction_failed" when a sample read nothing (its pages were still cached)
+    and "process+eviction_unverified" when /proc/self/io is unavailable.
+
+    A failing child stops the samples; cold_ms is then None and cold_error holds the
+    child's error (the last line of its stderr), so only this query's cold timing is lost.
+    """
+    job = json.dumps({"sql": sql, "setup_sql": setup_sql or [], "settings": settings or {}})
+    samples_ms: List[float] = []
+    read_bytes: List[Optional[int]] = []
+    method = eviction_method()
+    for _ in range(max(1, samples)):
+        method = evict_file_pages(files)
+        try:
+            proc = subprocess.run(
+                [sys.executable, str(Path(__file__).resolve())],
+                input=job,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        except subprocess.CalledProcessError as exc:
+            return {
+                "cold_ms": None,
+                "cold_samples_ms": samples_ms,
+                "cold_read_bytes": read_bytes,
+                "cold_method": f"process+{_verified_method(method, read_bytes)}",
+                "cold_error": _child_error(exc),
+            }
+        sample = json.loads(proc.stdout)
+        samples_ms.append(sample["ms"])
+        read_bytes.append(sample["read_bytes"])
+    return {
+        "cold_ms": statistics.median(samples_ms),
+        "cold_samples_ms": samples_ms,
+        "cold_read_bytes": read_bytes,
+        "cold_method": f"process+{_verified_method(method, read_bytes)}",
+    }
+
+
+def _verified_method(method: str, read_bytes: List[Optional[int]]) -> str:
+    """The eviction method if the samples show it worked (each read from storage)."""
+    if method == "none":
+        return method
+    if not read_bytes or any(b is None for b in read_bytes):
+        return "eviction_unverified"
+    if any(b == 0 for b in read_bytes):
+        return "eviction_failed"
+    return method
+
+
+def _disk_read_bytes() -> Optional[int]:
+    """Bytes this process has fetched from storage (page-cache hits excluded); None without /proc."""
+    val = _read_proc_kv("/proc/self/io").get("read_bytes")
+    return int(val) if val is not None else None
+
+
+def _child_error(exc: subprocess.CalledProcessError) -> str:
+    lines = [line for line in (exc.stderr or "").splitlines() if line.strip()]
+    if lines:
+        return lines[-1].strip()
+    return f"cold query process exited with status {exc.returncode}"
+
+
+def _main() -> None:
+    job = json.loads(sys.stdin.read())
+    settings = dict(job.get("settings") or {})
+    if settings.get("temp_directory"):
+        settings["temp_directory"] = str(Path(settings["temp_directory"]) / "cold")
+    con = duckdb.connect(database=":memory:")
+    try:
+        configure_connection(con, **settings)
+        for stmt in job.get("setup_sql", []):
+            con.execute(stmt)
+        before = _disk_read_bytes()
+        t0 = time.perf_counter()
+        con.execute(job["sql"]).fetchone()
+        t1 = time.perf_counter()
+        after = _disk_read_bytes()
+    except duckdb.Error as exc:
+        # One line on stderr for run_cold_query's cold_error instead of a traceback.
+        sys.exit(f"{type(exc).__name__}: {str(exc).splitlines()[0]}")
+    read_bytes = after - before if before is not None and after is not None else None
+    print(json.dumps({"ms": (t1 - t0) * 1000.0, "read_bytes": read_bytes}))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,576 @@
+# bench/format_runner.py
+"""Per-format benchmark tasks.
+
+Each output format (duckdb_table baseline, one Parquet codec, Vortex) is a
+FormatTask. run_format_task writes the format from the base table, runs the
+workload against it, measures decompression and validates it, returning the
+report body plus CSV rows. Tasks run either in-process on the main connection
+(sequential mode) or in spawned worker processes with their own connection
+(isolated mode, see run_isolated).
+"""
+from __future__ import annotations
+
+import contextlib
+import itertools
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import duckdb
+
+from backends import parquet_backend, pyarrow_parquet_backend
+from cold_cache import run_cold_query
+try:
+    from backends import vortex_backend
+    _VORTEX_AVAILABLE = True
+except Exception:
+    vortex_backend = None
+    _VORTEX_AVAILABLE = False
+from utils_run import (
+    AdaptiveRepeats,
+    MemoryPhases,
+    _describe_types,
+    _format_filter_value,
+    _parquet_encodings,
+    _parse_casts,
+    _parse_list,
+    _quote_ident,
+    _row,
+    _validation_counts,
+    _validation_report,
+    _vortex_encodings,
+    _vortex_numeric_expr,
+    configure_connection,
+    query_profile,
+    timed_query,
+)
+from memory_sweep import run_memory_sweep
+from thread_sweep import run_thread_sweep
+from throughput import run_throughput
+from workload import ScanBinding, WorkloadContext, bind_workload, run_workload
+
+
+@dataclass
+class FormatTask:
+    name: str                # report["formats"] key
+    backend: str             # duckdb_table, parquet, parquet_pyarrow, vortex
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RunContext:
+    args: Any                # parsed run.py arguments
+    table: str
+    source_table: str
+    out_dir: str
+    run_tag: str
+    workload: Dict[str, Any]
+    workload_ctx: WorkloadContext
+    filter_val_sql: str
+    input_size_bytes: Optional[int]
+    base_validation: Optional[Dict[str, Any]]
+    column_ndv: Optional[Dict[str, int]] = None  # NDV per column from the run's column profile
+
+
+_decomp_ids = itertools.count(1)
+
+
+def format_tasks(args, parquet_codecs: List[str]) -> List[FormatTask]:
+    tasks: List[FormatTask] = []
+    if args.baseline_duckdb:
+        tasks.append(FormatTask("duckdb_table", "duckdb_table"))
+    for codec in parquet_codecs:
+        if "duckdb" in args.parquet_writers:
+            tasks.append(
+                FormatTask(
+                    f"parquet_{codec}",
+                    "parquet",
+                    {
+                        "codec": codec,
+                        "row_group_size": args.parquet_row_group_size,
+                        "compression_level": args.parquet_compression_level if codec == "zstd" else None,
+                        "partition_by": args.parquet_partition_by,
+                        "per_thread_output": args.parquet_per_thread_output,
+                        "file_size_bytes": args.parquet_file_size,
+                    },
+                )
+            )
+        if "pyarrow" in args.parquet_writers:
+            tasks.append(
+                FormatTask(
+                    f"parquet_pyarrow_{codec}",
+                    "parquet_pyarrow",
+                    {
+                        "codec": codec,
+                        "row_group_size": args.parquet_row_group_size,
+                        "compression_level": args.parquet_compression_level if codec == "zstd" else None,
+                        "batch_rows": args.pyarrow_batch_rows,
+                        "data_page_size": args.pyarrow_data_page_size,
+                        "use_dictionary": args.pyarrow_dictionary,
+                        "column_encoding": args.pyarrow_encodings,
+                        "write_statistics": args.pyarrow_statistics,
+                    },
+                )
+            )
+    tasks.append(FormatTask("vortex_default", "vortex", {"compact": args.vortex_compact}))
+    return tasks
+
+
+def _time_decompress(con: duckdb.DuckDBPyConnection, scan_expr: str) -> float:
+    tmp_name = f"decomp_{next(_decomp_ids)}"
+    t0 = time.perf_counter()
+    con.execute(f"CREATE OR REPLACE TEMP TABLE {tmp_name} AS SELECT * FROM {scan_expr};")
+    t1 = time.perf_counter()
+    con.execute(f"DROP TABLE {tmp_name};")
+    return t1 - t0
+
+
+def _speed_fields(meta: Dict[str, Any], input_size_bytes: Optional[int]) -> None:
+    ctime = meta.get("compression_time_s")
+    if input_size_bytes and ctime:
+        meta["compression_speed_mb_s"] = (input_size_bytes / (1024 * 1024)) / ctime
+    else:
+        meta["compression_speed_mb_s"] = None
+
+
+def _decompression_fields(con: duckdb.DuckDBPyConnection, meta: Dict[str, Any], scan_expr: str) -> None:
+    decomp_time_s = _time_decompress(con, scan_expr)
+    meta["decompression_time_s"] = decomp_time_s
+    if meta.get("output_size_bytes") and decomp_time_s:
+        meta["decompression_speed_mb_s"] = (meta["output_size_bytes"] / (1024 * 1024)) / decomp_time_s
+    else:
+        meta["decompression_speed_mb_s"] = None
+
+
+def _compression_ratio(meta: Dict[str, Any], input_size_bytes: Optional[int]) -> Optional[float]:
+    if input_size_bytes and meta.get("output_size_bytes"):
+        return input_size_bytes / meta["output_size_bytes"]
+    return None
+
+
+def _timer(
+    con: duckdb.DuckDBPyConnection,
+    args,
+    table_rows: Optional[int] = None,
+    files: Optional[List[str]] = None,
+    setup_sql: Optional[List[str]] = None,
+) -> Callable[[str], Dict[str, Any]]:
+    """Build the workload's time function; --cold-mode process needs the files backing the scan."""
+    cold_runner: Optional[Callable[[str], Dict[str, Any]]] = None
+    if args.cold_mode == "process" and files:
+        # The cold worker runs under the same memory configuration as the warm runs.
+        settings = {
+            "threads": args.threads,
+            "memory_limit": args.memory_limit,
+            "temp_directory": (
+                con.execute("SELECT current_setting('temp_directory')").fetchone()[0] if args.temp_directory else None
+            ),
+        }
+
+        def _cold(sql: str) -> Dict[str, Any]:
+            return run_cold_query(
+                sql,
+                files,
+                setup_sql=setup_sql,
+                samples=args.cold_samples,
+                settings=settings,
+            )
+
+        cold_runner = _cold
+
+    adaptive = None
+    if args.adaptive_repeats:
+        adaptive = AdaptiveRepeats(
+            target_rel_width=args.target_ci_width,
+            time_budget_s=args.repeat_time_budget_s,
+            min_runs=args.min_repeats,
+            max_runs=args.max_repeats,
+        )
+
+    def _time(sql: str) -> Dict[str, Any]:
+        m = timed_query(
+            con,
+            sql,
+            repeats=args.repeats,
+            warmup=args.warmup,
+            include_cold=args.include_cold,
+            cold_runner=cold_runner,
+            adaptive=adaptive,
+        )
+        if args.query_profile:
+            # Separate, untimed run so profiling overhead never lands in the medians.
+            m["profile"] = query_profile(con, sql, table_rows=table_rows)
+        return m
+
+    return _time
+
+
+def _throughput(
+    con: duckdb.DuckDBPyConnection,
+    rc: RunContext,
+    binding: ScanBinding,
+    rows: List[Dict[str, Any]],
+    setup_sql: Optional[List[str]] = None,
+) -> Optional[Dict[str, Any]]:
+    """--throughput-clients: replay the bound workload with concurrent clients (one CSV row per level)."""
+    args = rc.args
+    if not args.throughput_clients:
+        return None
+    queries = [(bq.name, bq.sql) for bq in bind_workload(rc.workload, binding, rc.workload_ctx)]
+    tp = run_throughput(con, queries, args.throughput_clients, args.throughput_duration_s, setup_sql=setup_sql)
+    for level in tp["levels"]:
+        rows.append(
+            _row(
+                args,
+                binding.fmt,
+                binding.variant,
+                "throughput",
+                None,
+                binding.write_meta,
+                {"median_ms": level["p50_ms"], "p95_ms": level["p95_ms"], "runs": level["completed"]},
+                extras={"clients": level["clients"], "qps": level["qps"], "time_ms_p99": level["p99_ms"]},
+            )
+        )
+    return tp
+
+
+def _thread_scaling(
+    con: duckdb.DuckDBPyConnection,
+    rc: RunContext,
+    binding: ScanBinding,
+    rows: List[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """--thread-sweep: re-time the bound workload per thread count (one CSV row per family and count)."""
+    args = rc.args
+    if not args.thread_sweep:
+        return None
+    queries = [(bq.name, bq.sql) for bq in bind_workload(rc.workload, binding, rc.workload_ctx)]
+    sweep = run_thread_sweep(con, queries, args.thread_sweep, repeats=args.repeats, warmup=args.warmup)
+    for family, curves in sweep["families"].items():
+        for i, t in enumerate(sweep["threads"]):
+            rows.append(
+                _row(
+                    args,
+                    binding.fmt,
+                    binding.variant,
+                    "thread_scaling",
+                    None,
+                    binding.write_meta,
+                    {"median_ms": curves["median_ms"][i]},
+                    extras={
+                        "query_family": family,
+                        "threads": t,
+                        "speedup": curves["speedup"][i],
+                        "parallel_efficiency": curves["efficiency"][i],
+                    },
+                )
+            )
+    return sweep
+
+
+def _memory_limits(
+    con: duckdb.DuckDBPyConnection,
+    rc: RunContext,
+    binding: ScanBinding,
+    rows: List[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """--memory-limits: re-time the bound workload per memory limit (one CSV row per family and limit)."""
+    args = rc.args
+    if not args.memory_limits:
+        return None
+    queries = [(bq.name, bq.sql) for bq in bind_workload(rc.workload, binding, rc.workload_ctx)]
+    sweep = run_memory_sweep(con, queries, binding.scan, args.memory_limits, repeats=args.repeats, warmup=args.warmup)
+    for family, entries in sweep["families"].items():
+        for entry in entries:
+            rows.append(
+                _row(
+                    args,
+                    binding.fmt,
+                    binding.variant,
+                    "memory_limit",
+                    None,
+                    binding.write_meta,
+                    {"median_ms": entry["median_ms"]},
+                    extras={
+                        "query_family": family,
+                        "memory_limit": entry["limit"],
+                        "peak_spill_bytes": entry["peak_spill_bytes"],
+                        "oom_failures": entry["oom"],
+                    },
+                )
+            )
+    return sweep
+
+
+def _load_phases(
+    con: duckdb.DuckDBPyConnection,
+    rc: RunContext,
+    binding: ScanBinding,
+    rows: List[Dict[str, Any]],
+    setup_sql: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Optional whole-workload phases after the latency runs; returns the report body fields they produce."""
+    out: Dict[str, Any] = {}
+    throughput = _throughput(con, rc, binding, rows, setup_sql=setup_sql)
+    if throughput is not None:
+        out["throughput"] = throughput
+    scaling = _thread_scaling(con, rc, binding, rows)
+    if scaling is not None:
+        out["thread_scaling"] = scaling
+    memory_sweep = _memory_limits(con, rc, binding, rows)
+    if memory_sweep is not None:
+        out["memory_limit_sweep"] = memory_sweep
+    return out
+
+
+def run_format_task(
+    con: duckdb.DuckDBPyConnection,
+    task: FormatTask,
+    rc: RunContext,
+    measure_lock=None,
+) -> Dict[str, Any]:
+    """
+    Write, query and validate one format.
+
+    Returns {"name": report key, "body": report body, "rows": CSV rows}. measure_lock,
+    when given, is held around the timed phases so concurrent workers can overlap
+    their writes without overlapping their measurements. Peak memory of the write
+    and query phases is reported under body["memory"].
+    """
+    args = rc.args
+    rows: List[Dict[str, Any]] = []
+    lock = measure_lock if measure_lock is not None else contextlib.nullcontext()
+    mem = MemoryPhases(con)
+
+    if task.backend == "duckdb_table":
+        meta = {
+            "format": "duckdb_table",
+            "compression_time_s": 0.0,
+            "compression_speed_mb_s": None,
+            "output_size_bytes": rc.input_size_bytes,
+            "note": "Baseline: queries run directly on DuckDB table (no external file scan).",
+        }
+        ratio = None
+        if rc.input_size_bytes:
+            ratio = rc.input_size_bytes / rc.input_size_bytes
+        binding = ScanBinding(
+            fmt="duckdb",
+            variant=task.name,
+            scan=rc.table,
+            write_meta=meta,
+            filter_val_sql=rc.filter_val_sql,
+        )
+        # The baseline table only exists in this connection, so its cold run stays per-connection.
+        _time = _timer(con, args, table_rows=rc.workload_ctx.rowcount)
+        with lock, mem.phase("queries"):
+            results = run_workload(rc.workload, binding, rc.workload_ctx, _time, args, rows)
+            phases = _load_phases(con, rc, binding, rows)
+        body = {"write": meta, "compression_ratio": ratio, **results, **phases, "memory": mem.phases}
+        return {"name": task.name, "body": body, "rows": rows}
+
+    if task.backend in ("parquet", "parquet_pyarrow"):
+        # Both writers produce plain Parquet, scanned and measured the same way.
+        writer = pyarrow_parquet_backend if task.backend == "parquet_pyarrow" else parquet_backend
+        parquet_out = str(Path(rc.out_dir) / f"{task.name}_{rc.run_tag}.parquet")
+        with mem.phase("write"):
+            meta = writer.write(con, rc.source_table, parquet_out, options=task.options)
+        _speed_fields(meta, rc.input_size_bytes)
+        parquet_path = meta.get("parquet_path", parquet_out)
+        scan = parquet_backend.scan_expr(parquet_path, meta.get("partition_types"))
+        binding = ScanBinding(
+            fmt="parquet",
+            variant=task.name,
+            scan=scan,
+            write_meta=meta,
+            filter_val_sql=rc.filter_val_sql,
+        )
+        _time = _timer(con, args, table_rows=rc.workload_ctx.rowcount, files=[parquet_path])
+        with lock, mem.phase("queries"):
+            results = run_workload(rc.workload, binding, rc.workload_ctx, _time, args, rows)
+            _decompression_fields(con, meta, scan)
+            phases = _load_phases(con, rc, binding, rows)
+        body = {
+            "write": meta,
+            "compression_ratio": _compression_ratio(meta, rc.input_size_bytes),
+            "encodings": _parquet_encodings(parquet_path),
+            **results,
+            **phases,
+            "memory": mem.phases,
+        }
+        if rc.base_validation is not None:
+            counts = _validation_counts(con, scan, args.min_col, args.filter_col, rc.filter_val_sql)
+            body["validation"] = _validation_report(rc.base_validation, counts)
+        return {"name": task.name, "body": body, "rows": rows}
+
+    if task.backend == "vortex":
+        if not _VORTEX_AVAILABLE:
+            return {
+                "name": task.name,
+                "body": {"note": "Vortex backend unavailable (missing dependencies or import error)."},
+                "rows": [],
+            }
+        try:
+            return _run_vortex(con, task, rc, lock, mem)
+        except Exception as e:
+            return {"name": "vortex_error", "body": {"note": f"Vortex run failed: {e}"}, "rows": []}
+
+    raise ValueError(f"Unknown format backend: {task.backend}")
+
+
+def _run_vortex(con, task: FormatTask, rc: RunContext, lock, mem: MemoryPhases) -> Dict[str, Any]:
+    args = rc.args
+    rows: List[Dict[str, Any]] = []
+    vortex_out = str(Path(rc.out_dir) / "vortex")
+    vortex_table = rc.source_table
+    cast_map = _parse_casts(args.vortex_cast)
+    drop_cols = _parse_list(args.vortex_drop_cols)
+    if cast_map or drop_cols:
+        desc = con.execute(f"DESCRIBE {rc.table};").fetchall()
+        select_parts = []
+        for col, *_ in desc:
+            if col in drop_cols:
+                continue
+            qcol = _quote_ident(col)
+            if col in cast_map:
+                select_parts.append(f"CAST({qcol} AS {cast_map[col]}) AS {qcol}")
+            else:
+                select_parts.append(qcol)
+        con.execute(
+            f"CREATE OR REPLACE TEMP VIEW vortex_source AS "
+            f"SELECT {', '.join(select_parts)} FROM {rc.table};"
+        )
+        vortex_table = "vortex_source"
+
+    with mem.phase("write"):
+        meta = vortex_backend.write_vortex(con, vortex_table, vortex_out, options=task.options)
+    _speed_fields(meta, rc.input_size_bytes)
+
+    vortex_path = meta.get("vortex_path", vortex_out)
+    vortex_expr = vortex_backend.scan_expr(vortex_path)
+    con.execute(f"CREATE OR REPLACE TEMP VIEW vortex_dataset AS SELECT * FROM {vortex_expr}")
+
+    min_col_expr_vx = _vortex_numeric_expr(con, "vortex_dataset", args.min_col)
+    sel_col_exprs_vx = {c: _vortex_numeric_expr(con, "vortex_dataset", c) for c in rc.workload_ctx.select_cols}
+    filter_val_sql_vx = _format_filter_value(con, "vortex_dataset", args.filter_col, args.filter_val)
+    vx_text_cols = {c for c, t in _describe_types(con, "vortex_dataset").items() if t in {"VARCHAR", "TEXT"}}
+
+    variant = meta.get("variant", task.name)
+    binding = ScanBinding(
+        fmt="vortex",
+        variant=variant,
+        scan="vortex_dataset",
+        write_meta=meta,
+        filter_val_sql=filter_val_sql_vx,
+        numeric_exprs={args.min_col: min_col_expr_vx, **sel_col_exprs_vx},
+        text_cols=vx_text_cols,
+    )
+    # vortex_dataset is a temp view, so fresh connections/cursors have to recreate it.
+    setup_sql = ["LOAD vortex;", f"CREATE TEMP VIEW vortex_dataset AS SELECT * FROM {vortex_expr};"]
+    _time = _timer(
+        con,
+        args,
+        table_rows=rc.workload_ctx.rowcount,
+        files=[vortex_path],
+        setup_sql=setup_sql,
+    )
+    with lock, mem.phase("queries"):
+        results = run_workload(rc.workload, binding, rc.workload_ctx, _time, args, rows)
+        _decompression_fields(con, meta, vortex_expr)
+        phases = _load_phases(con, rc, binding, rows, setup_sql=setup_sql)
+
+    body = {
+        "write": meta,
+        "compression_ratio": _compression_ratio(meta, rc.input_size_bytes),
+        "encodings": _vortex_encodings(vortex_path),
+        **results,
+        **phases,
+        "memory": mem.phases,
+    }
+    if rc.base_validation is not None:
+        counts = _validation_counts(
+            con,
+            "vortex_dataset",
+            args.min_col,
+            args.filter_col,
+            filter_val_sql_vx,
+            min_col_expr=min_col_expr_vx,
+        )
+        body["validation"] = _validation_report(rc.base_validation, counts)
+    return {"name": variant, "body": body, "rows": rows}
+
+
+def _sql_path(path: str) -> str:
+    return path.replace("'", "''")
+
+
+def export_shared_base(con: duckdb.DuckDBPyConnection, rc: RunContext, db_path: str) -> None:
+    """Persist the base (and sorted source) table once for worker processes."""
+    Path(db_path).unlink(missing_ok=True)
+    con.execute(f"ATTACH '{_sql_path(db_path)}' AS shared_base;")
+    try:
+        for table in dict.fromkeys([rc.table, rc.source_table]):
+            con.execute(f"CREATE TABLE shared_base.{table} AS SELECT * FROM {table};")
+    finally:
+        con.execute("DETACH shared_base;")
+
+
+def _worker_main(db_path: str, task: FormatTask, rc: RunContext, measure_lock) -> Dict[str, Any]:
+    args = rc.args
+    con = duckdb.connect(database=":memory:")
+    # Each worker spills into its own subdirectory; DuckDB temp file names are per-instance only.
+    temp_dir = args.temp_directory
+    configure_connection(
+        con,
+        threads=args.threads,
+        memory_limit=args.memory_limit,
+        temp_directory=str(Path(temp_dir) / task.name) if temp_dir else None,
+    )
+    t0 = time.perf_counter()
+    con.execute(f"ATTACH '{_sql_path(db_path)}' AS shared_base (READ_ONLY);")
+    if args.db_path:
+        # Out-of-core mode: read the base tables from the attached file instead of copying them into memory.
+        for table in dict.fromkeys([rc.table, rc.source_table]):
+            con.execute(f"CREATE VIEW {table} AS SELECT * FROM shared_base.{table};")
+    else:
+        for table in dict.fromkeys([rc.table, rc.source_table]):
+            con.execute(f"CREATE TABLE {table} AS SELECT * FROM shared_base.{table};")
+        con.execute("DETACH shared_base;")
+    t1 = time.perf_counter()
+    result = run_format_task(con, task, rc, measure_lock=measure_lock)
+    con.close()
+    if "write" in result["body"]:
+        result["body"]["worker"] = {"pid": os.getpid(), "base_load_time_s": t1 - t0}
+    return result
+
+
+def run_isolated(
+    con: duckdb.DuckDBPyConnection,
+    tasks: List[FormatTask],
+    rc: RunContext,
+    max_workers: int,
+    overlap_queries: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Run each format task in its own spawned process and connection.
+
+    The base table is written once to a DuckDB file that workers attach read-only
+    and copy into memory (with --db-path they query it in place). Up to max_workers tasks run at once; unless
+    overlap_queries is set, timed phases are serialized with a shared lock so only
+    writes overlap. Results are returned in task order.
+    """
+    db_path = str(Path(rc.out_dir) / f"shared_base_{rc.run_tag}.duckdb")
+    export_shared_base(con, rc, db_path)
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        with ctx.Manager() as manager:
+            measure_lock = None if overlap_queries else manager.Lock()
+            # maxtasksperchild=1: every format gets a fresh process (no shared caches or allocator state).
+            with ctx.Pool(processes=max(1, max_workers), maxtasksperchild=1) as pool:
+                pending = [pool.apply_async(_worker_main, (db_path, task, rc, measure_lock)) for task in tasks]
+                return [r.get() for r in pending]
+    finally:
+        Path(db_path).unlink(missing_ok=True)
+        Path(db_path + ".wal").unlink(missing_ok=True)
@@ -1,11 +1,20 @@
 # bench/ingest/generic_ingest.py
 from __future__ import annotations
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable
 import duckdb
+import os
 import re
 
+from .stream_decompress import DecompressedPipe, compression_of, measure_decompression, needs_stream, strip_compression_suffix
+
+# DuckDB rejects tables filled when create_base_table_from_csv(store_rejects=True).
+REJECTS_TABLE = "csv_reject_errors"
+REJECTS_SCAN = "csv_reject_scans"
+
 
 def create_base_table_from_csv(
     con: duckdb.DuckDBPyConnection,
@@ -13,47 +22,39 @@ def create_base_table_from_csv(
     csv_path: str,
     schema_sql_path: Optional[str] = None,
     read_csv_options: Optional[Dict[str, Any]] = None,
+    store_rejects: bool = False,
+    decompress: str = "auto",
+    decompressor: str = "auto",
 ) -> str:
     """
     If schema_sql_path is provided, we create the table with it first, then COPY in.
     Otherwise we infer types from DuckDB read_csv_auto.
+
+    store_rejects records rows skipped by ignore_errors in DuckDB's rejects tables
+    (REJECTS_TABLE / REJECTS_SCAN), so rejected_row_count can report them.
+
+    Compressed files (.gz/.zst/.bz2/.xz) are read by DuckDB when it supports the codec,
+    otherwise streamed through a DecompressedPipe (decompress="stream" streams every codec).
     """
-    opts = read_csv_options or {}
     p = Path(csv_path)
+    if not p.is_dir():
+        return ingest_csv_file(
+            con,
+            table_name,
+            csv_path,
+            schema_sql_path=schema_sql_path,
+            read_csv_options=read_csv_options,
+            store_rejects=store_rejects,
+            decompress=decompress,
+            decompressor=decompressor,
+            measure=False,
+        )["table"]
 
+    opts = read_csv_options or {}
+    store_rejects = store_rejects and bool(opts.get("ignore_errors"))
     if schema_sql_path:
-        schema_sql = Path(schema_sql_path).read_text(encoding="utf-8")
-        con.execute(schema_sql)
-        # If schema SQL creates a different table name, auto-detect it.
-        target_table = table_name
-        if not _table_exists(con, target_table):
-            detected = _extract_table_name_from_schema(schema_sql)
-            if detected and _table_exists(con, detected):
-                target_table = detected
-            else:
-                available = _list_tables(con)
-                if len(available) == 1:
-                    target_table = available[0]
-                else:
-                    hint = f"Detected table: {detected}" if detected else "No CREATE TABLE name detected."
-                    raise duckdb.CatalogException(
-                        f"Table '{table_name}' not found after applying schema. {hint} "
-                        f"Available tables: {', '.join(available) if available else 'none'}."
-                    )
-        copy_args = ["AUTO_DETECT FALSE"]
-        if opts:
-            # Map read_csv_auto-style options to COPY options
-            if "delim" in opts or "delimiter" in opts:
-                delim = opts.get("delim", opts.get("delimiter"))
-                copy_args.append(f"DELIMITER '{delim}'")
-            if "header" in opts:
-                copy_args.append(f"HEADER {'TRUE' if opts['header'] else 'FALSE'}")
-            if "nullstr" in opts:
-                copy_args.append(f"NULLSTR '{opts['nullstr']}'")
-        if "ignore_errors" in opts:
-            copy_args.append(f"IGNORE_ERRORS {'TRUE' if opts['ignore_errors'] else 'FALSE'}")
-        copy_args_sql = ", ".join(copy_args)
-        con.execute(f"COPY {target_table} FROM '{str(p)}' ({copy_args_sql});")
+        target_table = _apply_schema(con, table_name, schema_sql_path)
+        con.execute(f"COPY {target_table} FROM '{str(p)}' ({_copy_args_sql(opts, store_rejects)});")
         if target_table != table_name:
             # Materialize into the requested table name so the schema is enforced there too.
             con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM {target_table};")
@@ -61,17 +62,271 @@ def create_base_table_from_csv(
         return target_table
 
     # inference path
+    if store_rejects:
+        opts = {**opts, "store_rejects": True, "rejects_table": REJECTS_TABLE, "rejects_scan": REJECTS_SCAN}
     csv_args = _format_kv(opts)
     if csv_args:
         csv_args = f", {csv_args}"
-    if p.is_dir():
-        glob = f"{str(p)}/**/*.csv"
-        con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM read_csv_auto('{glob}'{csv_args});")
-    else:
-        con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM read_csv_auto('{str(p)}'{csv_args});")
+    glob = f"{str(p)}/**/*.csv"
+    con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM read_csv_auto('{glob}'{csv_args});")
     return table_name
 
 
+def ingest_csv_file(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    csv_path: str,
+    schema_sql_path: Optional[str] = None,
+    read_csv_options: Optional[Dict[str, Any]] = None,
+    store_rejects: bool = False,
+    decompress: str = "auto",
+    decompressor: str = "auto",
+    measure: bool = True,
+) -> Dict[str, Any]:
+    """
+    Load one (possibly compressed) CSV file like create_base_table_from_csv, with timings.
+
+    Returns {"table", "time_s", "size_bytes" (CSV text bytes), "parse_s", "parse_mb_s",
+    "decompression"} (decompression is None for plain files; see _load_csv).
+    """
+    opts = read_csv_options or {}
+    # DuckDB's store_rejects implies ignore_errors, so only enable it when errors are ignored anyway.
+    store_rejects = store_rejects and bool(opts.get("ignore_errors"))
+
+    if schema_sql_path:
+        target_table = _apply_schema(con, table_name, schema_sql_path)
+        copy_args = _copy_args_sql(opts, store_rejects)
+
+        def _statements(source: str) -> List[str]:
+            return [f"COPY {target_table} FROM '{_sql_str(source)}' ({copy_args});"]
+    else:
+        target_table = table_name
+        if store_rejects:
+            opts = {**opts, "store_rejects": True, "rejects_table": REJECTS_TABLE, "rejects_scan": REJECTS_SCAN}
+        csv_args = _format_kv(opts)
+        csv_args = f", {csv_args}" if csv_args else ""
+
+        def _statements(source: str) -> List[str]:
+            return [f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM read_csv_auto('{_sql_str(source)}'{csv_args});"]
+
+    info = _load_csv(con, Path(csv_path), _statements, decompress, decompressor, measure)
+    if target_table != table_name:
+        # Materialize into the requested table name so the schema is enforced there too.
+        con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM {target_table};")
+    return {"table": table_name, **info}
+
+
+def _load_csv(
+    con: duckdb.DuckDBPyConnection,
+    path: Path,
+    statements: Callable[[str], List[str]],
+    decompress: str,
+    decompressor: str,
+    measure: bool,
+) -> Dict[str, Any]:
+    """
+    Run statements(readable path) for one CSV file, decompressing it on the way if needed.
+
+    Streamed files are timed by their DecompressedPipe. For codecs DuckDB reads itself,
+    measure=True times a separate decompress-only pass first, which also gives the
+    decompressed size. parse_s is the ingest time not covered by decompression: exact when
+    the two run one after another (DuckDB's own gzip/zstd reader), an upper bound on parse
+    speed when a pipe overlaps them.
+    """
+    codec = compression_of(str(path))
+    decompression: Optional[Dict[str, Any]] = None
+    if needs_stream(str(path), decompress):
+        t0 = time.perf_counter()
+        with DecompressedPipe(str(path), decompressor=decompressor) as pipe:
+            for stmt in statements(pipe.path):
+                con.execute(stmt)
+        elapsed = time.perf_counter() - t0
+        decompression = {"method": "stream", **pipe.stats()}
+    else:
+        if codec and measure:
+            decompression = {"method": "duckdb", **measure_decompression(str(path), decompressor)}
+        elif codec:
+            decompression = {"method": "duckdb", "codec": codec, "compressed_bytes": path.stat().st_size}
+        t0 = time.perf_counter()
+        for stmt in statements(str(path)):
+            con.execute(stmt)
+        elapsed = time.perf_counter() - t0
+    size = path.stat().st_size
+    if decompression and decompression.get("decompressed_bytes") is not None:
+        size = decompression["decompressed_bytes"]
+    parse_s = elapsed
+    if decompression and decompression.get("decompress_s") is not None:
+        parse_s = max(elapsed - decompression["decompress_s"], 0.0)
+    return {
+        "time_s": elapsed,
+        "size_bytes": size,
+        "parse_s": parse_s,
+        "parse_mb_s": (size / (1024 * 1024)) / parse_s if parse_s > 0 else None,
+        "decompression": decompression,
+    }
+
+
+def is_csv_file(path: Path) -> bool:
+    """'x.csv', or a compressed 'x.csv.gz' / '.zst' / '.bz2' / '.xz'."""
+    return path.is_file() and strip_compression_suffix(str(path)).lower().endswith(".csv")
+
+
+def csv_files(csv_dir: str) -> List[Path]:
+    """CSV files (plain or compressed) under a directory, in the order their rows are appended."""
+    return sorted(f for f in Path(csv_dir).rglob("*") if is_csv_file(f))
+
+
+def create_base_table_from_csv_files(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    csv_dir: str,
+    schema_sql_path: Optional[str] = None,
+    read_csv_options: Optional[Dict[str, Any]] = None,
+    store_rejects: bool = False,
+    max_workers: Optional[int] = None,
+    decompress: str = "auto",
+    decompressor: str = "auto",
+) -> Dict[str, Any]:
+    """
+    Ingest every CSV under csv_dir concurrently, one staging table per file.
+
+    Each file is read on its own cursor (so its rejects tables are private to it) with
+    the column types of the schema file, or those the single read_csv_auto glob call
+    infers. Staging tables are then appended in file order, so the result matches the
+    single-call ingest row for row. Compressed files are decompressed as in ingest_csv_file.
+
+    Returns {"table", "workers", "time_s", "size_bytes", "rows", "rejected_rows",
+    "reject_reasons", "throughput_mb_s", "files": [per-file rows, rejects, time, MB/s,
+    decompression]}. size_bytes counts CSV text, i.e. decompressed bytes.
+    """
+    files = csv_files(csv_dir)
+    if not files:
+        raise FileNotFoundError(f"No .csv files under {csv_dir}")
+    opts = dict(read_csv_options or {})
+    store_rejects = store_rejects and bool(opts.get("ignore_errors"))
+    workers = max(1, min(len(files), max_workers or os.cpu_count() or 1))
+    t0 = time.perf_counter()
+
+    if schema_sql_path:
+        target_table = _apply_schema(con, table_name, schema_sql_path)
+        copy_args = _copy_args_sql(opts, store_rejects)
+
+        def _stage_sql(stage: str, path: str) -> List[str]:
+            return [
+                f"CREATE TABLE {stage} AS SELECT * FROM {target_table} LIMIT 0;",
+                f"COPY {stage} FROM '{_sql_str(path)}' ({copy_args});",
+            ]
+    else:
+        target_table = table_name
+        glob_args = _format_kv(opts)
+        glob_args = f", {glob_args}" if glob_args else ""
+        if any(compression_of(str(f)) for f in files):
+            # The glob only covers plain files; sniff the first file (through a pipe if needed).
+            def _sniff_sql(source: str) -> List[str]:
+                return [
+                    f"CREATE OR REPLACE TABLE {table_name} AS "
+                    f"SELECT * FROM read_csv_auto('{_sql_str(source)}'{glob_args}) LIMIT 0;"
+                ]
+
+            _load_csv(con, files[0], _sniff_sql, decompress, decompressor, measure=False)
+        else:
+            # Same glob as the single-call ingest, so the sniffer infers the same column types.
+            con.execute(
+                f"CREATE OR REPLACE TABLE {table_name} AS "
+                f"SELECT * FROM read_csv_auto('{_sql_str(Path(csv_dir))}/**/*.csv'{glob_args}) LIMIT 0;"
+            )
+        columns = ", ".join(
+            f"'{_sql_str(name)}': '{col_type}'" for name, col_type, *_ in con.execute(f"DESCRIBE {table_name};").fetchall()
+        )
+        file_opts = {k: v for k, v in opts.items() if k not in ("all_varchar", "sample_size")}
+        if store_rejects:
+            file_opts.update({"store_rejects": True, "rejects_table": REJECTS_TABLE, "rejects_scan": REJECTS_SCAN})
+        file_args = _format_kv(file_opts)
+        file_args = f", {file_args}" if file_args else ""
+
+        def _stage_sql(stage: str, path: str) -> List[str]:
+            return [
+                f"CREATE TABLE {stage} AS SELECT * FROM "
+                f"read_csv('{_sql_str(path)}', columns={{{columns}}}{file_args});"
+            ]
+
+    def _ingest_one(idx: int) -> Dict[str, Any]:
+        path = files[idx]
+        stage = f"ingest_stage_{idx}"
+        cur = con.cursor()
+        try:
+            info = _load_csv(cur, path, lambda source: _stage_sql(stage, source), decompress, decompressor, measure=True)
+            rows = cur.execute(f"SELECT count(*) FROM {stage};").fetchone()[0]
+            reasons = reject_reasons(cur) if store_rejects else []
+            rejected = rejected_row_count(cur) if store_rejects else 0
+        finally:
+            cur.close()
+        elapsed, size = info["time_s"], info["size_bytes"]
+        return {
+            "file": str(path),
+            "size_bytes": size,
+            "rows": rows,
+            "rejected_rows": rejected,
+            "reject_reasons": reasons,
+            "time_s": elapsed,
+            "throughput_mb_s": (size / (1024 * 1024)) / elapsed if elapsed > 0 else None,
+            "parse_mb_s": info["parse_mb_s"],
+            "decompression": info["decompression"],
+        }
+
+    stages = [f"ingest_stage_{idx}" for idx in range(len(files))]
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            per_file = list(pool.map(_ingest_one, range(len(files))))
+        for stage in stages:
+            con.execute(f"INSERT INTO {target_table} SELECT * FROM {stage};")
+            con.execute(f"DROP TABLE {stage};")
+    finally:
+        for stage in stages:
+            con.execute(f"DROP TABLE IF EXISTS {stage};")
+    if target_table != table_name:
+        con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM {target_table};")
+    elapsed = time.perf_counter() - t0
+
+    reasons: Dict[str, Dict[str, Any]] = {}
+    for f in per_file:
+        for r in f["reject_reasons"]:
+            agg = reasons.setdefault(r["error_type"], {"error_type": r["error_type"], "rows": 0, "example": r["example"]})
+            agg["rows"] += r["rows"]
+    size_bytes = sum(f["size_bytes"] for f in per_file)
+    return {
+        "table": table_name,
+        "workers": workers,
+        "time_s": elapsed,
+        "size_bytes": size_bytes,
+        "rows": sum(f["rows"] for f in per_file),
+        "rejected_rows": sum(f["rejected_rows"] for f in per_file),
+        "reject_reasons": sorted(reasons.values(), key=lambda r: -r["rows"]),
+        "throughput_mb_s": (size_bytes / (1024 * 1024)) / elapsed if elapsed > 0 else None,
+        "files": per_file,
+    }
+
+
+def rejected_row_count(con: duckdb.DuckDBPyConnection) -> int:
+    """Rows rejected by the last store_rejects ingest (a row with several bad columns counts once)."""
+    if not _table_exists(con, REJECTS_TABLE):
+        return 0
+    return con.execute(
+        f"SELECT count(*) FROM (SELECT DISTINCT scan_id, file_id, line FROM {REJECTS_TABLE});"
+    ).fetchone()[0]
+
+
+def reject_reasons(con: duckdb.DuckDBPyConnection) -> List[Dict[str, Any]]:
+    """Rejected rows per DuckDB error type, most frequent first, with one example message each."""
+    if not _table_exists(con, REJECTS_TABLE):
+        return []
+    rows = con.execute(
+        f"SELECT CAST(error_type AS VARCHAR), count(DISTINCT (scan_id, file_id, line)), min(error_message) "
+        f"FROM {REJECTS_TABLE} GROUP BY 1 ORDER BY 2 DESC, 1;"
+    ).fetchall()
+    return [{"error_type": t, "rows": n, "example": msg} for t, n, msg in rows]
+
+
 def create_base_table_from_parquet(con: duckdb.DuckDBPyConnection, table_name: str, parquet_path: str) -> None:
     p = Path(parquet_path)
     if p.is_dir():
@@ -80,6 +335,74 @@ def create_base_table_from_parquet(con: duckdb.DuckDBPyConnection, table_name: s
         con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM read_parquet('{str(p)}');")
 
 
+def create_base_table_from_duckdb(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    db_path: str,
+    source_table: str = "base_table",
+    row_limit: Optional[int] = None,
+) -> None:
+    """
+    Copy a table out of a persistent DuckDB database (attached read-only, so several
+    processes can slice the same ingest at once). row_limit keeps the first N rows in
+    insertion order, the same rows `--row-limit` keeps after a CSV ingest.
+    """
+    db_sql = str(Path(db_path)).replace("'", "''")
+    con.execute(f"ATTACH '{db_sql}' AS ingest_src (READ_ONLY);")
+    try:
+        limit_sql = f" LIMIT {int(row_limit)}" if row_limit else ""
+        con.execute(
+            f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM ingest_src.{source_table}{limit_sql};"
+        )
+    finally:
+        con.execute("DETACH ingest_src;")
+
+
+def _sql_str(value: Any) -> str:
+    return str(value).replace("'", "''")
+
+
+def _apply_schema(con: duckdb.DuckDBPyConnection, table_name: str, schema_sql_path: str) -> str:
+    """Run the schema SQL and return the table it created (table_name unless it names another one)."""
+    schema_sql = Path(schema_sql_path).read_text(encoding="utf-8")
+    con.execute(schema_sql)
+    # If schema SQL creates a different table name, auto-detect it.
+    target_table = table_name
+    if not _table_exists(con, target_table):
+        detected = _extract_table_name_from_schema(schema_sql)
+        if detected and _table_exists(con, detected):
+            target_table = detected
+        else:
+            available = _list_tables(con)
+            if len(available) == 1:
+                target_table = available[0]
+            else:
+                hint = f"Detected table: {detected}" if detected else "No CREATE TABLE name detected."
+                raise duckdb.CatalogException(
+                    f"Table '{table_name}' not found after applying schema. {hint} "
+                    f"Available tables: {', '.join(available) if available else 'none'}."
+                )
+    return target_table
+
+
+def _copy_args_sql(opts: Dict[str, Any], store_rejects: bool = False) -> str:
+    copy_args = ["AUTO_DETECT FALSE"]
+    if opts:
+        # Map read_csv_auto-style options to COPY options
+        if "delim" in opts or "delimiter" in opts:
+            delim = opts.get("delim", opts.get("delimiter"))
+            copy_args.append(f"DELIMITER '{delim}'")
+        if "header" in opts:
+            copy_args.append(f"HEADER {'TRUE' if opts['header'] else 'FALSE'}")
+        if "nullstr" in opts:
+            copy_args.append(f"NULLSTR '{opts['nullstr']}'")
+    if "ignore_errors" in opts:
+        copy_args.append(f"IGNORE_ERRORS {'TRUE' if opts['ignore_errors'] else 'FALSE'}")
+    if store_rejects:
+        copy_args.append(f"STORE_REJECTS TRUE, REJECTS_TABLE '{REJECTS_TABLE}', REJECTS_SCAN '{REJECTS_SCAN}'")
+    return ", ".join(copy_args)
+
+
 def _format_kv(opts: Dict[str, Any]) -> str:
     # DuckDB wants named args like delim=',', header=True etc.
     if not opts:
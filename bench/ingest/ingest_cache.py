@@ -0,0 +1,239 @@
+# bench/ingest/ingest_cache.py
+"""Persistent ingest cache.
+
+A parsed input is stored as a DuckDB database (table base_table) under the cache
+directory, keyed by a hash of the input files (size + mtime, or their content
+with hash_mode="content"), the schema file's content, the input type, the
+read_csv options and any options that change the counts stored with the entry
+(run.py's --csv-row-count). Entries carry a JSON sidecar with row/size counts and a
+last-used timestamp; when the cache grows past max_bytes the least recently
+used entries are evicted.
+
+Run as a script to inspect or clean the cache:
+  python bench/ingest/ingest_cache.py list  [--cache-dir DIR]
+  python bench/ingest/ingest_cache.py purge [--cache-dir DIR] [--key K ...] [--older-than-days N] [--all]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import duckdb
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("BENCH_INGEST_CACHE", Path.home() / ".cache" / "file-format-bench" / "ingest")
+)
+DEFAULT_MAX_BYTES = 20 * 1024**3
+CACHE_TABLE = "base_table"
+
+
+def _input_files(p: Path) -> List[Path]:
+    if p.is_dir():
+        return sorted(f for f in p.rglob("*") if f.is_file())
+    return [p]
+
+
+def _file_digest(path: Path, chunk_size: int = 8 * 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _sql_path(path: Path) -> str:
+    return str(path).replace("'", "''")
+
+
+class IngestCache:
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _db_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.duckdb"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def key(
+        self,
+        input_path: str,
+        input_type: str,
+        read_options: Optional[Dict[str, Any]] = None,
+        schema_path: Optional[str] = None,
+        hash_mode: str = "stat",
+        record_options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Return {"key", "fingerprint"} for an input; hash_mode is "stat" (size+mtime) or "content".
+
+        record_options are settings that don't change the table but do change the metadata
+        stored with it (e.g. how input rows are counted), so a hit never replays counts
+        recorded under different settings.
+
+        Stat keys include the input's path. Content keys do not, so the same data hits the
+        cache from any location (e.g. a re-upload saved to a new path); directory inputs are
+        keyed by their files' relative names.
+        """
+        p = Path(input_path).resolve()
+        files = []
+        for f in _input_files(p):
+            st = f.stat()
+            if hash_mode == "content":
+                name = f.relative_to(p).as_posix() if p.is_dir() else None
+                entry: Dict[str, Any] = {"name": name, "size": st.st_size, "sha256": _file_digest(f)}
+            else:
+                entry = {"path": str(f), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            files.append(entry)
+        fingerprint = {
+            "input": str(p) if hash_mode != "content" else None,
+            "input_type": input_type,
+            "files": files,
+            "read_options": read_options or {},
+            "schema_sha256": _file_digest(Path(schema_path)) if schema_path else None,
+            "record_options": record_options or {},
+        }
+        raw = json.dumps(fingerprint, sort_keys=True, default=str).encode("utf-8")
+        return {"key": hashlib.sha256(raw).hexdigest()[:32], "fingerprint": fingerprint}
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry's metadata (and mark it used), or None on a miss."""
+        meta_path = self._meta_path(key)
+        if not (meta_path.exists() and self._db_path(key).exists()):
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        meta["last_used_at"] = time.time()
+        meta["hits"] = meta.get("hits", 0) + 1
+        meta_path.write_text(json.dumps(meta, indent=2, default=str), encoding="utf-8")
+        return {**meta, "db_path": str(self._db_path(key))}
+
+    def load(self, con: duckdb.DuckDBPyConnection, key: str, table_name: str) -> None:
+        db_sql = _sql_path(self._db_path(key))
+        con.execute(f"ATTACH '{db_sql}' AS ingest_cache (READ_ONLY);")
+        try:
+            con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM ingest_cache.{CACHE_TABLE};")
+        finally:
+            con.execute("DETACH ingest_cache;")
+
+    def store(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        key: str,
+        table_name: str,
+        fingerprint: Dict[str, Any],
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Persist table_name under key (written to a temp file, then renamed) and evict LRU entries."""
+        final = self._db_path(key)
+        tmp = final.with_suffix(".duckdb.tmp")
+        tmp.unlink(missing_ok=True)
+        t0 = time.perf_counter()
+        con.execute(f"ATTACH '{_sql_path(tmp)}' AS ingest_cache_out;")
+        try:
+            con.execute(f"CREATE TABLE ingest_cache_out.{CACHE_TABLE} AS SELECT * FROM {table_name};")
+        finally:
+            con.execute("DETACH ingest_cache_out;")
+        os.replace(tmp, final)
+        now = time.time()
+        meta = {
+            "key": key,
+            "input": (extra or {}).get("input", fingerprint.get("input")),
+            "fingerprint": fingerprint,
+            "size_bytes": final.stat().st_size,
+            "store_time_s": time.perf_counter() - t0,
+            "created_at": now,
+            "last_used_at": now,
+            "hits": 0,
+            **(extra or {}),
+        }
+        self._meta_path(key).write_text(json.dumps(meta, indent=2, default=str), encoding="utf-8")
+        meta["evicted"] = self.evict(keep=key)
+        return meta
+
+    def entries(self) -> List[Dict[str, Any]]:
+        out = []
+        for meta_path in sorted(self.cache_dir.glob("*.json")):
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            db = self._db_path(meta.get("key", meta_path.stem))
+            meta["size_bytes"] = db.stat().st_size if db.exists() else 0
+            out.append(meta)
+        return sorted(out, key=lambda m: m.get("last_used_at", 0), reverse=True)
+
+    def remove(self, key: str) -> None:
+        for path in (self._db_path(key), self._meta_path(key), Path(str(self._db_path(key)) + ".wal")):
+            path.unlink(missing_ok=True)
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """Drop least recently used entries until the cache fits in max_bytes (never `keep`)."""
+        entries = self.entries()
+        total = sum(e["size_bytes"] for e in entries)
+        evicted = []
+        for e in reversed(entries):
+            if total <= self.max_bytes:
+                break
+            if e["key"] == keep:
+                continue
+            self.remove(e["key"])
+            total -= e["size_bytes"]
+            evicted.append(e["key"])
+        return evicted
+
+    def purge(
+        self,
+        keys: Optional[List[str]] = None,
+        older_than_s: Optional[float] = None,
+        purge_all: bool = False,
+    ) -> List[str]:
+        now = time.time()
+        removed = []
+        for e in self.entries():
+            if purge_all or (keys and e["key"] in keys) or (
+                older_than_s is not None and now - e.get("last_used_at", 0) > older_than_s
+            ):
+                self.remove(e["key"])
+                removed.append(e["key"])
+        return removed
+
+
+def _main() -> None:
+    ap = argparse.ArgumentParser(description="Inspect or clean the persistent ingest cache")
+    ap.add_argument("command", choices=["list", "purge"])
+    ap.add_argument("--cache-dir", default=None, help=f"Cache directory (default: {DEFAULT_CACHE_DIR})")
+    ap.add_argument("--key", action="append", default=None, help="purge: entry key (repeatable)")
+    ap.add_argument("--older-than-days", type=float, default=None, help="purge: entries unused for this long")
+    ap.add_argument("--all", action="store_true", help="purge: every entry")
+    args = ap.parse_args()
+
+    cache = IngestCache(args.cache_dir)
+    if args.command == "list":
+        entries = cache.entries()
+        total = sum(e["size_bytes"] for e in entries)
+        print(f"{cache.cache_dir}: {len(entries)} entries, {total / (1024 * 1024):.1f} MB")
+        for e in entries:
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(e.get("last_used_at", 0)))
+            print(
+                f"  {e['key']}  {e['size_bytes'] / (1024 * 1024):9.1f} MB  rows={e.get('rows')}  "
+                f"hits={e.get('hits', 0)}  last_used={used}  {e.get('input')}"
+            )
+        return
+    if not (args.all or args.key or args.older_than_days is not None):
+        raise SystemExit("purge needs --all, --key or --older-than-days")
+    older = args.older_than_days * 86400 if args.older_than_days is not None else None
+    removed = cache.purge(keys=args.key, older_than_s=older, purge_all=args.all)
+    print(f"Removed {len(removed)} entries")
+    for key in removed:
+        print(f"  {key}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,144 @@
+# bench/ingest/publicbi_ingest.py
+"""PublicBI benchmark ingest.
+
+The PublicBI benchmark ships every table as `<Table>.csv.bz2` plus a
+`<Table>.table.sql` schema (benchmark/<Dataset>/tables/ in the upstream
+repository). The CSVs have no header, use '|' as delimiter and the literal
+string `null` for NULL. Tables are loaded by applying the schema and COPYing the
+bz2 stream through a pipe (see stream_decompress), so the decompressed CSV never
+touches the disk.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import duckdb
+
+from .generic_ingest import _copy_args_sql, _list_tables, _load_csv, _sql_str, reject_reasons, rejected_row_count
+
+PUBLICBI_DELIMITER = "|"
+PUBLICBI_NULL = "null"
+SCHEMA_SUFFIX = ".table.sql"
+
+
+@dataclass
+class PublicBITable:
+    name: str                    # e.g. Arade_1
+    dataset: str                 # e.g. Arade
+    csv_path: Path
+    schema_path: Optional[Path]
+
+
+def publicbi_read_options(ignore_errors: bool = False) -> Dict[str, Any]:
+    """read_csv-style options for the PublicBI CSV dialect."""
+    opts: Dict[str, Any] = {"delim": PUBLICBI_DELIMITER, "header": False, "nullstr": PUBLICBI_NULL}
+    if ignore_errors:
+        opts["ignore_errors"] = True
+    return opts
+
+
+def table_name_of(csv_path: str) -> str:
+    """'.../Arade_1.csv.bz2' -> 'Arade_1'."""
+    name = Path(csv_path).name
+    for suffix in (".bz2", ".csv"):
+        if name.lower().endswith(suffix):
+            name = name[: -len(suffix)]
+    return name
+
+
+def find_schema(csv_path: str, root: Optional[str] = None) -> Optional[Path]:
+    """
+    Locate `<Table>.table.sql` for a data file: next to it, in a sibling `tables/`
+    directory (the upstream layout), or anywhere under root.
+    """
+    csv = Path(csv_path)
+    filename = table_name_of(csv_path) + SCHEMA_SUFFIX
+    for candidate in (csv.parent / filename, csv.parent.parent / "tables" / filename, csv.parent / "tables" / filename):
+        if candidate.exists():
+            return candidate
+    if root:
+        matches = sorted(Path(root).rglob(filename))
+        if matches:
+            return matches[0]
+    return None
+
+
+def find_tables(root: str, datasets: Optional[List[str]] = None) -> List[PublicBITable]:
+    """All PublicBI data files under root (.csv.bz2, or already decompressed .csv), optionally filtered by dataset."""
+    base = Path(root)
+    files = sorted(set(base.rglob("*.csv.bz2")) | set(base.rglob("*.csv")))
+    by_name: Dict[str, PublicBITable] = {}
+    for f in files:
+        name = table_name_of(str(f))
+        # Prefer the compressed original when both are present.
+        if name in by_name and not str(f).endswith(".bz2"):
+            continue
+        dataset = name.rsplit("_", 1)[0] if "_" in name else name
+        if datasets and dataset not in datasets and name not in datasets:
+            continue
+        by_name[name] = PublicBITable(name, dataset, f, find_schema(str(f), root))
+    return sorted(by_name.values(), key=lambda t: t.name)
+
+
+def create_base_table_from_publicbi(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    csv_path: str,
+    schema_sql_path: Optional[str] = None,
+    ignore_errors: bool = False,
+    decompress: str = "auto",
+    decompressor: str = "auto",
+) -> Dict[str, Any]:
+    """
+    Load one PublicBI table into table_name.
+
+    The schema is applied as shipped (creating "<Table>"), the data is COPYed with the
+    PublicBI dialect, streamed from the bz2 file when compressed, and the table is then
+    renamed to table_name. Returns {"table", "source_table", "rows", "rejected_rows",
+    "reject_reasons", "compression", "compressed_bytes", "input_size_bytes", "time_s",
+    "parse_s", "parse_mb_s", "decompression"}.
+    """
+    schema = Path(schema_sql_path) if schema_sql_path else find_schema(csv_path)
+    if schema is None:
+        raise FileNotFoundError(f"No {table_name_of(csv_path)}{SCHEMA_SUFFIX} found for {csv_path}; pass --schema")
+    before = set(_list_tables(con))
+    con.execute(schema.read_text(encoding="utf-8"))
+    created = [t for t in _list_tables(con) if t not in before]
+    if len(created) != 1:
+        raise duckdb.CatalogException(f"{schema} should create exactly one table, created: {created or 'none'}")
+    source_table = created[0]
+    quoted = '"' + source_table.replace('"', '""') + '"'
+
+    copy_args = _copy_args_sql(publicbi_read_options(ignore_errors), store_rejects=ignore_errors)
+    info = _load_csv(
+        con,
+        Path(csv_path),
+        lambda source: [f"COPY {quoted} FROM '{_sql_str(source)}' ({copy_args});"],
+        decompress,
+        decompressor,
+        measure=True,
+    )
+    decompression = info["decompression"]
+
+    if source_table != table_name:
+        con.execute(f"DROP TABLE IF EXISTS {table_name};")
+        con.execute(f"ALTER TABLE {quoted} RENAME TO {table_name};")
+    rows = con.execute(f"SELECT count(*) FROM {table_name}").fetchone()[0]
+    return {
+        "table": table_name,
+        "source_table": source_table,
+        "schema": str(schema),
+        "rows": rows,
+        "rejected_rows": rejected_row_count(con) if ignore_errors else 0,
+        "reject_reasons": reject_reasons(con) if ignore_errors else None,
+        "compression": decompression["codec"] if decompression else None,
+        "compressed_bytes": decompression["compressed_bytes"] if decompression else None,
+        "input_size_bytes": info["size_bytes"],
+        "time_s": info["time_s"],
+        "parse_s": info["parse_s"],
+        "parse_mb_s": info["parse_mb_s"],
+        "decompression": decompression,
+    }
+
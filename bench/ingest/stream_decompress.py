@@ -0,0 +1,250 @@
+# bench/ingest/stream_decompress.py
+"""Stream compressed CSV files into DuckDB without writing the decompressed data to disk.
+
+DuckDB reads gzip and zstd CSVs itself (NATIVE_CODECS). Everything else (bz2, xz)
+is decompressed by a background thread into a named pipe (FIFO), and DuckDB
+reads the pipe like a regular CSV file. Decompression and parsing overlap, and
+only pipe-buffer-sized chunks of plain text exist at any time. The decompressor
+is a multi-threaded command-line tool when one is installed (lbzip2, pbzip2,
+pigz, xz -T0), otherwise Python's stdlib codec, which releases the GIL and so
+still runs beside DuckDB's parser.
+
+    with DecompressedPipe("Arade_1.csv.bz2") as pipe:
+        con.execute(f"COPY t FROM '{pipe.path}' (...)")
+"""
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstd inputs then need the zstd CLI (or DuckDB's native reader)
+    zstandard = None
+
+
+def _zstd_open(path: str, mode: str = "rb") -> Any:
+    return zstandard.open(path, mode)
+
+
+# Suffix -> codec name.
+_CODECS: Dict[str, str] = {
+    ".bz2": "bz2",
+    ".gz": "gzip",
+    ".xz": "xz",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+# Codec -> stdlib opener returning a binary file object of decompressed bytes.
+_OPENERS: Dict[str, Optional[Callable[..., Any]]] = {
+    "bz2": bz2.open,
+    "gzip": gzip.open,
+    "xz": lzma.open,
+    "zstd": _zstd_open if zstandard is not None else None,
+}
+# Codec -> command lines writing the decompressed file to stdout, preferred first.
+# All but zstd's decompress with several threads; zstd decompression is single-threaded but fast.
+_TOOLS: Dict[str, List[List[str]]] = {
+    "bz2": [["lbzip2", "-dc"], ["pbzip2", "-dc"]],
+    "gzip": [["pigz", "-dc"]],
+    "xz": [["xz", "-dc", "-T0"]],
+    "zstd": [["zstd", "-dcq"]],
+}
+# Codecs DuckDB's CSV reader decompresses itself.
+NATIVE_CODECS = ("gzip", "zstd")
+CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def compression_of(path: str) -> Optional[str]:
+    """Codec name for a compressed input ('bz2', 'gzip', 'xz', 'zstd'), or None for plain files."""
+    return _CODECS.get(Path(path).suffix.lower())
+
+
+def strip_compression_suffix(path: str) -> str:
+    """'Arade_1.csv.bz2' -> 'Arade_1.csv'."""
+    p = Path(path)
+    return str(p.with_suffix("")) if compression_of(path) else str(p)
+
+
+def needs_stream(path: str, decompress: str = "auto") -> bool:
+    """Whether DuckDB has to read path through a DecompressedPipe (decompress: 'auto' or 'stream')."""
+    codec = compression_of(path)
+    return codec is not None and (decompress == "stream" or codec not in NATIVE_CODECS)
+
+
+def decompressor_for(codec: str, preference: str = "auto") -> Tuple[str, Optional[List[str]]]:
+    """
+    Pick a decompressor: (name, argv) for a command-line tool or (name, None) for the stdlib codec.
+
+    preference is 'auto' (an installed tool, else Python), 'tool' or 'python'.
+    """
+    if preference in ("auto", "tool"):
+        for argv in _TOOLS.get(codec, []):
+            if shutil.which(argv[0]):
+                return argv[0], argv
+        if preference == "tool":
+            raise ValueError(f"No {codec} decompression tool found (tried {', '.join(a[0] for a in _TOOLS.get(codec, []))})")
+    if _OPENERS.get(codec) is None:
+        raise ValueError(f"No Python decompressor for {codec} (install zstandard, or the zstd CLI)")
+    return f"python-{codec}", None
+
+
+def _decompressed_chunks(source: str, argv: Optional[List[str]], chunk_bytes: int) -> Iterator[bytes]:
+    if argv is None:
+        with _OPENERS[compression_of(source)](source, "rb") as src:
+            while True:
+                chunk = src.read(chunk_bytes)
+                if not chunk:
+                    return
+                yield chunk
+    proc = subprocess.Popen(argv + [source], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            chunk = proc.stdout.read(chunk_bytes)
+            if not chunk:
+                break
+            yield chunk
+        stderr = proc.stderr.read().decode("utf-8", errors="replace").strip()
+        if proc.wait() != 0:
+            raise OSError(f"{argv[0]} failed on {source}: {stderr or f'exit code {proc.returncode}'}")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+
+def _mb_s(num_bytes: int, seconds: Optional[float]) -> Optional[float]:
+    return (num_bytes / (1024 * 1024)) / seconds if seconds else None
+
+
+def measure_decompression(source: str, decompressor: str = "auto", count_lines: bool = False) -> Dict[str, Any]:
+    """
+    Decompress source once, discarding the output, and time it.
+
+    Used where DuckDB decompresses internally (so the stream cannot be timed) and to count
+    lines. Returns the same fields as DecompressedPipe.stats(), plus "lines" with count_lines.
+    """
+    codec = compression_of(source)
+    if codec is None:
+        raise ValueError(f"Not a compressed input: {source}")
+    name, argv = decompressor_for(codec, decompressor)
+    decompressed = 0
+    lines = 0
+    last = b""
+    t0 = time.perf_counter()
+    for chunk in _decompressed_chunks(source, argv, CHUNK_BYTES):
+        decompressed += len(chunk)
+        if count_lines:
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    elapsed = time.perf_counter() - t0
+    stats: Dict[str, Any] = {
+        "codec": codec,
+        "decompressor": name,
+        "compressed_bytes": Path(source).stat().st_size,
+        "decompressed_bytes": decompressed,
+        "decompress_s": elapsed,
+        "stall_s": 0.0,
+        "decompress_mb_s": _mb_s(decompressed, elapsed),
+    }
+    if count_lines:
+        stats["lines"] = lines + (1 if last and last != b"\n" else 0)
+    return stats
+
+
+class DecompressedPipe:
+    """
+    Context manager exposing `path`, a FIFO that yields the decompressed contents of `source`.
+
+    After exit, stats() describes the stream: decompress_s is the time spent waiting on the
+    decompressor, stall_s the time spent waiting for DuckDB to drain the pipe. A decompression
+    error is re-raised on exit (DuckDB would otherwise just see an early EOF and load a
+    truncated table).
+    """
+
+    def __init__(self, source: str, decompressor: str = "auto", chunk_bytes: int = CHUNK_BYTES):
+        codec = compression_of(source)
+        if codec is None:
+            raise ValueError(f"Unsupported compressed input: {source}")
+        self.source = source
+        self.codec = codec
+        self.decompressor, self._argv = decompressor_for(codec, decompressor)
+        self.chunk_bytes = chunk_bytes
+        self.path = ""
+        self.compressed_bytes = Path(source).stat().st_size
+        self.decompressed_bytes = 0
+        self.decompress_s = 0.0
+        self.stall_s = 0.0
+        self.elapsed_s: Optional[float] = None
+        self._dir: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def _feed(self) -> None:
+        t0 = time.perf_counter()
+        chunks = _decompressed_chunks(self.source, self._argv, self.chunk_bytes)
+        try:
+            with open(self.path, "wb") as sink:
+                while True:
+                    r0 = time.perf_counter()
+                    chunk = next(chunks, None)
+                    r1 = time.perf_counter()
+                    self.decompress_s += r1 - r0
+                    if chunk is None:
+                        break
+                    sink.write(chunk)
+                    self.stall_s += time.perf_counter() - r1
+                    self.decompressed_bytes += len(chunk)
+        except BrokenPipeError:
+            pass  # reader went away (query failed or read only a sample); the reader decides
+        except BaseException as exc:
+            self._error = exc
+        finally:
+            chunks.close()
+            self.elapsed_s = time.perf_counter() - t0
+
+    def __enter__(self) -> "DecompressedPipe":
+        self._dir = tempfile.mkdtemp(prefix="bench_pipe_")
+        self.path = os.path.join(self._dir, Path(strip_compression_suffix(self.source)).name)
+        os.mkfifo(self.path)
+        self._thread = threading.Thread(target=self._feed, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._thread is not None:
+            while exc_type is not None and self._thread.is_alive():
+                # The reader failed: open and close the read end so a writer still waiting in
+                # open() or write() wakes up (and stops with EPIPE).
+                try:
+                    os.close(os.open(self.path, os.O_RDONLY | os.O_NONBLOCK))
+                except OSError:
+                    pass
+                self._thread.join(timeout=0.1)
+            self._thread.join()
+        if self._dir:
+            shutil.rmtree(self._dir, ignore_errors=True)
+        if exc_type is None and self._error is not None:
+            raise self._error
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "codec": self.codec,
+            "decompressor": self.decompressor,
+            "compressed_bytes": self.compressed_bytes,
+            "decompressed_bytes": self.decompressed_bytes,
+            "decompress_s": self.decompress_s,
+            "stall_s": self.stall_s,
+            "decompress_mb_s": _mb_s(self.decompressed_bytes, self.decompress_s),
+        }
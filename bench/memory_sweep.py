@@ -0,0 +1,217 @@
+# bench/memory_sweep.py
+"""Memory-limit sweep.
+
+Re-times a format's bound workload under decreasing DuckDB `memory_limit`
+values, plus one memory-heavy `materialize` query (the full scan into a temp
+table that the decompression measurement does). Per query family and limit it
+records the geometric-mean median latency, the peak bytes spilled to the temp
+directory and how many queries failed with an out-of-memory error. DuckDB frees
+a query's temp storage when it ends, so spill is sampled while the queries run: a
+second cursor polls duckdb_memory() temporary_storage_bytes and the size of
+duckdb_temporary_files() and keeps the largest value seen. Temp storage already
+held before the query (an in-memory base table paged out under a small limit) is
+read first and subtracted, so only the query's own spill is reported.
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+
+from utils_run import timed_query
+
+# DuckDB's convention: KB/MB/GB are powers of 1000, KiB/MiB/GiB powers of 1024.
+_UNITS = {
+    "": 1,
+    "b": 1,
+    "kb": 1000,
+    "mb": 1000**2,
+    "gb": 1000**3,
+    "tb": 1000**4,
+    "kib": 1024,
+    "mib": 1024**2,
+    "gib": 1024**3,
+    "tib": 1024**4,
+}
+# A limit whose overall slowdown vs. the largest limit reaches this counts as degraded.
+SLOWDOWN_THRESHOLD = 1.5
+MATERIALIZE_FAMILY = "materialize"
+# Seconds between temp-storage samples while a query runs.
+SPILL_POLL_INTERVAL_S = 0.005
+
+
+def parse_memory_limit(text: str) -> int:
+    """'256MB' / '1.5GiB' / '1000000' -> bytes."""
+    m = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*([a-zA-Z]*)\s*", text)
+    if not m or m.group(2).lower() not in _UNITS:
+        raise ValueError(f"Invalid memory limit '{text}'")
+    return int(float(m.group(1)) * _UNITS[m.group(2).lower()])
+
+
+def parse_memory_limits(spec: str) -> List[str]:
+    """'4GB,1GB,256MB' -> unique limits, largest first."""
+    limits: Dict[int, str] = {}
+    for part in spec.split(","):
+        if part.strip():
+            limits.setdefault(parse_memory_limit(part), part.strip())
+    return [limits[b] for b in sorted(limits, reverse=True)]
+
+
+def _geomean(values: List[Optional[float]]) -> Optional[float]:
+    vals = [v for v in values if v is not None and v > 0]
+    if not vals:
+        return None
+    return math.exp(sum(math.log(v) for v in vals) / len(vals))
+
+
+def _temp_bytes(cur: duckdb.DuckDBPyConnection) -> int:
+    """Spilled bytes DuckDB holds right now: buffer-managed temp storage or temp files, whichever is larger."""
+    managed = cur.execute("SELECT sum(temporary_storage_bytes) FROM duckdb_memory()").fetchone()[0]
+    files = cur.execute("SELECT sum(size) FROM duckdb_temporary_files()").fetchone()[0]
+    return max(int(managed or 0), int(files or 0))
+
+
+class _SpillSampler:
+    """
+    Temp storage the `with` block added on top of what was held when it started.
+
+    baseline is read on entry, peak is the largest value polled from a second cursor
+    while the block runs, and spill is max(peak - baseline, 0).
+    """
+
+    def __init__(self, con: duckdb.DuckDBPyConnection):
+        self._cur = con.cursor()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self.baseline: Optional[int] = None
+        self.peak: Optional[int] = None
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                value = _temp_bytes(self._cur)
+            except duckdb.Error:
+                return
+            self.peak = value if self.peak is None else max(self.peak, value)
+            if self._stop.wait(SPILL_POLL_INTERVAL_S):
+                return
+
+    @property
+    def spill(self) -> Optional[int]:
+        if self.baseline is None or self.peak is None:
+            return None
+        return max(self.peak - self.baseline, 0)
+
+    def __enter__(self) -> "_SpillSampler":
+        try:
+            self.baseline = _temp_bytes(self._cur)
+        except duckdb.Error:
+            self.baseline = None
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._cur.close()
+
+
+def _run_query(con: duckdb.DuckDBPyConnection, sql: str, repeats: int, warmup: int) -> Dict[str, Any]:
+    try:
+        with _SpillSampler(con) as spill:
+            m = timed_query(con, sql, repeats=repeats, warmup=warmup)
+    except duckdb.OutOfMemoryException as exc:
+        return {"status": "oom", "median_ms": None, "peak_spill_bytes": None, "error": str(exc).splitlines()[0]}
+    except duckdb.Error as exc:
+        return {"status": "error", "median_ms": None, "peak_spill_bytes": None, "error": str(exc).splitlines()[0]}
+    return {"status": "ok", "median_ms": m["median_ms"], "peak_spill_bytes": spill.spill, "error": None}
+
+
+def run_memory_sweep(
+    con: duckdb.DuckDBPyConnection,
+    queries: List[Tuple[str, str]],
+    scan: str,
+    limits: List[str],
+    repeats: int,
+    warmup: int,
+) -> Dict[str, Any]:
+    """
+    Time (family, sql) queries plus a full materialization of `scan` at each memory limit.
+
+    Returns {"limits", "limit_bytes", "families": {family: [entry per limit]}, "overall": [entry per limit],
+    "degraded_at", "first_oom_at"}. Family entries hold the geomean median of the family's
+    successful queries, the peak spill of any of its queries and ok/oom/error counts.
+    Overall slowdown is the geomean, over queries that succeeded at both limits, of each
+    query's median relative to the largest limit. The connection's memory_limit is restored.
+    """
+    original = con.execute("SELECT current_setting('memory_limit')").fetchone()[0]
+    materialize = (
+        MATERIALIZE_FAMILY,
+        f"CREATE OR REPLACE TEMP TABLE memory_sweep_materialize AS SELECT * FROM {scan}",
+    )
+    runs: List[List[Dict[str, Any]]] = []
+    try:
+        for limit in limits:
+            con.execute(f"SET memory_limit='{limit}';")
+            level = []
+            for family, sql in list(queries) + [materialize]:
+                level.append({"family": family, **_run_query(con, sql, repeats, warmup)})
+            con.execute("DROP TABLE IF EXISTS memory_sweep_materialize;")
+            runs.append(level)
+    finally:
+        con.execute(f"SET memory_limit='{original}';")
+
+    families: Dict[str, List[Dict[str, Any]]] = {}
+    overall: List[Dict[str, Any]] = []
+    baseline = runs[0] if runs else []
+    for limit, level in zip(limits, runs):
+        by_family: Dict[str, List[Dict[str, Any]]] = {}
+        for r in level:
+            by_family.setdefault(r["family"], []).append(r)
+        for family, results in by_family.items():
+            ok = [r for r in results if r["status"] == "ok"]
+            spills = [r["peak_spill_bytes"] for r in ok if r["peak_spill_bytes"] is not None]
+            families.setdefault(family, []).append({
+                "limit": limit,
+                "median_ms": _geomean([r["median_ms"] for r in ok]),
+                "peak_spill_bytes": max(spills) if spills else None,
+                "ok": len(ok),
+                "oom": sum(1 for r in results if r["status"] == "oom"),
+                "errors": sum(1 for r in results if r["status"] == "error"),
+                "first_error": next((r["error"] for r in results if r["error"]), None),
+            })
+        ratios = [
+            r["median_ms"] / b["median_ms"]
+            for r, b in zip(level, baseline)
+            if r["status"] == "ok" and b["status"] == "ok" and b["median_ms"]
+        ]
+        spills = [r["peak_spill_bytes"] for r in level if r["peak_spill_bytes"] is not None]
+        overall.append({
+            "limit": limit,
+            "median_ms": _geomean([r["median_ms"] for r in level if r["status"] == "ok"]),
+            "slowdown": _geomean(ratios),
+            "peak_spill_bytes": max(spills) if spills else None,
+            "ok": sum(1 for r in level if r["status"] == "ok"),
+            "oom": sum(1 for r in level if r["status"] == "oom"),
+            "errors": sum(1 for r in level if r["status"] == "error"),
+        })
+
+    degraded_at = next(
+        (
+            o["limit"]
+            for o in overall
+            if o["oom"] or o["errors"] or (o["slowdown"] is not None and o["slowdown"] >= SLOWDOWN_THRESHOLD)
+        ),
+        None,
+    )
+    return {
+        "limits": list(limits),
+        "limit_bytes": [parse_memory_limit(limit) for limit in limits],
+        "families": families,
+        "overall": overall,
+        "degraded_at": degraded_at,
+        "first_oom_at": next((o["limit"] for o in overall if o["oom"]), None),
+    }
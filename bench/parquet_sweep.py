@@ -0,0 +1,542 @@
+# bench/parquet_sweep.py
+"""Parquet write-parameter sweeps.
+
+Sweeps rewrite the already-ingested (and optionally sorted) source table with
+one Parquet parameter varied, time the workload's scalar queries on each file
+and delete it again; only the measurements go into the report.
+
+  row-group size     run_row_group_sweep  -> report["row_group_sweep"]
+  compression level  run_level_sweep      -> report["compression_level_sweep"]
+  file layout        run_layout_sweep     -> report["parquet_layouts"]
+  lookup structures  run_variant_sweep    -> report["parquet_variants"]
+"""
+from __future__ import annotations
+
+import math
+import shutil
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import duckdb
+
+from backends import parquet_backend
+from memory_sweep import parse_memory_limit
+from utils_run import _describe_types, format_value_sql, timed_query
+from workload import ScanBinding, bind_workload
+
+# Level sweep used when --parquet-compression-levels is "default".
+DEFAULT_LEVELS = {"zstd": [1, 3, 9, 19], "gzip": [1, 6, 9]}
+# Codecs whose levels DuckDB's COPY accepts; others go through the pyarrow writer.
+_DUCKDB_LEVEL_CODECS = {"zstd"}
+
+# Row-group sizes whose file is more than this much larger than the codec's smallest are not recommended.
+SIZE_TOLERANCE = 0.05
+
+# Variant sweep used when --parquet-variants is "default".
+DEFAULT_VARIANTS = (
+    "duckdb:bloom,duckdb:bloom=0.001,duckdb:bloom+dict_size=all,duckdb:bloom+dict_page=16MB,"
+    "pyarrow:bloom,pyarrow:page_index,pyarrow:page_index+page_size=64KB,pyarrow:bloom+page_index"
+)
+# Per-writer baseline every variant is compared with: no bloom filters, no page index.
+_VARIANT_BASELINES = {
+    "duckdb": {"writer": "duckdb", "bloom_filter": False},
+    "pyarrow": {"writer": "pyarrow"},
+}
+
+
+def _geomean(values: List[Optional[float]]) -> Optional[float]:
+    vals = [v for v in values if v is not None and v > 0]
+    if not vals:
+        return None
+    return math.exp(sum(math.log(v) for v in vals) / len(vals))
+
+
+def parse_level_spec(spec: str) -> Dict[str, List[int]]:
+    """'default' or 'zstd=1,3,9,19;gzip=1,6,9' -> {codec: [levels]}."""
+    if spec.strip().lower() == "default":
+        return {codec: list(levels) for codec, levels in DEFAULT_LEVELS.items()}
+    out: Dict[str, List[int]] = {}
+    for part in spec.split(";"):
+        if not part.strip():
+            continue
+        codec, sep, levels = part.partition("=")
+        if not sep:
+            raise ValueError(f"Expected codec=levels, got '{part}'")
+        out[codec.strip().lower()] = sorted({int(v) for v in levels.split(",") if v.strip()})
+    return out
+
+
+def _full_read_s(con: duckdb.DuckDBPyConnection, scan: str, repeats: int) -> float:
+    """Median time to materialize every column (a real scan; min() alone is answered from Parquet stats)."""
+    times = []
+    for _ in range(max(1, repeats)):
+        t0 = time.perf_counter()
+        con.execute(f"CREATE OR REPLACE TEMP TABLE level_sweep_read AS SELECT * FROM {scan};")
+        times.append(time.perf_counter() - t0)
+    con.execute("DROP TABLE IF EXISTS level_sweep_read;")
+    return statistics.median(times)
+
+
+def _measure_file(
+    con: duckdb.DuckDBPyConnection,
+    rc,
+    meta: Dict[str, Any],
+    col_types: Dict[str, str],
+) -> Dict[str, Any]:
+    """Time the scalar workload queries on one written file and count prunable row groups."""
+    args = rc.args
+    ctx = rc.workload_ctx
+    parquet_path = meta["parquet_path"]
+    binding = ScanBinding(
+        fmt="parquet",
+        variant=f"parquet_{meta['codec']}",
+        scan=parquet_backend.scan_expr(parquet_path, meta.get("partition_types")),
+        write_meta=meta,
+        filter_val_sql=rc.filter_val_sql,
+    )
+    queries: Dict[str, Optional[float]] = {}
+    for bq in bind_workload(rc.workload, binding, ctx):
+        if bq.kind != "scalar":
+            continue
+        queries[bq.report_key] = timed_query(con, bq.sql, repeats=args.repeats, warmup=args.warmup)["median_ms"]
+    pruning: Dict[str, Any] = {}
+    if ctx.filter_col in col_types:
+        pruning["selective_predicate"] = parquet_backend.row_group_pruning(
+            con, parquet_path, ctx.filter_col, rc.filter_val_sql, col_types[ctx.filter_col]
+        )
+    if ctx.random_access_col and ctx.random_access_col in col_types:
+        pruning["random_access"] = parquet_backend.row_group_pruning(
+            con,
+            parquet_path,
+            ctx.random_access_col,
+            format_value_sql(ctx.random_access_val),
+            col_types[ctx.random_access_col],
+        )
+    return {
+        "output_size_bytes": meta.get("output_size_bytes"),
+        "compression_time_s": meta.get("compression_time_s"),
+        "row_group_count": meta.get("row_group_count"),
+        "queries_median_ms": queries,
+        "pruning": pruning,
+    }
+
+
+def _recommend_row_group_size(by_codec: Dict[str, List[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    Pick the size with the lowest point-query latency (geomean of selective_predicate and
+    random_access medians across codecs) among sizes whose files stay within SIZE_TOLERANCE
+    of each codec's smallest file.
+    """
+    scores: Dict[int, Dict[str, List[Optional[float]]]] = {}
+    for entries in by_codec.values():
+        sizes = [e["output_size_bytes"] for e in entries if e.get("output_size_bytes")]
+        smallest = min(sizes) if sizes else None
+        for e in entries:
+            s = scores.setdefault(e["row_group_size"], {"latency": [], "size_ratio": []})
+            q = e["queries_median_ms"]
+            s["latency"].append(_geomean([q.get("selective_predicate"), q.get("random_access")]))
+            if smallest and e.get("output_size_bytes"):
+                s["size_ratio"].append(e["output_size_bytes"] / smallest)
+    candidates = []
+    for size, s in scores.items():
+        latency = _geomean(s["latency"])
+        size_ratio = _geomean(s["size_ratio"])
+        if latency is None:
+            continue
+        candidates.append((size, latency, size_ratio))
+    if not candidates:
+        return None
+    within = [c for c in candidates if c[2] is None or c[2] <= 1.0 + SIZE_TOLERANCE] or candidates
+    size, latency, size_ratio = min(within, key=lambda c: c[1])
+    return {
+        "row_group_size": size,
+        "point_query_geomean_ms": latency,
+        "size_vs_smallest": size_ratio,
+        "reason": (
+            f"lowest selective/random-access latency among sizes within "
+            f"{SIZE_TOLERANCE:.0%} of the smallest file per codec"
+        ),
+    }
+
+
+def run_row_group_sweep(
+    con: duckdb.DuckDBPyConnection,
+    rc,
+    codecs: List[str],
+    row_group_sizes: List[int],
+) -> Dict[str, Any]:
+    """
+    Write the source table once per codec x row-group size and measure each file.
+
+    Returns {"row_group_sizes", "by_codec": {codec: [entry per size]}, "recommendation"}.
+    """
+    col_types = _describe_types(con, rc.table)
+    by_codec: Dict[str, List[Dict[str, Any]]] = {}
+    for codec in codecs:
+        for size in row_group_sizes:
+            out = Path(rc.out_dir) / f"rg_sweep_{codec}_{size}_{rc.run_tag}.parquet"
+            meta = parquet_backend.write(
+                con,
+                rc.source_table,
+                str(out),
+                options={"codec": codec, "row_group_size": size},
+            )
+            try:
+                entry = _measure_file(con, rc, meta, col_types)
+            finally:
+                Path(meta["parquet_path"]).unlink(missing_ok=True)
+            by_codec.setdefault(codec, []).append({"row_group_size": size, **entry})
+    return {
+        "row_group_sizes": list(row_group_sizes),
+        "by_codec": by_codec,
+        "recommendation": _recommend_row_group_size(by_codec),
+    }
+
+
+def _pareto_flags(points: List[Dict[str, Any]], keys: List[str]) -> List[bool]:
+    """True where no other point is <= on every key and < on at least one (all keys minimized)."""
+    flags = []
+    for p in points:
+        if any(p.get(k) is None for k in keys):
+            flags.append(False)
+            continue
+        dominated = False
+        for q in points:
+            if q is p or any(q.get(k) is None for k in keys):
+                continue
+            if all(q[k] <= p[k] for k in keys) and any(q[k] < p[k] for k in keys):
+                dominated = True
+                break
+        flags.append(not dominated)
+    return flags
+
+
+def run_level_sweep(
+    con: duckdb.DuckDBPyConnection,
+    rc,
+    levels_by_codec: Dict[str, List[int]],
+) -> Dict[str, Any]:
+    """
+    Write the source table once per codec x compression level and measure each file.
+
+    Each point records size, write time, full-read time and the scalar query medians.
+    zstd levels are written by DuckDB, other codecs by pyarrow (recorded as `writer`).
+    `pareto` marks points on the (write time, size, full-read time) Pareto front of
+    their codec/writer group, so a point is only dominated by levels of the same codec
+    written by the same writer; pareto_fronts lists each group's front.
+    """
+    args = rc.args
+    col_types = _describe_types(con, rc.table)
+    points: List[Dict[str, Any]] = []
+    for codec, levels in levels_by_codec.items():
+        writer = "duckdb" if codec in _DUCKDB_LEVEL_CODECS else "pyarrow"
+        for level in levels:
+            out = Path(rc.out_dir) / f"level_sweep_{codec}_{level}_{rc.run_tag}.parquet"
+            point: Dict[str, Any] = {
+                "codec": codec,
+                "level": level,
+                "writer": writer,
+                "group": f"{codec}/{writer}",
+                "label": f"{codec}-{level}",
+            }
+            try:
+                meta = parquet_backend.write(
+                    con,
+                    rc.source_table,
+                    str(out),
+                    options={
+                        "codec": codec,
+                        "row_group_size": args.parquet_row_group_size,
+                        "compression_level": level,
+                        "writer": writer,
+                    },
+                )
+            except Exception as exc:
+                point["error"] = str(exc)
+                points.append(point)
+                Path(out).unlink(missing_ok=True)
+                continue
+            try:
+                entry = _measure_file(con, rc, meta, col_types)
+                entry["full_read_s"] = _full_read_s(con, parquet_backend.scan_expr(meta["parquet_path"]), args.repeats)
+            finally:
+                Path(meta["parquet_path"]).unlink(missing_ok=True)
+            entry.pop("pruning", None)
+            point.update(entry)
+            points.append(point)
+    keys = ["compression_time_s", "output_size_bytes", "full_read_s"]
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for point in points:
+        groups.setdefault(point["group"], []).append(point)
+    for group_points in groups.values():
+        for point, on_front in zip(group_points, _pareto_flags(group_points, keys)):
+            point["pareto"] = on_front
+    return {
+        "levels": levels_by_codec,
+        "objectives": keys,
+        "points": points,
+        "pareto_fronts": {
+            group: [p["label"] for p in group_points if p.get("pareto")] for group, group_points in groups.items()
+        },
+    }
+
+
+def parse_layout_spec(spec: str) -> List[Dict[str, Any]]:
+    """
+    'single,per_thread,file_size=64MB,hive=city,hive+file_size=64MB' -> parquet_backend layout options.
+
+    Options joined with '+' combine into one layout. 'hive' without a column partitions by
+    the filter column (resolved in run_layout_sweep). The single-file layout is always included.
+    """
+    layouts: List[Dict[str, Any]] = [{}]
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        layout: Dict[str, Any] = {}
+        for opt in part.split("+"):
+            key, _, value = opt.strip().partition("=")
+            key = key.strip().lower()
+            if key == "single":
+                continue
+            if key == "hive":
+                layout["partition_by"] = value.strip()
+            elif key == "per_thread":
+                layout["per_thread_output"] = True
+            elif key == "file_size":
+                if not value.strip():
+                    raise ValueError("file_size needs a size, e.g. file_size=64MB")
+                layout["file_size_bytes"] = parse_memory_limit(value)
+            else:
+                raise ValueError(f"Unknown layout option '{opt}' (expected single, hive[=col], per_thread, file_size=SIZE)")
+        if "partition_by" in layout and layout.get("per_thread_output"):
+            raise ValueError(f"'{part}': DuckDB cannot combine PER_THREAD_OUTPUT with hive partitioning")
+        if layout not in layouts:
+            layouts.append(layout)
+    return layouts
+
+
+def _file_pruning(con: duckdb.DuckDBPyConnection, meta: Dict[str, Any], col: str, value_sql: str) -> Dict[str, Any]:
+    """Files holding rows with `col = value` out of all files: the files a perfect reader opens."""
+    scan = parquet_backend.scan_expr(meta["parquet_path"], meta.get("partition_types"), filename=True)
+    col_sql = '"' + col.replace('"', '""') + '"'
+    matching = con.execute(f"SELECT count(DISTINCT filename) FROM {scan} WHERE {col_sql} = {value_sql}").fetchone()[0]
+    files = meta.get("file_count") or 0
+    return {
+        "files": files,
+        "files_matching": matching,
+        "pruned_fraction": (files - matching) / files if files else None,
+    }
+
+
+def _threads(con: duckdb.DuckDBPyConnection) -> int:
+    return int(con.execute("SELECT current_setting('threads')").fetchone()[0])
+
+
+def run_layout_sweep(
+    con: duckdb.DuckDBPyConnection,
+    rc,
+    codec: str,
+    layouts: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Write the source table once per file layout and compare each with the single file.
+
+    Each entry records size, write time, file/partition counts, the scalar query medians,
+    file and row-group pruning for the selective and random-access predicates, and the
+    full-read time at the session's thread count and on one thread (parallel_speedup),
+    which is where multi-file scan parallelism shows. Speedups are single-file time over
+    the layout's time.
+    """
+    args = rc.args
+    ctx = rc.workload_ctx
+    col_types = _describe_types(con, rc.table)
+    threads = _threads(con)
+    entries: List[Dict[str, Any]] = []
+    for i, layout in enumerate(layouts):
+        if layout.get("partition_by") == "":
+            layout = {**layout, "partition_by": ctx.filter_col}
+        out = Path(rc.out_dir) / f"layout_sweep_{codec}_{i}_{rc.run_tag}.parquet"
+        entry: Dict[str, Any] = {"layout": parquet_backend.layout_name(parquet_backend.ParquetOptions(**layout))}
+        meta: Optional[Dict[str, Any]] = None
+        try:
+            meta = parquet_backend.write(
+                con,
+                rc.source_table,
+                str(out),
+                options={"codec": codec, "row_group_size": args.parquet_row_group_size, **layout},
+            )
+            entry.update(_measure_file(con, rc, meta, col_types))
+            entry["file_count"] = meta["file_count"]
+            entry["partition_count"] = meta["partition_count"]
+            if ctx.filter_col in col_types:
+                entry["pruning"]["selective_files"] = _file_pruning(con, meta, ctx.filter_col, rc.filter_val_sql)
+            if ctx.random_access_col and ctx.random_access_col in col_types:
+                entry["pruning"]["random_access_files"] = _file_pruning(
+                    con, meta, ctx.random_access_col, format_value_sql(ctx.random_access_val)
+                )
+            scan = parquet_backend.scan_expr(meta["parquet_path"], meta.get("partition_types"))
+            entry["full_read_s"] = _full_read_s(con, scan, args.repeats)
+            con.execute("SET threads=1;")
+            try:
+                entry["full_read_1t_s"] = _full_read_s(con, scan, args.repeats)
+            finally:
+                con.execute(f"SET threads={threads};")
+            entry["parallel_speedup"] = (
+                entry["full_read_1t_s"] / entry["full_read_s"] if entry["full_read_s"] else None
+            )
+        except (duckdb.Error, ValueError) as exc:
+            entry["error"] = str(exc).splitlines()[0]
+        finally:
+            written = Path(meta["parquet_path"]) if meta else out
+            if written.is_dir():
+                shutil.rmtree(written, ignore_errors=True)
+            else:
+                written.unlink(missing_ok=True)
+        entries.append(entry)
+
+    base = entries[0] if entries and not entries[0].get("error") else None
+    for e in entries:
+        if base is None or e.get("error"):
+            continue
+        e["size_vs_single"] = (
+            e["output_size_bytes"] / base["output_size_bytes"] if base.get("output_size_bytes") else None
+        )
+        e["full_read_speedup"] = base["full_read_s"] / e["full_read_s"] if e.get("full_read_s") else None
+        e["query_speedup"] = {
+            key: base["queries_median_ms"][key] / ms
+            for key, ms in e["queries_median_ms"].items()
+            if ms and base["queries_median_ms"].get(key)
+        }
+    return {"codec": codec, "threads": threads, "baseline": "single", "layouts": entries}
+
+
+def parse_variant_spec(spec: str, row_group_size: int) -> List[Dict[str, Any]]:
+    """
+    'default' or 'duckdb:bloom=0.001,pyarrow:page_index+page_size=64KB' -> labelled parquet_backend options.
+
+    Each variant is [writer:]option+option (writer defaults to duckdb):
+      bloom[=fpp]     bloom filters (DuckDB: dictionary-encoded columns; pyarrow: the
+                      filter and random-access columns, resolved in run_variant_sweep)
+      dict_size=N|all DuckDB dictionary entry limit; 'all' lets every column chunk's
+                      dictionary (and so its bloom filter) fit a full row group
+      dict_page=SIZE  dictionary page byte limit
+      page_index      pyarrow ColumnIndex/OffsetIndex (page-level min/max)
+      page_size=SIZE  pyarrow target data page size
+    The no-filter, no-index baseline of each writer used comes first.
+    Returns [{"label", "options"}].
+    """
+    if spec.strip().lower() == "default":
+        spec = DEFAULT_VARIANTS
+    variants: List[Dict[str, Any]] = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        writer, sep, opts_text = part.strip().rpartition(":")
+        writer = writer.strip().lower() if sep else "duckdb"
+        if writer not in _VARIANT_BASELINES:
+            raise ValueError(f"Unknown writer '{writer}' in '{part}' (expected duckdb or pyarrow)")
+        options: Dict[str, Any] = {"writer": writer}
+        for opt in opts_text.split("+"):
+            key, _, value = opt.strip().partition("=")
+            key, value = key.strip().lower(), value.strip()
+            if key == "bloom":
+                options["bloom_filter"] = True
+                if value:
+                    options["bloom_filter_fpp"] = float(value)
+                    if not 0.0 < options["bloom_filter_fpp"] < 1.0:
+                        raise ValueError(f"bloom false-positive ratio must be in (0, 1), got {value}")
+            elif key == "dict_size" and writer == "duckdb":
+                # DuckDB abandons a dictionary (and writes no usable filter) once it reaches the limit.
+                options["dictionary_size_limit"] = row_group_size + 1 if value.lower() == "all" else int(value)
+            elif key == "dict_page":
+                options["dictionary_page_size"] = parse_memory_limit(value)
+            elif key == "page_index" and writer == "pyarrow":
+                options["page_index"] = True
+            elif key == "page_size" and writer == "pyarrow":
+                options["data_page_size"] = parse_memory_limit(value)
+            else:
+                raise ValueError(
+                    f"Unknown {writer} variant option '{opt}' "
+                    "(duckdb: bloom[=fpp], dict_size=N|all, dict_page=SIZE; "
+                    "pyarrow: bloom[=fpp], dict_page=SIZE, page_index, page_size=SIZE)"
+                )
+        variants.append({"label": f"{writer}:{opts_text.strip()}", "options": options})
+    writers = [w for w in _VARIANT_BASELINES if any(v["options"]["writer"] == w for v in variants)]
+    baselines = [{"label": f"{w}:plain", "options": dict(_VARIANT_BASELINES[w])} for w in writers]
+    return baselines + [v for v in variants if v["options"] not in [b["options"] for b in baselines]]
+
+
+def run_variant_sweep(
+    con: duckdb.DuckDBPyConnection,
+    rc,
+    codec: str,
+    variants: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Write the source table once per lookup-structure variant and compare it with its writer's baseline.
+
+    Each entry records size, bloom filter bytes and columns, the scalar query medians, and for the
+    selective and random-access predicates the row groups min/max statistics and bloom filters
+    rule out. size_overhead is the variant's extra bytes over the baseline as a fraction of it;
+    query_speedup is baseline time / variant time. DuckDB reads bloom filters but not page
+    indexes, so page-index variants show their size cost here and their benefit only in
+    readers that use them.
+    """
+    ctx = rc.workload_ctx
+    col_types = _describe_types(con, rc.table)
+    lookup_cols = [c for c in (ctx.filter_col, ctx.random_access_col) if c and c in col_types]
+    predicates = {"selective_predicate": (ctx.filter_col, rc.filter_val_sql)}
+    if ctx.random_access_col:
+        predicates["random_access"] = (ctx.random_access_col, format_value_sql(ctx.random_access_val))
+    entries: List[Dict[str, Any]] = []
+    for i, variant in enumerate(variants):
+        options = dict(variant["options"])
+        if options["writer"] == "pyarrow" and options.get("bloom_filter"):
+            if not options.get("bloom_filter_columns"):
+                options["bloom_filter_columns"] = list(dict.fromkeys(lookup_cols))
+            options.setdefault("bloom_filter_ndv", rc.column_ndv)
+        out = Path(rc.out_dir) / f"variant_sweep_{codec}_{i}_{rc.run_tag}.parquet"
+        entry: Dict[str, Any] = {"variant": variant["label"], "writer": options["writer"]}
+        meta: Optional[Dict[str, Any]] = None
+        try:
+            meta = parquet_backend.write(
+                con,
+                rc.source_table,
+                str(out),
+                options={"codec": codec, "row_group_size": rc.args.parquet_row_group_size, **options},
+            )
+            entry.update(_measure_file(con, rc, meta, col_types))
+            entry["bloom_filter_bytes"] = meta["bloom_filter_bytes"]
+            entry["bloom_filter_columns"] = meta["bloom_filter_columns"]
+            entry["page_index"] = meta["page_index"]
+            for key, (col, value_sql) in predicates.items():
+                if col in col_types:
+                    entry["pruning"][f"{key}_bloom"] = parquet_backend.bloom_filter_pruning(
+                        con, meta["parquet_path"], col, value_sql
+                    )
+        except (duckdb.Error, ValueError, RuntimeError) as exc:
+            entry["error"] = str(exc).splitlines()[0]
+        finally:
+            Path(meta["parquet_path"] if meta else out).unlink(missing_ok=True)
+        entries.append(entry)
+
+    baselines = {
+        e["writer"]: e for e, v in zip(entries, variants) if v["label"].endswith(":plain") and not e.get("error")
+    }
+    for e in entries:
+        base = baselines.get(e["writer"])
+        if base is None or e.get("error"):
+            continue
+        e["baseline"] = base["variant"]
+        e["size_overhead_bytes"] = e["output_size_bytes"] - base["output_size_bytes"]
+        e["size_overhead"] = (
+            e["size_overhead_bytes"] / base["output_size_bytes"] if base.get("output_size_bytes") else None
+        )
+        e["query_speedup"] = {
+            key: base["queries_median_ms"][key] / ms
+            for key, ms in e["queries_median_ms"].items()
+            if ms and base["queries_median_ms"].get(key)
+        }
+    return {"codec": codec, "lookup_columns": lookup_cols, "variants": entries}
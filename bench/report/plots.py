@@ -299,6 +299,251 @@ def _plot_ndv_by_type(report: Dict[str, Any], out_dir: Path) -> None:
     plt.close(fig)
 
 
+def _plot_throughput(report: Dict[str, Any], out_dir: Path) -> None:
+    series = [
+        (name, body["throughput"].get("levels", []))
+        for name, body in report.get("formats", {}).items()
+        if body.get("throughput")
+    ]
+    if not series:
+        return
+
+    fig, axes = plt.subplots(nrows=1, ncols=2, figsize=(10, 4))
+    for name, levels in series:
+        xs = [lvl["clients"] for lvl in levels if lvl.get("qps") is not None]
+        qps = [lvl["qps"] for lvl in levels if lvl.get("qps") is not None]
+        if xs:
+            axes[0].plot(xs, qps, marker="o", label=name)
+        xs = [lvl["clients"] for lvl in levels if lvl.get("p95_ms") is not None]
+        p95 = [lvl["p95_ms"] for lvl in levels if lvl.get("p95_ms") is not None]
+        if xs:
+            line = axes[1].plot(xs, p95, marker="o", label=f"{name} p95")[0]
+            p99 = [lvl.get("p99_ms") for lvl in levels if lvl.get("p95_ms") is not None]
+            axes[1].plot(xs, p99, linestyle="--", color=line.get_color(), alpha=0.6)
+    client_counts = sorted({lvl["clients"] for _, levels in series for lvl in levels})
+    for ax in axes:
+        ax.set_xticks(client_counts)
+    axes[0].set_title("Throughput vs Clients")
+    axes[0].set_xlabel("Concurrent clients")
+    axes[0].set_ylabel("Queries / s")
+    axes[0].legend(fontsize=8)
+    axes[1].set_title("Latency under Load (p95 solid, p99 dashed)")
+    axes[1].set_xlabel("Concurrent clients")
+    axes[1].set_ylabel("ms")
+    axes[1].legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig(out_dir / "throughput.png", dpi=150)
+    plt.close(fig)
+
+
+def _plot_thread_scaling(report: Dict[str, Any], out_dir: Path) -> None:
+    sweeps = [
+        (name, body["thread_scaling"])
+        for name, body in report.get("formats", {}).items()
+        if body.get("thread_scaling")
+    ]
+    if not sweeps:
+        return
+
+    panels = ["overall"]
+    for _, sweep in sweeps:
+        for family in sweep.get("families", {}):
+            if family not in panels:
+                panels.append(family)
+    n = len(panels)
+    ncols = 2
+    nrows = (n + ncols - 1) // ncols
+    fig, axes = plt.subplots(nrows=nrows, ncols=ncols, figsize=(9, 3.5 * nrows), squeeze=False)
+    axes_flat = [ax for row in axes for ax in row]
+    for idx, panel in enumerate(panels):
+        ax = axes_flat[idx]
+        threads_seen: List[int] = []
+        for name, sweep in sweeps:
+            threads = sweep.get("threads", [])
+            curves = sweep.get("overall") if panel == "overall" else sweep.get("families", {}).get(panel)
+            if not curves:
+                continue
+            pts = [(t, sp) for t, sp in zip(threads, curves.get("speedup", [])) if sp is not None]
+            if pts:
+                ax.plot([t for t, _ in pts], [sp for _, sp in pts], marker="o", label=name)
+                threads_seen = sorted(set(threads_seen) | set(threads))
+        if threads_seen:
+            base = threads_seen[0]
+            ax.plot(threads_seen, [t / base for t in threads_seen], linestyle="--", color="gray", label="ideal")
+            ax.set_xticks(threads_seen)
+        ax.set_title(panel)
+        ax.set_xlabel("Threads")
+        ax.set_ylabel("Speedup")
+        ax.legend(fontsize=8)
+    for ax in axes_flat[n:]:
+        ax.axis("off")
+    fig.suptitle("Thread Scaling (speedup vs. smallest thread count)")
+    fig.tight_layout()
+    fig.savefig(out_dir / "thread_scaling.png", dpi=150)
+    plt.close(fig)
+
+
+def _plot_memory_limit_sweep(report: Dict[str, Any], out_dir: Path) -> None:
+    sweeps = [
+        (name, body["memory_limit_sweep"])
+        for name, body in report.get("formats", {}).items()
+        if body.get("memory_limit_sweep")
+    ]
+    if not sweeps:
+        return
+
+    fig, axes = plt.subplots(nrows=1, ncols=2, figsize=(10, 4))
+    for name, sweep in sweeps:
+        limit_mb = [b / (1024 * 1024) for b in sweep.get("limit_bytes", [])]
+        overall = sweep.get("overall", [])
+        pts = [(x, o["median_ms"]) for x, o in zip(limit_mb, overall) if o.get("median_ms") is not None]
+        if pts:
+            line = axes[0].plot([p[0] for p in pts], [p[1] for p in pts], marker="o", label=name)[0]
+            oom = [(x, o["median_ms"] or pts[-1][1]) for x, o in zip(limit_mb, overall) if o.get("oom")]
+            if oom:
+                axes[0].scatter([p[0] for p in oom], [p[1] for p in oom], marker="x", s=80, color=line.get_color())
+        spill = [(x, (o.get("peak_spill_bytes") or 0) / (1024 * 1024)) for x, o in zip(limit_mb, overall)]
+        if spill:
+            axes[1].plot([p[0] for p in spill], [p[1] for p in spill], marker="o", label=name)
+    for ax in axes:
+        ax.set_xscale("log")
+        ax.invert_xaxis()
+        ax.set_xlabel("memory_limit (MB)")
+    axes[0].set_title("Workload Latency vs Memory Limit (x = OOM)")
+    axes[0].set_ylabel("Geomean median ms")
+    axes[0].legend(fontsize=8)
+    axes[1].set_title("Peak Spill")
+    axes[1].set_ylabel("Peak MB in temp_directory")
+    axes[1].legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig(out_dir / "memory_limit_sweep.png", dpi=150)
+    plt.close(fig)
+
+
+def _plot_parquet_layouts(report: Dict[str, Any], out_dir: Path) -> None:
+    entries = [e for e in report.get("parquet_layouts", {}).get("layouts", []) if not e.get("error")]
+    if len(entries) < 2:
+        return
+    labels = [e["layout"] for e in entries]
+    query_keys = ["full_scan_min", "selective_predicate", "random_access"]
+    fig, axes = plt.subplots(nrows=1, ncols=2, figsize=(12, 4))
+    _plot_grouped_bars(
+        axes[0],
+        labels,
+        query_keys,
+        [[e.get("query_speedup", {}).get(key) for e in entries] for key in query_keys],
+        "Query Speedup vs Single File",
+        "Single-file ms / layout ms",
+    )
+    threads = report["parquet_layouts"].get("threads")
+    _plot_grouped_bars(
+        axes[1],
+        labels,
+        [f"{threads} threads", "1 thread"],
+        [[e.get("full_read_s") for e in entries], [e.get("full_read_1t_s") for e in entries]],
+        "Full Read Time by Layout",
+        "Seconds",
+    )
+    fig.tight_layout()
+    fig.savefig(out_dir / "parquet_layouts.png", dpi=150)
+    plt.close(fig)
+
+
+def _plot_parquet_variants(report: Dict[str, Any], out_dir: Path) -> None:
+    entries = [
+        e for e in report.get("parquet_variants", {}).get("variants", []) if not e.get("error") and "baseline" in e
+    ]
+    if len(entries) < 2:
+        return
+    labels = [e["variant"] for e in entries]
+    query_keys = ["selective_predicate", "random_access"]
+    fig, axes = plt.subplots(nrows=1, ncols=2, figsize=(12, 4))
+    _plot_grouped_bars(
+        axes[0],
+        labels,
+        query_keys,
+        [[e.get("query_speedup", {}).get(key) for e in entries] for key in query_keys],
+        "Point-Lookup Speedup vs Plain File",
+        "Plain ms / variant ms",
+    )
+    _plot_grouped_bars(
+        axes[1],
+        labels,
+        ["size overhead %"],
+        [[(e["size_overhead"] * 100) if e.get("size_overhead") is not None else None for e in entries]],
+        "Extra File Size vs Plain File",
+        "Percent",
+    )
+    fig.tight_layout()
+    fig.savefig(out_dir / "parquet_variants.png", dpi=150)
+    plt.close(fig)
+
+
+def _plot_vortex_native(report: Dict[str, Any], out_dir: Path) -> None:
+    entries = [e for e in report.get("vortex_native", {}).get("strategies", []) if e.get("native")]
+    if not entries:
+        return
+    labels = [f"{e['strategy']}:{name}" for e in entries for name in e["native"]]
+    native_ms = [nat.get("median_ms") for e in entries for nat in e["native"].values()]
+    extension_ms = [
+        ((e.get("extension") or {}).get(name) or {}).get("median_ms") for e in entries for name in e["native"]
+    ]
+    fig, ax = plt.subplots(figsize=(max(6, len(labels) * 0.9), 4))
+    _plot_grouped_bars(
+        ax,
+        labels,
+        ["native (vortex package)", "DuckDB extension"],
+        [native_ms, extension_ms],
+        "Vortex: Native Scan vs DuckDB Extension",
+        "Median ms",
+    )
+    fig.tight_layout()
+    fig.savefig(out_dir / "vortex_native.png", dpi=150)
+    plt.close(fig)
+
+
+def _plot_level_pareto(report: Dict[str, Any], out_dir: Path) -> None:
+    points = [
+        pt
+        for pt in report.get("compression_level_sweep", {}).get("points", [])
+        if pt.get("output_size_bytes") is not None and pt.get("compression_time_s") is not None
+    ]
+    if not points:
+        return
+
+    fig, axes = plt.subplots(nrows=1, ncols=2, figsize=(10, 4))
+    panels = [
+        (axes[0], "compression_time_s", "Write time (s)", "Size vs Write Time"),
+        (axes[1], "full_read_s", "Full read (s)", "Size vs Full-Read Time"),
+    ]
+    groups = sorted({pt["group"] for pt in points})
+    colors = {group: f"C{i}" for i, group in enumerate(groups)}
+    for ax, key, ylabel, title in panels:
+        for pt in points:
+            if pt.get(key) is None:
+                continue
+            x = pt["output_size_bytes"] / (1024 * 1024)
+            ax.scatter(
+                [x],
+                [pt[key]],
+                color=colors[pt["group"]],
+                marker="*" if pt.get("pareto") else "o",
+                s=160 if pt.get("pareto") else 40,
+                edgecolors="black" if pt.get("pareto") else "none",
+            )
+            ax.annotate(pt["label"], (x, pt[key]), fontsize=7, xytext=(4, 4), textcoords="offset points")
+        ax.set_title(title)
+        ax.set_xlabel("Size (MB)")
+        ax.set_ylabel(ylabel)
+    handles = [plt.Line2D([], [], marker="o", linestyle="", color=colors[g], label=g) for g in groups]
+    handles.append(plt.Line2D([], [], marker="*", linestyle="", color="gray", markeredgecolor="black", markersize=12, label="Pareto-optimal"))
+    axes[1].legend(handles=handles, fontsize=8)
+    fig.suptitle("Compression Levels (Pareto front per codec/writer: write time x size x full-read time)")
+    fig.tight_layout()
+    fig.savefig(out_dir / "compression_level_pareto.png", dpi=150)
+    plt.close(fig)
+
+
 def generate_dataset_plots(report: Dict[str, Any], out_dir: Path, max_cols: int = 5) -> None:
     _ensure_dir(out_dir)
     formats = _formats_with_write(report)
@@ -364,6 +609,13 @@ def generate_dataset_plots(report: Dict[str, Any], out_dir: Path, max_cols: int
     _plot_like_per_column(report, out_dir, max_cols=max_cols)
     _plot_ndv_top_cols(report, out_dir, max_cols=max_cols)
     _plot_ndv_by_type(report, out_dir)
+    _plot_throughput(report, out_dir)
+    _plot_thread_scaling(report, out_dir)
+    _plot_memory_limit_sweep(report, out_dir)
+    _plot_parquet_layouts(report, out_dir)
+    _plot_parquet_variants(report, out_dir)
+    _plot_vortex_native(report, out_dir)
+    _plot_level_pareto(report, out_dir)
 
     parquet_formats = [(name, body) for name, body in formats if name.startswith("parquet_")]
     if parquet_formats:
@@ -416,6 +668,8 @@ def _load_reports(out_dir: Path) -> List[Dict[str, Any]]:
 
 
 def _dataset_label_from_report(report: Dict[str, Any]) -> str:
+    if report.get("dataset", {}).get("label"):
+        return report["dataset"]["label"]
     inp = report.get("dataset", {}).get("input", "dataset")
     p = Path(str(inp))
     return p.stem if p.name else "dataset"
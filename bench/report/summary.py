@@ -42,6 +42,8 @@ def _load_reports(reports_dir: Path) -> List[Dict[str, Any]]:
 
 
 def _dataset_label(report: Dict[str, Any]) -> str:
+    if report.get("dataset", {}).get("label"):
+        return report["dataset"]["label"]
     inp = report.get("dataset", {}).get("input", "dataset")
     p = Path(str(inp))
     return p.stem if p.name else "dataset"
@@ -3,57 +3,100 @@ from __future__ import annotations
 
 import argparse
 import platform
+import shutil
 import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import duckdb
 
-from ingest.generic_ingest import create_base_table_from_csv, create_base_table_from_parquet
-from backends import parquet_backend
-try:
-    from backends import vortex_backend
-    _VORTEX_AVAILABLE = True
-except Exception:
-    vortex_backend = None
-    _VORTEX_AVAILABLE = False
+from backends import parquet_backend, pyarrow_parquet_backend, vortex_native_backend
+from ingest.ingest_cache import IngestCache
+from ingest.publicbi_ingest import create_base_table_from_publicbi, table_name_of
+from ingest.generic_ingest import (
+    create_base_table_from_csv_files,
+    create_base_table_from_duckdb,
+    create_base_table_from_parquet,
+    ingest_csv_file,
+    reject_reasons,
+    rejected_row_count,
+)
+from cold_cache import eviction_method
+from format_runner import RunContext, format_tasks, run_format_task, run_isolated
+from memory_sweep import parse_memory_limit, parse_memory_limits
+from parquet_sweep import (
+    parse_layout_spec,
+    parse_level_spec,
+    parse_variant_spec,
+    run_layout_sweep,
+    run_level_sweep,
+    run_row_group_sweep,
+    run_variant_sweep,
+)
 from report.plots import generate_dataset_plots, generate_overall_plots
 from report.summary import generate_overall_summary
 from report.report import write_csv, write_json, write_markdown
 from utils_run import (
+    MemoryPhases,
     _auto_pick_cols,
     _auto_select_cols,
     _column_type_counts,
     _count_csv_rows_and_size,
     _dataset_label,
-    _describe_types,
     _format_filter_value,
     _like_pattern_specs_by_col,
     _markdown_summary,
     _ndv_ratio_by_col,
     _ndv_ratio_by_type,
     _ndv_ratio_top_cols,
-    _null_count,
-    _parse_casts,
     _parse_list,
-    _parquet_encodings,
     _quote_ident,
     _pick_random_access,
+    _profile_columns,
     _recommendations,
-    _row,
     _select_cols,
-    _vortex_encodings,
-    _vortex_numeric_expr,
-    format_value_sql,
-    quantile_thresholds,
-    timed_query,
+    _validation_counts,
+    configure_connection,
+    threshold_plan,
 )
+from thread_sweep import default_thread_counts
+from vortex_native import run_vortex_native
+from workload import WorkloadContext, load_workload
 
 
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True, help="Path to input data (csv file/dir or parquet file/dir)")
-    ap.add_argument("--input-type", required=True, choices=["csv", "parquet"], help="Input type")
+    ap.add_argument(
+        "--input-type",
+        required=True,
+        choices=["csv", "parquet", "duckdb", "publicbi"],
+        help="Input type (duckdb: a persistent database file holding --input-table; "
+        "publicbi: a PublicBI <Table>.csv.bz2 or .csv, schema found next to it or in ../tables/)",
+    )
+    ap.add_argument("--input-table", default="base_table", help="Table to read when --input-type duckdb")
+    ap.add_argument(
+        "--input-size-bytes",
+        type=int,
+        default=None,
+        help="Override the input size used for compression ratios (e.g. the CSV bytes behind a duckdb slice)",
+    )
+    ap.add_argument(
+        "--ingest-cache",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Reuse parsed CSV inputs from a persistent cache keyed by input files, schema and read options (default: off)",
+    )
+    ap.add_argument("--ingest-cache-dir", default=None, help="Ingest cache directory (default: $BENCH_INGEST_CACHE or ~/.cache/file-format-bench/ingest)")
+    ap.add_argument("--ingest-cache-max-gb", type=float, default=20.0, help="Evict least recently used cache entries above this size")
+    ap.add_argument(
+        "--ingest-cache-hash",
+        choices=["stat", "content"],
+        default="stat",
+        help="Cache key from input size+mtime (stat) or a SHA-256 of the file contents (content)",
+    )
+    ap.add_argument("--input-rows", type=int, default=None, help="Override the input row count recorded in the report")
+    ap.add_argument("--dataset-label", default=None, help="Label used in output file names (default: derived from --input)")
     ap.add_argument("--table", default="base_table", help="Name of base table in DuckDB")
     ap.add_argument("--schema", default=None, help="Optional schema SQL path (mostly for CSV)")
     ap.add_argument("--csv-sample-size", type=int, default=None)
@@ -62,6 +105,33 @@ def main() -> None:
     ap.add_argument("--csv-delimiter", default=None)
     ap.add_argument("--csv-header", default=None, choices=["true", "false"])
     ap.add_argument("--csv-nullstr", default=None)
+    ap.add_argument(
+        "--ingest-workers",
+        type=int,
+        default=None,
+        help="Directory CSV inputs: files ingested concurrently, one staging table each (default: core count)",
+    )
+    ap.add_argument(
+        "--csv-row-count",
+        default="ingest",
+        choices=["ingest", "scan"],
+        help="How input_rows is counted: ingest = loaded rows + DuckDB rejects (reads the CSV once); "
+        "scan = newline count over the files (default: ingest)",
+    )
+    ap.add_argument(
+        "--csv-decompress",
+        default="auto",
+        choices=["auto", "stream"],
+        help="Compressed CSV inputs (.gz/.zst/.bz2/.xz): auto = DuckDB reads gzip/zstd itself, other codecs are "
+        "streamed through a pipe; stream = stream every codec (default: auto)",
+    )
+    ap.add_argument(
+        "--csv-decompressor",
+        default="auto",
+        choices=["auto", "tool", "python"],
+        help="Streaming decompressor: tool = multi-threaded CLI (lbzip2/pbzip2/pigz/xz -T0/zstd), python = stdlib "
+        "codec, auto = a tool when installed (default: auto)",
+    )
     ap.add_argument("--row-limit", type=int, default=None, help="Limit rows read into the base table")
     ap.add_argument("--min-col", default=None)
     ap.add_argument("--filter-col", default=None)
@@ -70,13 +140,135 @@ def main() -> None:
     ap.add_argument("--select-cols", default=None)
     ap.add_argument("--auto-cols", action="store_true")
     ap.add_argument("--selectivities", default="0.01,0.1,0.25,0.5,0.9")
+    ap.add_argument(
+        "--threshold-mode",
+        default="exact",
+        choices=["exact", "approx"],
+        help="Selectivity thresholds via quantile_cont or approx_quantile (default: exact)",
+    )
+    ap.add_argument(
+        "--profile-mode",
+        default="exact",
+        choices=["exact", "approx"],
+        help="Column profiling NDV mode: exact COUNT(DISTINCT) or approx_count_distinct (default: exact)",
+    )
+    ap.add_argument(
+        "--profile-batch-cols",
+        type=int,
+        default=64,
+        help="Max columns profiled per aggregate scan (<=0: all columns in one scan)",
+    )
     ap.add_argument("--out", required=True)
+    ap.add_argument(
+        "--overall",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Regenerate the overall plots/summary over all reports in --out after the run (default: true; "
+        "batch drivers running datasets concurrently disable it and regenerate once at the end)",
+    )
+    ap.add_argument(
+        "--workload",
+        default=None,
+        help="Workload file (JSON, or YAML with PyYAML) declaring query templates (default: bench/workloads/default.json)",
+    )
     ap.add_argument("--repeats", type=int, default=7)
     ap.add_argument("--warmup", type=int, default=1)
+    ap.add_argument(
+        "--adaptive-repeats",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Sample each query until the median's bootstrap CI is narrow enough or its time budget is spent (ignores --repeats)",
+    )
+    ap.add_argument(
+        "--target-ci-width",
+        type=float,
+        default=0.05,
+        help="Adaptive mode: stop when (ci_high - ci_low) / median <= this (default: 0.05)",
+    )
+    ap.add_argument(
+        "--repeat-time-budget-s",
+        type=float,
+        default=10.0,
+        help="Adaptive mode: max seconds of timed runs per query (default: 10)",
+    )
+    ap.add_argument("--min-repeats", type=int, default=5, help="Adaptive mode: minimum timed runs per query")
+    ap.add_argument("--max-repeats", type=int, default=1000, help="Adaptive mode: maximum timed runs per query")
     ap.add_argument("--parquet-codec", default=None)
-    ap.add_argument("--parquet-codecs", default="zstd,snappy,uncompressed")
+    ap.add_argument("--parquet-codecs", default=",".join(parquet_backend.DEFAULT_CODECS))
     ap.add_argument("--parquet-row-group-size", type=int, default=128_000)
-    ap.add_argument("--vortex-compact", action="store_true")
+    ap.add_argument(
+        "--parquet-row-group-sizes",
+        default=None,
+        help="Comma-separated row-group sizes (rows) to sweep per Parquet codec, reusing the ingested table (default: off)",
+    )
+    ap.add_argument(
+        "--parquet-partition-by",
+        default=None,
+        help="Main Parquet writes: hive-partition the output directory by this column (default: single file)",
+    )
+    ap.add_argument(
+        "--parquet-per-thread-output",
+        action="store_true",
+        help="Main Parquet writes: one file per DuckDB writer thread (PER_THREAD_OUTPUT)",
+    )
+    ap.add_argument(
+        "--parquet-file-size",
+        default=None,
+        help="Main Parquet writes: start a new file past this size, e.g. 256MB (FILE_SIZE_BYTES)",
+    )
+    ap.add_argument(
+        "--parquet-layouts",
+        default=None,
+        help="Layout sweep against the single file for the first Parquet codec, e.g. "
+        "'hive,per_thread,file_size=64MB,hive=city+file_size=64MB' (hive alone: the filter column; default: off)",
+    )
+    ap.add_argument(
+        "--parquet-variants",
+        default=None,
+        help="Bloom filter / dictionary / page-index variants for the first Parquet codec, each against its "
+        "writer's plain file: 'default' or e.g. 'duckdb:bloom=0.001,pyarrow:page_index+page_size=64KB' (default: off)",
+    )
+    ap.add_argument(
+        "--parquet-writers",
+        default="duckdb",
+        help="Comma-separated Parquet writers per codec: duckdb (COPY, formats parquet_<codec>) and/or "
+        "pyarrow (streamed ParquetWriter, formats parquet_pyarrow_<codec>) (default: duckdb)",
+    )
+    ap.add_argument(
+        "--pyarrow-data-page-size",
+        default=None,
+        help="pyarrow writer: target data page size, e.g. 64KB (default: pyarrow's 1 MiB)",
+    )
+    ap.add_argument(
+        "--pyarrow-dictionary",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="pyarrow writer: dictionary-encode columns without an explicit encoding (default: true)",
+    )
+    ap.add_argument(
+        "--pyarrow-encodings",
+        default=None,
+        help="pyarrow writer: per-column encodings, 'auto' (DELTA_BINARY_PACKED for integers, BYTE_STREAM_SPLIT "
+        "for floats) or e.g. 'id=DELTA_BINARY_PACKED,amount=BYTE_STREAM_SPLIT' (default: none)",
+    )
+    ap.add_argument(
+        "--pyarrow-statistics",
+        default="all",
+        help="pyarrow writer: column statistics for 'all', 'none' or a comma-separated column list (default: all)",
+    )
+    ap.add_argument(
+        "--pyarrow-batch-rows",
+        type=int,
+        default=pyarrow_parquet_backend.DEFAULT_BATCH_ROWS,
+        help="pyarrow writer: rows per Arrow record batch streamed from DuckDB",
+    )
+    ap.add_argument("--vortex-compact", action="store_true", help="Label only; see --vortex-native compact")
+    ap.add_argument(
+        "--vortex-native",
+        default=None,
+        help="Also write Vortex with the vortex Python package per write strategy ('default,compact') and time "
+        "native Arrow scans against DuckDB's read_vortex on the same file (default: off)",
+    )
     ap.add_argument("--vortex-cast", default=None)
     ap.add_argument("--vortex-drop-cols", default=None)
     ap.add_argument(
@@ -87,6 +279,12 @@ def main() -> None:
     )
     ap.add_argument("--like-max-candidates", type=int, default=50)
     ap.add_argument("--like-pattern-len", type=int, default=3)
+    ap.add_argument(
+        "--like-calibration-sample",
+        type=int,
+        default=None,
+        help="Calibrate LIKE patterns on a reservoir sample of N rows, then recount chosen patterns exactly",
+    )
     ap.add_argument(
         "--validate-io",
         action=argparse.BooleanOptionalAction,
@@ -94,13 +292,93 @@ def main() -> None:
         help="Enable/disable validation (default: true)",
     )
     ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument(
+        "--db-path",
+        default=None,
+        help="Out-of-core mode: keep the base/sorted tables in this DuckDB file instead of in memory "
+        "(must not exist; removed after the run unless --keep-db)",
+    )
+    ap.add_argument("--keep-db", action="store_true", help="Keep the --db-path database after the run")
+    ap.add_argument(
+        "--memory-limit",
+        default=None,
+        help="DuckDB memory_limit, e.g. 4GB (default: DuckDB's, 80%% of RAM); larger working sets spill to --temp-directory",
+    )
+    ap.add_argument(
+        "--temp-directory",
+        default=None,
+        help="DuckDB spill directory (default: <db-path>.tmp with --db-path, else DuckDB's default)",
+    )
     ap.add_argument(
         "--include-cold",
         action=argparse.BooleanOptionalAction,
         default=True,
         help="Include a cold-run timing per query (default: true)",
     )
+    ap.add_argument(
+        "--cold-mode",
+        default="connection",
+        choices=["connection", "process"],
+        help="connection: cold run is the first run on the benchmark connection; "
+        "process: each cold sample evicts the file pages and runs in a fresh process (default: connection)",
+    )
+    ap.add_argument("--cold-samples", type=int, default=1, help="Cold samples per query with --cold-mode process")
+    ap.add_argument(
+        "--query-profile",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Capture a DuckDB JSON profile (operators, scan filters, pruning) once per query, outside timing",
+    )
     ap.add_argument("--sorted-by", default=None, help="Optional column name to sort data before writing")
+    ap.add_argument(
+        "--isolate-formats",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Run each format in its own worker process and DuckDB connection (default: false)",
+    )
+    ap.add_argument(
+        "--format-workers",
+        type=int,
+        default=2,
+        help="Max concurrent format workers with --isolate-formats (default: 2)",
+    )
+    ap.add_argument(
+        "--overlap-queries",
+        action="store_true",
+        help="With --isolate-formats, let timed query phases overlap too (default: only writes overlap)",
+    )
+    ap.add_argument(
+        "--throughput-clients",
+        default=None,
+        help="Comma-separated concurrent client counts for the throughput mode, e.g. 1,2,4,8 (default: off)",
+    )
+    ap.add_argument(
+        "--throughput-duration-s",
+        type=float,
+        default=5.0,
+        help="Seconds each client count replays the workload (default: 5)",
+    )
+    ap.add_argument(
+        "--parquet-compression-level",
+        type=int,
+        default=None,
+        help="Compression level for the main Parquet writes (DuckDB honours it for zstd only)",
+    )
+    ap.add_argument(
+        "--parquet-compression-levels",
+        default=None,
+        help="Compression-level sweep: 'default' (zstd 1,3,9,19; gzip 1,6,9) or e.g. 'zstd=1,3,9,19;gzip=1,6,9' (default: off)",
+    )
+    ap.add_argument(
+        "--thread-sweep",
+        default=None,
+        help="Re-time the workload per DuckDB thread count: 'auto' (1,2,4,... up to the core count) or e.g. 1,2,4,8 (default: off)",
+    )
+    ap.add_argument(
+        "--memory-limits",
+        default=None,
+        help="Re-time the workload per DuckDB memory_limit, e.g. 4GB,1GB,256MB,64MB; records latency, spill and OOM failures (default: off)",
+    )
     ap.add_argument(
         "--baseline-duckdb",
         action=argparse.BooleanOptionalAction,
@@ -108,84 +386,318 @@ def main() -> None:
         help="Include DuckDB table baseline timings (default: true)",
     )
     args = ap.parse_args()
+    if args.adaptive_repeats and not (2 <= args.min_repeats <= args.max_repeats):
+        raise SystemExit("Adaptive repeats need 2 <= --min-repeats <= --max-repeats")
+    if args.adaptive_repeats and args.target_ci_width <= 0:
+        raise SystemExit("--target-ci-width must be positive")
+    if args.throughput_clients:
+        try:
+            args.throughput_clients = sorted({int(c) for c in _parse_list(args.throughput_clients)})
+        except ValueError:
+            raise SystemExit("--throughput-clients must be a comma-separated list of integers")
+        if args.throughput_clients[0] < 1 or args.throughput_duration_s <= 0:
+            raise SystemExit("--throughput-clients must be >= 1 and --throughput-duration-s positive")
+    if args.parquet_row_group_sizes:
+        try:
+            args.parquet_row_group_sizes = sorted({int(v.replace("_", "")) for v in _parse_list(args.parquet_row_group_sizes)})
+        except ValueError:
+            raise SystemExit("--parquet-row-group-sizes must be a comma-separated list of integers")
+        if args.parquet_row_group_sizes[0] < 1:
+            raise SystemExit("--parquet-row-group-sizes values must be positive")
+    if args.parquet_partition_by and args.parquet_per_thread_output:
+        raise SystemExit("--parquet-partition-by cannot be combined with --parquet-per-thread-output (DuckDB COPY)")
+    if args.parquet_file_size:
+        try:
+            args.parquet_file_size = parse_memory_limit(args.parquet_file_size)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid --parquet-file-size: {exc}")
+    if args.parquet_layouts:
+        try:
+            args.parquet_layouts = parse_layout_spec(args.parquet_layouts)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid --parquet-layouts: {exc}")
+    args.parquet_writers = _parse_list(args.parquet_writers.lower())
+    unknown_writers = [w for w in args.parquet_writers if w not in ("duckdb", "pyarrow")]
+    if unknown_writers or not args.parquet_writers:
+        raise SystemExit(f"--parquet-writers must list duckdb and/or pyarrow, got: {', '.join(unknown_writers) or 'none'}")
+    if "pyarrow" in args.parquet_writers and not pyarrow_parquet_backend.available():
+        raise SystemExit("--parquet-writers pyarrow requires pyarrow (pip install pyarrow)")
+    codecs = [args.parquet_codec] if args.parquet_codec else _parse_list(args.parquet_codecs)
+    for writer, supported in (("duckdb", parquet_backend.CODECS), ("pyarrow", pyarrow_parquet_backend.CODECS)):
+        unsupported = [c for c in codecs if c.lower() not in supported]
+        if writer in args.parquet_writers and unsupported:
+            raise SystemExit(
+                f"Parquet writer {writer} does not support codec(s) {', '.join(unsupported)} "
+                f"(expected one of {', '.join(supported)})"
+            )
+    if args.pyarrow_batch_rows < 1:
+        raise SystemExit("--pyarrow-batch-rows must be positive")
+    if args.pyarrow_data_page_size:
+        try:
+            args.pyarrow_data_page_size = parse_memory_limit(args.pyarrow_data_page_size)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid --pyarrow-data-page-size: {exc}")
+    if args.pyarrow_encodings:
+        try:
+            args.pyarrow_encodings = pyarrow_parquet_backend.parse_column_encoding(args.pyarrow_encodings)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid --pyarrow-encodings: {exc}")
+    stats = args.pyarrow_statistics.strip().lower()
+    args.pyarrow_statistics = True if stats == "all" else False if stats == "none" else _parse_list(args.pyarrow_statistics)
+    if args.vortex_native:
+        try:
+            args.vortex_native = vortex_native_backend.parse_strategies(args.vortex_native)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid --vortex-native: {exc}")
+    if args.parquet_variants:
+        try:
+            args.parquet_variants = parse_variant_spec(args.parquet_variants, args.parquet_row_group_size)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid --parquet-variants: {exc}")
+    if args.parquet_compression_levels:
+        try:
+            args.parquet_compression_levels = parse_level_spec(args.parquet_compression_levels)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid --parquet-compression-levels: {exc}")
+    if args.thread_sweep:
+        if args.thread_sweep.strip().lower() == "auto":
+            args.thread_sweep = default_thread_counts()
+        else:
+            try:
+                args.thread_sweep = sorted({int(t) for t in _parse_list(args.thread_sweep)})
+            except ValueError:
+                raise SystemExit("--thread-sweep must be 'auto' or a comma-separated list of integers")
+            if args.thread_sweep[0] < 1:
+                raise SystemExit("--thread-sweep thread counts must be >= 1")
+    if args.memory_limits:
+        try:
+            args.memory_limits = parse_memory_limits(args.memory_limits)
+        except ValueError as exc:
+            raise SystemExit(f"--memory-limits: {exc}")
 
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    con = duckdb.connect(database=":memory:")
-    if args.threads is not None:
-        con.execute(f"PRAGMA threads={int(args.threads)};")
+    default_temp_dir = None
+    if args.db_path:
+        if Path(args.db_path).exists():
+            raise SystemExit(f"--db-path {args.db_path} already exists; remove it or choose another path")
+        Path(args.db_path).parent.mkdir(parents=True, exist_ok=True)
+        if args.temp_directory is None:
+            args.temp_directory = default_temp_dir = f"{args.db_path}.tmp"
+    if args.memory_limits and args.temp_directory is None:
+        # DuckDB can't switch temp directories once one has been used, so fix the spill location up front.
+        args.temp_directory = default_temp_dir = str(out_dir / "duckdb_tmp")
+    con = duckdb.connect(database=args.db_path or ":memory:")
+    configure_connection(con, threads=args.threads, memory_limit=args.memory_limit, temp_directory=args.temp_directory)
+    mem = MemoryPhases(con)
 
     input_size_bytes = None
     input_rows = None
+    ingest_time_s = None
+    ingest_cache_info: Dict[str, Any] = {"enabled": False}
     drop_notes: List[str] = []
-    if args.input_type == "csv":
-        read_csv_options: Dict[str, Any] = {}
-        if args.csv_sample_size is not None:
-            read_csv_options["sample_size"] = args.csv_sample_size
-        if args.csv_all_varchar:
-            read_csv_options["all_varchar"] = True
-        if args.csv_ignore_errors:
-            read_csv_options["ignore_errors"] = True
-        if args.csv_delimiter:
-            read_csv_options["delim"] = args.csv_delimiter
-        if args.csv_header is not None:
-            read_csv_options["header"] = (args.csv_header == "true")
-        if args.csv_nullstr is not None:
-            read_csv_options["nullstr"] = args.csv_nullstr
-        has_header = args.csv_header == "true" if args.csv_header is not None else False
-        input_rows, input_size_bytes = _count_csv_rows_and_size(args.input, has_header)
-        args.table = create_base_table_from_csv(
-            con,
-            args.table,
-            args.input,
-            schema_sql_path=args.schema,
-            read_csv_options=read_csv_options if read_csv_options else None,
-        )
-    else:
-        create_base_table_from_parquet(con, args.table, args.input)
-
-    if args.row_limit is not None and args.row_limit > 0:
-        con.execute(
-            f"CREATE OR REPLACE TABLE {args.table} AS SELECT * FROM {args.table} LIMIT {args.row_limit};"
-        )
+    # Rejected rows per DuckDB error type when the ingest recorded them (None: not tracked).
+    rejects: Optional[List[Dict[str, Any]]] = None
+    ingest_files: Optional[Dict[str, Any]] = None
+    publicbi_info: Optional[Dict[str, Any]] = None
+    # Compressed single-file inputs: codec, decompressor and decompression vs. parse throughput.
+    decompression: Optional[Dict[str, Any]] = None
+    with mem.phase("ingest"):
+        if args.input_type == "csv":
+            read_csv_options: Dict[str, Any] = {}
+            if args.csv_sample_size is not None:
+                read_csv_options["sample_size"] = args.csv_sample_size
+            if args.csv_all_varchar:
+                read_csv_options["all_varchar"] = True
+            if args.csv_ignore_errors:
+                read_csv_options["ignore_errors"] = True
+            if args.csv_delimiter:
+                read_csv_options["delim"] = args.csv_delimiter
+            if args.csv_header is not None:
+                read_csv_options["header"] = (args.csv_header == "true")
+            if args.csv_nullstr is not None:
+                read_csv_options["nullstr"] = args.csv_nullstr
+            has_header = args.csv_header == "true" if args.csv_header is not None else False
+            cache = None
+            cached = None
+            if args.ingest_cache:
+                cache = IngestCache(args.ingest_cache_dir, max_bytes=int(args.ingest_cache_max_gb * 1024**3))
+                cache_key = cache.key(
+                    args.input,
+                    "csv",
+                    read_csv_options,
+                    args.schema,
+                    hash_mode=args.ingest_cache_hash,
+                    record_options={"csv_row_count": args.csv_row_count},
+                )
+                cached = cache.lookup(cache_key["key"])
+                ingest_cache_info = {"enabled": True, "key": cache_key["key"], "dir": str(cache.cache_dir), "hit": bool(cached)}
+            t0 = time.perf_counter()
+            if cached:
+                cache.load(con, cache_key["key"], args.table)
+                # A hit is not an ingest: report the load time, and the original ingest's time, under ingest_cache.
+                ingest_cache_info["load_time_s"] = time.perf_counter() - t0
+                ingest_cache_info["source_ingest_time_s"] = cached.get("ingest_time_s")
+                input_rows, input_size_bytes = cached.get("input_rows"), cached.get("input_size_bytes")
+                rejects = cached.get("reject_reasons")
+                ingest_files = cached.get("ingest_files")
+                decompression = cached.get("decompression")
+            else:
+                if args.csv_row_count == "scan":
+                    input_rows, input_size_bytes = _count_csv_rows_and_size(args.input, has_header)
+                store_rejects = args.csv_row_count == "ingest"
+                if Path(args.input).is_dir():
+                    ingest_files = create_base_table_from_csv_files(
+                        con,
+                        args.table,
+                        args.input,
+                        schema_sql_path=args.schema,
+                        read_csv_options=read_csv_options if read_csv_options else None,
+                        store_rejects=store_rejects,
+                        max_workers=args.ingest_workers,
+                        decompress=args.csv_decompress,
+                        decompressor=args.csv_decompressor,
+                    )
+                    args.table = ingest_files["table"]
+                    if store_rejects:
+                        input_rows = ingest_files["rows"] + ingest_files["rejected_rows"]
+                        input_size_bytes = ingest_files["size_bytes"]
+                        rejects = ingest_files["reject_reasons"] if args.csv_ignore_errors else None
+                else:
+                    file_info = ingest_csv_file(
+                        con,
+                        args.table,
+                        args.input,
+                        schema_sql_path=args.schema,
+                        read_csv_options=read_csv_options if read_csv_options else None,
+                        store_rejects=store_rejects,
+                        decompress=args.csv_decompress,
+                        decompressor=args.csv_decompressor,
+                    )
+                    args.table = file_info["table"]
+                    if file_info["decompression"]:
+                        decompression = {
+                            **file_info["decompression"],
+                            "ingest_s": file_info["time_s"],
+                            "parse_s": file_info["parse_s"],
+                            "parse_mb_s": file_info["parse_mb_s"],
+                        }
+                    if store_rejects:
+                        # Without ignore_errors any bad row fails the ingest, so loaded rows are all input rows.
+                        loaded = con.execute(f"SELECT count(*) FROM {args.table}").fetchone()[0]
+                        input_rows = loaded + rejected_row_count(con)
+                        input_size_bytes = file_info["size_bytes"]
+                        rejects = reject_reasons(con) if args.csv_ignore_errors else None
+            if not cached:
+                ingest_time_s = time.perf_counter() - t0
+            if cache is not None and not cached:
+                stored = cache.store(
+                    con,
+                    cache_key["key"],
+                    args.table,
+                    cache_key["fingerprint"],
+                    extra={
+                        "input": str(Path(args.input).resolve()),
+                        "rows": con.execute(f"SELECT count(*) FROM {args.table}").fetchone()[0],
+                        "input_rows": input_rows,
+                        "input_size_bytes": input_size_bytes,
+                        "ingest_time_s": ingest_time_s,
+                        "reject_reasons": rejects,
+                        "ingest_files": ingest_files,
+                        "decompression": decompression,
+                    },
+                )
+                ingest_cache_info["evicted"] = stored["evicted"]
+        elif args.input_type == "publicbi":
+            t0 = time.perf_counter()
+            publicbi_info = create_base_table_from_publicbi(
+                con,
+                args.table,
+                args.input,
+                schema_sql_path=args.schema,
+                ignore_errors=args.csv_ignore_errors,
+                decompress=args.csv_decompress,
+                decompressor=args.csv_decompressor,
+            )
+            ingest_time_s = time.perf_counter() - t0
+            input_rows = publicbi_info["rows"] + publicbi_info["rejected_rows"]
+            input_size_bytes = publicbi_info["input_size_bytes"]
+            rejects = publicbi_info["reject_reasons"]
+            if publicbi_info["decompression"]:
+                decompression = {
+                    **publicbi_info["decompression"],
+                    "ingest_s": publicbi_info["time_s"],
+                    "parse_s": publicbi_info["parse_s"],
+                    "parse_mb_s": publicbi_info["parse_mb_s"],
+                }
+        elif args.input_type == "duckdb":
+            create_base_table_from_duckdb(con, args.table, args.input, source_table=args.input_table, row_limit=args.row_limit)
+        else:
+            create_base_table_from_parquet(con, args.table, args.input)
+        if args.input_size_bytes is not None:
+            input_size_bytes = args.input_size_bytes
+        if args.input_rows is not None:
+            input_rows = args.input_rows
+
+        if args.row_limit is not None and args.row_limit > 0 and args.input_type != "duckdb":
+            con.execute(
+                f"CREATE OR REPLACE TABLE {args.table} AS SELECT * FROM {args.table} LIMIT {args.row_limit};"
+            )
 
-    if args.auto_cols:
-        args.min_col, args.filter_col, args.filter_val, args.select_col = _auto_pick_cols(con, args.table)
-        if not args.select_cols:
-            auto_sel_cols = _auto_select_cols(con, args.table)
-            if auto_sel_cols:
-                args.select_cols = ",".join(auto_sel_cols)
-    elif not (args.min_col and args.filter_col and args.filter_val is not None and args.select_col):
+    if not args.auto_cols and not (
+        args.min_col and args.filter_col and args.filter_val is not None and args.select_col
+    ):
         raise SystemExit("Provide --min-col, --filter-col, --filter-val, --select-col or use --auto-cols")
 
-    rowcount = con.execute(f"SELECT COUNT(*) FROM {args.table};").fetchone()[0]
-    col_type_counts = _column_type_counts(con, args.table)
-    ndv_stats = _ndv_ratio_by_col(con, args.table, rowcount)
-    ndv_top_cols = _ndv_ratio_top_cols(ndv_stats, 10)
-    ndv_by_type = _ndv_ratio_by_type(ndv_stats)
-    dropped_rows = None
-    if input_rows is not None:
-        dropped_rows = max(input_rows - rowcount, 0)
-        if dropped_rows > 0:
-            if args.csv_ignore_errors:
-                drop_notes.append("rows dropped because --csv-ignore-errors skips malformed rows")
-            drop_notes.append("common causes: bad quotes, type conversion failures, inconsistent delimiters")
-    ps = [float(x.strip()) for x in args.selectivities.split(",") if x.strip()]
-    select_cols = _select_cols(args.select_col, args.select_cols)
-    like_specs_by_col = {}
-    if args.like_tests:
-        like_specs_by_col = _like_pattern_specs_by_col(
+    with mem.phase("profile"):
+        profile = _profile_columns(
             con,
             args.table,
-            ps,
-            rowcount,
-            max_candidates=args.like_max_candidates,
-            pattern_len=args.like_pattern_len,
+            approx=(args.profile_mode == "approx"),
+            batch_cols=args.profile_batch_cols,
         )
+        if args.auto_cols:
+            args.min_col, args.filter_col, args.filter_val, args.select_col = _auto_pick_cols(
+                con, args.table, profile=profile
+            )
+            if not args.select_cols:
+                auto_sel_cols = _auto_select_cols(con, args.table, profile=profile)
+                if auto_sel_cols:
+                    args.select_cols = ",".join(auto_sel_cols)
+
+        rowcount = profile["rows"]
+        col_type_counts = _column_type_counts(con, args.table)
+        ndv_stats = _ndv_ratio_by_col(con, args.table, rowcount, profile=profile)
+        ndv_top_cols = _ndv_ratio_top_cols(ndv_stats, 10)
+        ndv_by_type = _ndv_ratio_by_type(ndv_stats)
+        dropped_rows = None
+        if input_rows is not None:
+            dropped_rows = max(input_rows - rowcount, 0)
+            if dropped_rows > 0 and rejects is not None:
+                for r in rejects:
+                    drop_notes.append(f"{r['rows']} rows rejected ({r['error_type']}), e.g. {r['example']}")
+            elif dropped_rows > 0:
+                if args.csv_ignore_errors:
+                    drop_notes.append("rows dropped because --csv-ignore-errors skips malformed rows")
+                drop_notes.append("common causes: bad quotes, type conversion failures, inconsistent delimiters")
+        ps = [float(x.strip()) for x in args.selectivities.split(",") if x.strip()]
+        select_cols = _select_cols(args.select_col, args.select_cols)
+        thr_plan = threshold_plan(con, args.table, select_cols, ps, approx=(args.threshold_mode == "approx"))
+        like_specs_by_col = {}
+        if args.like_tests:
+            like_specs_by_col = _like_pattern_specs_by_col(
+                con,
+                args.table,
+                ps,
+                rowcount,
+                max_candidates=args.like_max_candidates,
+                pattern_len=args.like_pattern_len,
+                sample_rows=args.like_calibration_sample,
+            )
 
     rows_csv: List[Dict[str, Any]] = []
-    random_access_col, random_access_val = _pick_random_access(con, args.table)
+    random_access_col, random_access_val = _pick_random_access(con, args.table, profile=profile)
     report: Dict[str, Any] = {
         "system": {"platform": platform.platform(), "python": platform.python_version(), "machine": platform.node()},
         "dataset": {
@@ -195,9 +707,16 @@ def main() -> None:
             "input_rows": input_rows,
             "dropped_rows": dropped_rows,
             "drop_notes": drop_notes if drop_notes else None,
+            "reject_reasons": rejects,
+            "ingest_files": ingest_files,
+            "publicbi": publicbi_info,
+            "decompression": decompression,
             "input_size_bytes": input_size_bytes,
+            "ingest_time_s": ingest_time_s,
+            "ingest_cache": ingest_cache_info,
             "column_type_counts": col_type_counts,
             "ndv_ratio_by_type": ndv_by_type,
+            "profile": {"mode": profile["mode"], "scans": profile["scans"], "time_s": profile["time_s"]},
             "sorted_by": args.sorted_by,
         },
         "columns": {
@@ -208,6 +727,15 @@ def main() -> None:
             "random_access_col": random_access_col,
             "ndv_ratio_top_cols": ndv_top_cols,
         },
+        "threshold_plan": {
+            "mode": thr_plan["mode"],
+            "ps": thr_plan["ps"],
+            "time_s": thr_plan["time_s"],
+            "by_col": {
+                col: [{"p": p, "threshold": thr} for p, thr in items]
+                for col, items in thr_plan["by_col"].items()
+            },
+        },
         "formats": {},
     }
 
@@ -220,27 +748,6 @@ def main() -> None:
 
     filter_val_sql = _format_filter_value(con, args.table, args.filter_col, args.filter_val)
 
-    def _time(sql: str) -> Dict[str, Any]:
-        return timed_query(
-            con,
-            sql,
-            repeats=args.repeats,
-            warmup=args.warmup,
-            include_cold=args.include_cold,
-        )
-
-    decomp_counter = 0
-
-    def _time_decompress(scan_expr: str) -> float:
-        nonlocal decomp_counter
-        decomp_counter += 1
-        tmp_name = f"decomp_{decomp_counter}"
-        t0 = time.perf_counter()
-        con.execute(f"CREATE OR REPLACE TEMP TABLE {tmp_name} AS SELECT * FROM {scan_expr};")
-        t1 = time.perf_counter()
-        con.execute(f"DROP TABLE {tmp_name};")
-        return t1 - t0
-
     source_table = args.table
     if args.sorted_by:
         sorted_table = f"{args.table}_sorted"
@@ -248,471 +755,119 @@ def main() -> None:
         if not sort_cols:
             raise SystemExit("Invalid --sorted-by value; provide a column name or comma-separated list.")
         order_by = ", ".join([_quote_ident(c) for c in sort_cols])
-        con.execute(
-            f"CREATE OR REPLACE TABLE {sorted_table} AS SELECT * FROM {args.table} ORDER BY {order_by};"
-        )
+        with mem.phase("sort"):
+            con.execute(
+                f"CREATE OR REPLACE TABLE {sorted_table} AS SELECT * FROM {args.table} ORDER BY {order_by};"
+            )
         source_table = sorted_table
 
-    if args.baseline_duckdb:
-        duckdb_meta = {
-            "format": "duckdb_table",
-            "compression_time_s": 0.0,
-            "compression_speed_mb_s": None,
-            "output_size_bytes": input_size_bytes,
-            "note": "Baseline: queries run directly on DuckDB table (no external file scan).",
-        }
-        duckdb_ratio = None
-        if input_size_bytes:
-            duckdb_ratio = input_size_bytes / input_size_bytes
-
-        q_min_col = _quote_ident(args.min_col)
-        q_filter_col = _quote_ident(args.filter_col)
-        q_full_base = f"SELECT min({q_min_col}) FROM {args.table};"
-        q_sel_pred_base = f"SELECT min({q_min_col}) FROM {args.table} WHERE {q_filter_col} = {filter_val_sql};"
-        m_full_base = _time(q_full_base)
-        m_sel_pred_base = _time(q_sel_pred_base)
-
-        m_random_base = None
-        if random_access_col and random_access_val is not None:
-            q_pl_col = _quote_ident(random_access_col)
-            pl_val_sql = format_value_sql(random_access_val)
-            q_point = f"SELECT * FROM {args.table} WHERE {q_pl_col} = {pl_val_sql} LIMIT 1;"
-            m_random_base = _time(q_point)
-
-        sel_results_by_col_table: Dict[str, List[Dict[str, Any]]] = {}
-        avg_selectivity_ms_table: Dict[str, float] = {}
-        for sel_col in select_cols:
-            thresholds = quantile_thresholds(con, args.table, sel_col, ps)
-            sel_results = []
-            for p, thr in thresholds:
-                thr_sql = format_value_sql(thr)
-                q_sel_col = _quote_ident(sel_col)
-                q_sel = f"SELECT min({q_min_col}) FROM {args.table} WHERE {q_sel_col} <= {thr_sql};"
-                m_sel = _time(q_sel)
-                sel_results.append({"p": p, "threshold": thr, **m_sel})
-                rows_csv.append(
-                    _row(
-                        args,
-                        "duckdb",
-                        "duckdb_table",
-                        "selectivity",
-                        p,
-                        duckdb_meta,
-                        m_sel,
-                        select_col=sel_col,
-                    )
-                )
-            sel_results_by_col_table[sel_col] = sel_results
-            ms_values = [r["median_ms"] for r in sel_results if r.get("median_ms") is not None]
-            if ms_values:
-                avg_selectivity_ms_table[sel_col] = sum(ms_values) / len(ms_values)
-
-        rows_csv.append(_row(args, "duckdb", "duckdb_table", "full_scan_min", None, duckdb_meta, m_full_base))
-        rows_csv.append(
-            _row(args, "duckdb", "duckdb_table", "selective_predicate", None, duckdb_meta, m_sel_pred_base)
-        )
-        if m_random_base:
-            rows_csv.append(_row(args, "duckdb", "duckdb_table", "random_access", None, duckdb_meta, m_random_base))
-
-        like_results_by_col_table: Dict[str, List[Dict[str, Any]]] = {}
-        for col, specs in like_specs_by_col.items():
-            qcol = _quote_ident(col)
-            for spec in specs:
-                pattern_sql = format_value_sql(spec["pattern"])
-                q_like = f"SELECT COUNT(*) FROM {args.table} WHERE {qcol} LIKE {pattern_sql} ESCAPE '!';"
-                m_like = _time(q_like)
-                match_count = m_like.get("result_value")
-                sel = (match_count / rowcount) if rowcount else None
-                item = {**spec, "match_count": match_count, "selectivity": sel, **m_like}
-                like_results_by_col_table.setdefault(col, []).append(item)
-                targets = spec.get("target_selectivities")
-                targets_str = ",".join([str(t) for t in targets]) if isinstance(targets, list) else None
-                rows_csv.append(
-                    _row(
-                        args,
-                        "duckdb",
-                        "duckdb_table",
-                        "like_predicate",
-                        sel,
-                        duckdb_meta,
-                        m_like,
-                        select_col=col,
-                        extras={
-                            "pattern_type": spec["pattern_type"],
-                            "pattern": spec["pattern"],
-                            "target_selectivities": targets_str,
-                            "match_count": match_count,
-                        },
-                    )
-                )
-
-        best_select_col_table = None
-        if avg_selectivity_ms_table:
-            best_select_col_table = min(avg_selectivity_ms_table.items(), key=lambda kv: kv[1])
-
-        report["formats"]["duckdb_table"] = {
-            "write": duckdb_meta,
-            "compression_ratio": duckdb_ratio,
-            "queries": {
-                "full_scan_min": m_full_base,
-                "selective_predicate": m_sel_pred_base,
-                "random_access": m_random_base,
-                "selectivity_by_col": sel_results_by_col_table,
-                "like_by_col": like_results_by_col_table,
-            },
-            "best_select_col": best_select_col_table[0] if best_select_col_table else None,
-            "best_select_col_avg_median_ms": best_select_col_table[1] if best_select_col_table else None,
-        }
+    workload = load_workload(args.workload)
+    workload_ctx = WorkloadContext(
+        min_col=args.min_col,
+        filter_col=args.filter_col,
+        random_access_col=random_access_col,
+        random_access_val=random_access_val,
+        select_cols=select_cols,
+        thresholds_by_col=thr_plan["by_col"],
+        like_specs_by_col=like_specs_by_col,
+        rowcount=rowcount,
+    )
+    report["workload"] = {
+        "name": workload.get("name"),
+        "queries": [q["name"] for q in workload["queries"]],
+    }
 
+    base_validation = None
     if args.validate_io:
-        base_count = con.execute(f"SELECT COUNT(*) FROM {args.table};").fetchone()[0]
-        base_min = con.execute(f"SELECT min({_quote_ident(args.min_col)}) FROM {args.table};").fetchone()[0]
-        base_nulls_min = _null_count(con, args.table, args.min_col)
-        base_nulls_filter = _null_count(con, args.table, args.filter_col)
-        base_filtered = con.execute(
-            f"SELECT COUNT(*) FROM {args.table} WHERE {_quote_ident(args.filter_col)} = {filter_val_sql};"
-        ).fetchone()[0]
+        base_validation = _validation_counts(con, args.table, args.min_col, args.filter_col, filter_val_sql)
 
-    dataset_label = _dataset_label(args.input)
+    default_label = table_name_of(args.input) if args.input_type == "publicbi" else args.input
+    dataset_label = _dataset_label(args.dataset_label or default_label)
+    report["dataset"]["label"] = dataset_label
     run_tag = f"{dataset_label}_{int(time.time())}"
 
-    for codec in parquet_codecs:
-        parquet_out = str(out_dir / f"parquet_{codec}_{run_tag}.parquet")
-        parquet_meta = parquet_backend.write(
-            con,
-            source_table,
-            parquet_out,
-            options={"codec": codec, "row_group_size": args.parquet_row_group_size},
-        )
-        if input_size_bytes and parquet_meta.get("compression_time_s"):
-            ctime = parquet_meta.get("compression_time_s")
-            parquet_meta["compression_speed_mb_s"] = (input_size_bytes / (1024 * 1024)) / ctime if ctime else None
-        else:
-            parquet_meta["compression_speed_mb_s"] = None
-        parquet_scan = parquet_backend.scan_expr(parquet_meta.get("parquet_path", parquet_out))
-
-        q_min_col = _quote_ident(args.min_col)
-        q_filter_col = _quote_ident(args.filter_col)
-        q_full = f"SELECT min({q_min_col}) FROM {parquet_scan};"
-        q_sel_pred = f"SELECT min({q_min_col}) FROM {parquet_scan} WHERE {q_filter_col} = {filter_val_sql};"
-        m_full = _time(q_full)
-        m_sel_pred = _time(q_sel_pred)
-
-        m_random = None
-        if random_access_col and random_access_val is not None:
-            q_pl_col = _quote_ident(random_access_col)
-            pl_val_sql = format_value_sql(random_access_val)
-            q_point = f"SELECT * FROM {parquet_scan} WHERE {q_pl_col} = {pl_val_sql} LIMIT 1;"
-            m_random = _time(q_point)
-
-        sel_results_by_col: Dict[str, List[Dict[str, Any]]] = {}
-        avg_selectivity_ms: Dict[str, float] = {}
-        for sel_col in select_cols:
-            thresholds = quantile_thresholds(con, args.table, sel_col, ps)
-            sel_results = []
-            for p, thr in thresholds:
-                thr_sql = format_value_sql(thr)
-                q_sel_col = _quote_ident(sel_col)
-                q_sel = f"SELECT min({q_min_col}) FROM {parquet_scan} WHERE {q_sel_col} <= {thr_sql};"
-                m_sel = _time(q_sel)
-                sel_results.append({"p": p, "threshold": thr, **m_sel})
-                rows_csv.append(_row(args, "parquet", f"parquet_{codec}", "selectivity", p, parquet_meta, m_sel, select_col=sel_col))
-            sel_results_by_col[sel_col] = sel_results
-            ms_values = [r["median_ms"] for r in sel_results if r.get("median_ms") is not None]
-            if ms_values:
-                avg_selectivity_ms[sel_col] = sum(ms_values) / len(ms_values)
-
-        rows_csv.append(_row(args, "parquet", f"parquet_{codec}", "full_scan_min", None, parquet_meta, m_full))
-        rows_csv.append(_row(args, "parquet", f"parquet_{codec}", "selective_predicate", None, parquet_meta, m_sel_pred))
-        if m_random:
-            rows_csv.append(_row(args, "parquet", f"parquet_{codec}", "random_access", None, parquet_meta, m_random))
-
-        like_results_by_col: Dict[str, List[Dict[str, Any]]] = {}
-        for col, specs in like_specs_by_col.items():
-            qcol = _quote_ident(col)
-            for spec in specs:
-                pattern_sql = format_value_sql(spec["pattern"])
-                q_like = f"SELECT COUNT(*) FROM {parquet_scan} WHERE {qcol} LIKE {pattern_sql} ESCAPE '!';"
-                m_like = _time(q_like)
-                match_count = m_like.get("result_value")
-                sel = (match_count / rowcount) if rowcount else None
-                item = {**spec, "match_count": match_count, "selectivity": sel, **m_like}
-                like_results_by_col.setdefault(col, []).append(item)
-                targets = spec.get("target_selectivities")
-                targets_str = ",".join([str(t) for t in targets]) if isinstance(targets, list) else None
-                rows_csv.append(
-                    _row(
-                        args,
-                        "parquet",
-                        f"parquet_{codec}",
-                        "like_predicate",
-                        sel,
-                        parquet_meta,
-                        m_like,
-                        select_col=col,
-                        extras={
-                            "pattern_type": spec["pattern_type"],
-                            "pattern": spec["pattern"],
-                            "target_selectivities": targets_str,
-                            "match_count": match_count,
-                        },
-                    )
-                )
-
-        best_select_col = None
-        if avg_selectivity_ms:
-            best_select_col = min(avg_selectivity_ms.items(), key=lambda kv: kv[1])
-
-        decomp_time_s = _time_decompress(parquet_scan)
-        parquet_meta["decompression_time_s"] = decomp_time_s
-        if parquet_meta.get("output_size_bytes") and decomp_time_s:
-            parquet_meta["decompression_speed_mb_s"] = (
-                (parquet_meta["output_size_bytes"] / (1024 * 1024)) / decomp_time_s
-            )
-        else:
-            parquet_meta["decompression_speed_mb_s"] = None
-
-        parquet_ratio = None
-        if input_size_bytes and parquet_meta.get("output_size_bytes"):
-            parquet_ratio = input_size_bytes / parquet_meta.get("output_size_bytes")
-        parquet_encodings = _parquet_encodings(parquet_meta.get("parquet_path", parquet_out))
-        report["formats"][f"parquet_{codec}"] = {
-            "write": parquet_meta,
-            "compression_ratio": parquet_ratio,
-            "encodings": parquet_encodings,
-            "queries": {
-                "full_scan_min": m_full,
-                "selective_predicate": m_sel_pred,
-                "random_access": m_random,
-                "selectivity_by_col": sel_results_by_col,
-                "like_by_col": like_results_by_col,
-            },
-            "best_select_col": best_select_col[0] if best_select_col else None,
-            "best_select_col_avg_median_ms": best_select_col[1] if best_select_col else None,
+    run_ctx = RunContext(
+        args=args,
+        table=args.table,
+        source_table=source_table,
+        out_dir=str(out_dir),
+        run_tag=run_tag,
+        workload=workload,
+        workload_ctx=workload_ctx,
+        filter_val_sql=filter_val_sql,
+        input_size_bytes=input_size_bytes,
+        base_validation=base_validation,
+        column_ndv={col: stats["ndv"] for col, stats in profile["columns"].items()},
+    )
+    report["cold"] = {
+        "enabled": args.include_cold,
+        "mode": args.cold_mode,
+        "samples": args.cold_samples if args.cold_mode == "process" else 1,
+        "eviction": eviction_method() if args.cold_mode == "process" else None,
+    }
+    report["repeats"] = (
+        {
+            "mode": "adaptive",
+            "target_ci_width": args.target_ci_width,
+            "time_budget_s": args.repeat_time_budget_s,
+            "min_runs": args.min_repeats,
+            "max_runs": args.max_repeats,
         }
-        if args.validate_io:
-            pq_count = con.execute(f"SELECT COUNT(*) FROM {parquet_scan};").fetchone()[0]
-            pq_min = con.execute(f"SELECT min({_quote_ident(args.min_col)}) FROM {parquet_scan};").fetchone()[0]
-            pq_nulls_min = _null_count(con, parquet_scan, args.min_col)
-            pq_nulls_filter = _null_count(con, parquet_scan, args.filter_col)
-            pq_filtered = con.execute(
-                f"SELECT COUNT(*) FROM {parquet_scan} WHERE {_quote_ident(args.filter_col)} = {filter_val_sql};"
-            ).fetchone()[0]
-            report["formats"][f"parquet_{codec}"]["validation"] = {
-                "base_count": base_count,
-                "format_count": pq_count,
-                "base_min": base_min,
-                "format_min": pq_min,
-                "count_match": base_count == pq_count,
-                "min_match": base_min == pq_min,
-                "base_filtered_count": base_filtered,
-                "format_filtered_count": pq_filtered,
-                "filtered_count_match": base_filtered == pq_filtered,
-                "base_nulls_min_col": base_nulls_min,
-                "format_nulls_min_col": pq_nulls_min,
-                "min_nulls_match": base_nulls_min == pq_nulls_min,
-                "base_nulls_filter_col": base_nulls_filter,
-                "format_nulls_filter_col": pq_nulls_filter,
-                "filter_nulls_match": base_nulls_filter == pq_nulls_filter,
-            }
-
-    if _VORTEX_AVAILABLE:
-        try:
-            vortex_out = str(out_dir / "vortex")
-            vortex_table = source_table
-            cast_map = _parse_casts(args.vortex_cast)
-            drop_cols = _parse_list(args.vortex_drop_cols)
-            if cast_map or drop_cols:
-                desc = con.execute(f"DESCRIBE {args.table};").fetchall()
-                select_parts = []
-                for col, *_ in desc:
-                    if col in drop_cols:
-                        continue
-                    qcol = _quote_ident(col)
-                    if col in cast_map:
-                        select_parts.append(f"CAST({qcol} AS {cast_map[col]}) AS {qcol}")
-                    else:
-                        select_parts.append(qcol)
-                con.execute(
-                    f"CREATE OR REPLACE TEMP VIEW vortex_source AS "
-                    f"SELECT {', '.join(select_parts)} FROM {args.table};"
-                )
-                vortex_table = "vortex_source"
-
-            vortex_meta = vortex_backend.write_vortex(
+        if args.adaptive_repeats
+        else {"mode": "fixed", "runs": args.repeats}
+    )
+    tasks = format_tasks(args, parquet_codecs)
+    if args.isolate_formats:
+        report["execution"] = {
+            "mode": "isolated",
+            "format_workers": args.format_workers,
+            "overlap_queries": args.overlap_queries,
+        }
+        with mem.phase("formats"):
+            task_results = run_isolated(
                 con,
-                vortex_table,
-                vortex_out,
-                options={"compact": args.vortex_compact},
+                tasks,
+                run_ctx,
+                max_workers=args.format_workers,
+                overlap_queries=args.overlap_queries,
             )
-            if input_size_bytes and vortex_meta.get("compression_time_s"):
-                ctime = vortex_meta.get("compression_time_s")
-                vortex_meta["compression_speed_mb_s"] = (input_size_bytes / (1024 * 1024)) / ctime if ctime else None
-            else:
-                vortex_meta["compression_speed_mb_s"] = None
-
-            vortex_expr = vortex_backend.scan_expr(vortex_meta.get("vortex_path", vortex_out))
-            con.execute(f"CREATE OR REPLACE TEMP VIEW vortex_dataset AS SELECT * FROM {vortex_expr}")
-
-            min_col_expr_vx = _vortex_numeric_expr(con, "vortex_dataset", args.min_col)
-            sel_col_exprs_vx = {c: _vortex_numeric_expr(con, "vortex_dataset", c) for c in select_cols}
-            filter_val_sql_vx = _format_filter_value(con, "vortex_dataset", args.filter_col, args.filter_val)
-            vx_text_cols = {c for c, t in _describe_types(con, "vortex_dataset").items() if t in {"VARCHAR", "TEXT"}}
-
-            q_full_vx = f"SELECT min({min_col_expr_vx}) FROM vortex_dataset;"
-            q_filter_col_vx = _quote_ident(args.filter_col)
-            q_sel_pred_vx = f"SELECT min({min_col_expr_vx}) FROM vortex_dataset WHERE {q_filter_col_vx} = {filter_val_sql_vx};"
-            m_full_vx = _time(q_full_vx)
-            m_sel_pred_vx = _time(q_sel_pred_vx)
-
-            m_random_vx = None
-            if random_access_col and random_access_val is not None:
-                q_pl_col = _quote_ident(random_access_col)
-                pl_val_sql = format_value_sql(random_access_val)
-                q_point_vx = f"SELECT * FROM vortex_dataset WHERE {q_pl_col} = {pl_val_sql} LIMIT 1;"
-                m_random_vx = _time(q_point_vx)
-
-            sel_results_by_col_vx: Dict[str, List[Dict[str, Any]]] = {}
-            avg_selectivity_ms_vx: Dict[str, float] = {}
-            for sel_col in select_cols:
-                thresholds = quantile_thresholds(con, args.table, sel_col, ps)
-                sel_results = []
-                for p, thr in thresholds:
-                    thr_sql = format_value_sql(thr)
-                    q_sel = (
-                        f"SELECT min({min_col_expr_vx}) FROM vortex_dataset "
-                        f"WHERE {sel_col_exprs_vx[sel_col]} <= {thr_sql};"
-                    )
-                    m_sel = _time(q_sel)
-                    sel_results.append({"p": p, "threshold": thr, **m_sel})
-                    rows_csv.append(
-                        _row(
-                            args,
-                            "vortex",
-                            vortex_meta.get("variant", "vortex_default"),
-                            "selectivity",
-                            p,
-                            vortex_meta,
-                            m_sel,
-                            select_col=sel_col,
-                        )
-                    )
-                sel_results_by_col_vx[sel_col] = sel_results
-                ms_values = [r["median_ms"] for r in sel_results if r.get("median_ms") is not None]
-                if ms_values:
-                    avg_selectivity_ms_vx[sel_col] = sum(ms_values) / len(ms_values)
-
-            rows_csv.append(_row(args, "vortex", vortex_meta.get("variant", "vortex_default"), "full_scan_min", None, vortex_meta, m_full_vx))
-            rows_csv.append(_row(args, "vortex", vortex_meta.get("variant", "vortex_default"), "selective_predicate", None, vortex_meta, m_sel_pred_vx))
-            if m_random_vx:
-                rows_csv.append(_row(args, "vortex", vortex_meta.get("variant", "vortex_default"), "random_access", None, vortex_meta, m_random_vx))
-
-            like_results_by_col_vx: Dict[str, List[Dict[str, Any]]] = {}
-            for col, specs in like_specs_by_col.items():
-                if col not in vx_text_cols:
-                    continue
-                qcol = _quote_ident(col)
-                for spec in specs:
-                    pattern_sql = format_value_sql(spec["pattern"])
-                    q_like = f"SELECT COUNT(*) FROM vortex_dataset WHERE {qcol} LIKE {pattern_sql} ESCAPE '!';"
-                    m_like = _time(q_like)
-                    match_count = m_like.get("result_value")
-                    sel = (match_count / rowcount) if rowcount else None
-                    item = {**spec, "match_count": match_count, "selectivity": sel, **m_like}
-                    like_results_by_col_vx.setdefault(col, []).append(item)
-                    targets = spec.get("target_selectivities")
-                    targets_str = ",".join([str(t) for t in targets]) if isinstance(targets, list) else None
-                    rows_csv.append(
-                        _row(
-                            args,
-                            "vortex",
-                            vortex_meta.get("variant", "vortex_default"),
-                            "like_predicate",
-                            sel,
-                            vortex_meta,
-                            m_like,
-                            select_col=col,
-                            extras={
-                                "pattern_type": spec["pattern_type"],
-                                "pattern": spec["pattern"],
-                                "target_selectivities": targets_str,
-                                "match_count": match_count,
-                            },
-                        )
-                    )
-
-            best_select_col_vx = None
-            if avg_selectivity_ms_vx:
-                best_select_col_vx = min(avg_selectivity_ms_vx.items(), key=lambda kv: kv[1])
-
-            decomp_time_s = _time_decompress(vortex_expr)
-            vortex_meta["decompression_time_s"] = decomp_time_s
-            if vortex_meta.get("output_size_bytes") and decomp_time_s:
-                vortex_meta["decompression_speed_mb_s"] = (
-                    (vortex_meta["output_size_bytes"] / (1024 * 1024)) / decomp_time_s
-                )
-            else:
-                vortex_meta["decompression_speed_mb_s"] = None
-
-            vortex_ratio = None
-            if input_size_bytes and vortex_meta.get("output_size_bytes"):
-                vortex_ratio = input_size_bytes / vortex_meta.get("output_size_bytes")
-            vortex_encodings = _vortex_encodings(vortex_meta.get("vortex_path", vortex_out))
-            report["formats"][vortex_meta.get("variant", "vortex_default")] = {
-                "write": vortex_meta,
-                "compression_ratio": vortex_ratio,
-                "encodings": vortex_encodings,
-                "queries": {
-                    "full_scan_min": m_full_vx,
-                    "selective_predicate": m_sel_pred_vx,
-                    "random_access": m_random_vx,
-                    "selectivity_by_col": sel_results_by_col_vx,
-                    "like_by_col": like_results_by_col_vx,
-                },
-                "best_select_col": best_select_col_vx[0] if best_select_col_vx else None,
-                "best_select_col_avg_median_ms": best_select_col_vx[1] if best_select_col_vx else None,
-            }
-            if args.validate_io:
-                base_count = con.execute(f"SELECT COUNT(*) FROM {args.table};").fetchone()[0]
-                base_min = con.execute(f"SELECT min({_quote_ident(args.min_col)}) FROM {args.table};").fetchone()[0]
-                base_nulls_min = _null_count(con, args.table, args.min_col)
-                base_nulls_filter = _null_count(con, args.table, args.filter_col)
-                base_filtered = con.execute(
-                    f"SELECT COUNT(*) FROM {args.table} WHERE {_quote_ident(args.filter_col)} = {filter_val_sql};"
-                ).fetchone()[0]
-
-                vx_count = con.execute("SELECT COUNT(*) FROM vortex_dataset;").fetchone()[0]
-                vx_min = con.execute(f"SELECT min({min_col_expr_vx}) FROM vortex_dataset;").fetchone()[0]
-                vx_nulls_min = _null_count(con, "vortex_dataset", args.min_col)
-                vx_nulls_filter = _null_count(con, "vortex_dataset", args.filter_col)
-                vx_filtered = con.execute(
-                    f"SELECT COUNT(*) FROM vortex_dataset WHERE {q_filter_col_vx} = {filter_val_sql_vx};"
-                ).fetchone()[0]
-                report["formats"][vortex_meta.get("variant", "vortex_default")]["validation"] = {
-                    "base_count": base_count,
-                    "format_count": vx_count,
-                    "base_min": base_min,
-                    "format_min": vx_min,
-                    "count_match": base_count == vx_count,
-                    "min_match": base_min == vx_min,
-                    "base_filtered_count": base_filtered,
-                    "format_filtered_count": vx_filtered,
-                    "filtered_count_match": base_filtered == vx_filtered,
-                    "base_nulls_min_col": base_nulls_min,
-                    "format_nulls_min_col": vx_nulls_min,
-                    "min_nulls_match": base_nulls_min == vx_nulls_min,
-                    "base_nulls_filter_col": base_nulls_filter,
-                    "format_nulls_filter_col": vx_nulls_filter,
-                    "filter_nulls_match": base_nulls_filter == vx_nulls_filter,
-                }
-        except Exception as e:
-            report["formats"]["vortex_error"] = {
-                "note": f"Vortex run failed: {e}",
-            }
     else:
-        report["formats"]["vortex_default"] = {
-            "note": "Vortex backend unavailable (missing dependencies or import error).",
-        }
+        report["execution"] = {"mode": "sequential"}
+        with mem.phase("formats"):
+            task_results = [run_format_task(con, task, run_ctx) for task in tasks]
+    for result in task_results:
+        report["formats"][result["name"]] = result["body"]
+        rows_csv.extend(result["rows"])
+    if args.parquet_row_group_sizes and parquet_codecs:
+        with mem.phase("row_group_sweep"):
+            report["row_group_sweep"] = run_row_group_sweep(con, run_ctx, parquet_codecs, args.parquet_row_group_sizes)
+    if args.parquet_layouts and parquet_codecs:
+        with mem.phase("layout_sweep"):
+            report["parquet_layouts"] = run_layout_sweep(con, run_ctx, parquet_codecs[0], args.parquet_layouts)
+    if args.parquet_variants and parquet_codecs:
+        with mem.phase("variant_sweep"):
+            report["parquet_variants"] = run_variant_sweep(con, run_ctx, parquet_codecs[0], args.parquet_variants)
+    if args.vortex_native:
+        with mem.phase("vortex_native"):
+            report["vortex_native"] = run_vortex_native(con, run_ctx, args.vortex_native)
+    if args.parquet_compression_levels:
+        with mem.phase("compression_level_sweep"):
+            report["compression_level_sweep"] = run_level_sweep(con, run_ctx, args.parquet_compression_levels)
+    memory_limit, temp_directory = con.execute(
+        "SELECT current_setting('memory_limit'), current_setting('temp_directory')"
+    ).fetchone()
+    report["memory"] = {
+        "db_path": args.db_path,
+        "memory_limit": memory_limit,
+        "temp_directory": temp_directory,
+        "phases": mem.phases,
+    }
+    con.close()
+    if args.db_path and not args.keep_db:
+        Path(args.db_path).unlink(missing_ok=True)
+        Path(args.db_path + ".wal").unlink(missing_ok=True)
+    if default_temp_dir:
+        shutil.rmtree(default_temp_dir, ignore_errors=True)
 
     results_path = out_dir / f"results_{dataset_label}.csv"
     report_json_path = out_dir / f"report_{dataset_label}.json"
@@ -722,8 +877,9 @@ def main() -> None:
     write_json(report, str(report_json_path))
     write_markdown(_markdown_summary(report), str(report_md_path))
     generate_dataset_plots(report, out_dir / "plots" / dataset_label, max_cols=10)
-    generate_overall_plots(out_dir / "plots" / "overall", out_dir)
-    generate_overall_summary(out_dir, out_dir)
+    if args.overall:
+        generate_overall_plots(out_dir / "plots" / "overall", out_dir)
+        generate_overall_summary(out_dir, out_dir)
 
     print(f"Done. Wrote: {results_path}, {report_json_path}, {report_md_path}")
 
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ingest.publicbi_ingest import PublicBITable, find_tables
+from report.plots import generate_overall_plots
+from report.summary import generate_overall_summary
+
+
+def run_table(
+    run_py: Path,
+    table: PublicBITable,
+    out_dir: Path,
+    log_dir: Path,
+    threads: Optional[int],
+    passthrough: List[str],
+) -> Dict[str, Any]:
+    """Benchmark one PublicBI table with run.py; the log keeps run.py's output out of the interleaved console."""
+    entry: Dict[str, Any] = {
+        "table": table.name,
+        "dataset": table.dataset,
+        "input": str(table.csv_path),
+        "schema": str(table.schema_path) if table.schema_path else None,
+        "compressed_bytes": table.csv_path.stat().st_size,
+    }
+    if table.schema_path is None:
+        return {**entry, "status": "skipped", "error": "no .table.sql schema found"}
+    cmd = [
+        sys.executable,
+        str(run_py),
+        "--input",
+        str(table.csv_path),
+        "--input-type",
+        "publicbi",
+        "--schema",
+        str(table.schema_path),
+        "--out",
+        str(out_dir),
+        "--no-overall",
+    ]
+    if threads is not None:
+        cmd += ["--threads", str(threads)]
+    cmd += passthrough
+    log_path = log_dir / f"{table.name}.log"
+    t0 = time.perf_counter()
+    with log_path.open("w", encoding="utf-8") as log:
+        proc = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+    entry.update({"time_s": time.perf_counter() - t0, "log": str(log_path)})
+    if proc.returncode != 0:
+        lines = log_path.read_text(encoding="utf-8", errors="replace").strip().splitlines()
+        return {**entry, "status": "failed", "returncode": proc.returncode, "error": lines[-1] if lines else None}
+    report_path = out_dir / f"report_{table.name}.json"
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    dataset = report.get("dataset", {})
+    return {
+        **entry,
+        "status": "ok",
+        "report": report_path.name,
+        "rows": dataset.get("rows"),
+        "rejected_rows": (dataset.get("publicbi") or {}).get("rejected_rows"),
+        "input_size_bytes": dataset.get("input_size_bytes"),
+        "ingest_time_s": dataset.get("ingest_time_s"),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark a PublicBI checkout (every <Table>.csv.bz2 with its .table.sql)")
+    ap.add_argument("--root", required=True, help="PublicBI root (e.g. public_bi_benchmark/benchmark), searched recursively")
+    ap.add_argument("--out", default="out", help="Shared output directory (one report_<Table>.json per table)")
+    ap.add_argument("--datasets", default=None, help="Comma-separated dataset or table names (e.g. Arade,CMSprovider_1)")
+    ap.add_argument("--limit", type=int, default=None, help="Only the first N tables (by name)")
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 4),
+        help="Tables benchmarked concurrently (default: a quarter of the cores). Cores are split between them unless --threads is set.",
+    )
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--skip-existing", action="store_true", help="Skip tables that already have a report in --out")
+    ap.add_argument("--auto-cols", action="store_true")
+    ap.add_argument("--repeats", type=int, default=None)
+    ap.add_argument("--warmup", type=int, default=None)
+    ap.add_argument("--parquet-codecs", default=None)
+    ap.add_argument("--csv-ignore-errors", action="store_true")
+    args = ap.parse_args()
+
+    root = Path(args.root).expanduser().resolve()
+    if not root.is_dir():
+        raise SystemExit(f"--root is not a directory: {root}")
+    out_dir = Path(args.out).expanduser().resolve()
+    log_dir = out_dir / "publicbi_logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    datasets = [d.strip() for d in args.datasets.split(",") if d.strip()] if args.datasets else None
+    tables = find_tables(str(root), datasets)
+    if args.limit is not None:
+        tables = tables[: args.limit]
+    if not tables:
+        raise SystemExit(f"No PublicBI tables found under {root}")
+
+    passthrough: List[str] = []
+    if args.auto_cols:
+        passthrough.append("--auto-cols")
+    if args.repeats is not None:
+        passthrough += ["--repeats", str(args.repeats)]
+    if args.warmup is not None:
+        passthrough += ["--warmup", str(args.warmup)]
+    if args.parquet_codecs:
+        passthrough += ["--parquet-codecs", args.parquet_codecs]
+    if args.csv_ignore_errors:
+        passthrough.append("--csv-ignore-errors")
+
+    jobs = max(1, min(args.jobs, len(tables)))
+    threads = args.threads
+    if threads is None and jobs > 1:
+        # Split the cores between concurrent tables instead of oversubscribing them.
+        threads = max(1, (os.cpu_count() or 1) // jobs)
+    run_py = Path(__file__).parent / "run.py"
+    print(f"{len(tables)} PublicBI tables under {root} on {jobs} job(s)")
+
+    def _run(table: PublicBITable) -> Dict[str, Any]:
+        if args.skip_existing and (out_dir / f"report_{table.name}.json").exists():
+            return {"table": table.name, "dataset": table.dataset, "input": str(table.csv_path), "status": "existing"}
+        result = run_table(run_py, table, out_dir, log_dir, threads, passthrough)
+        detail = f"{result['time_s']:.1f}s" if "time_s" in result else result.get("error", "")
+        print(f"  {table.name}: {result['status']} {detail}", flush=True)
+        return result
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(_run, tables))
+    elapsed = time.perf_counter() - t0
+
+    generate_overall_plots(out_dir / "plots" / "overall", out_dir)
+    generate_overall_summary(out_dir, out_dir)
+
+    counts: Dict[str, int] = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    summary = {
+        "root": str(root),
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "jobs": jobs,
+        "threads_per_job": threads,
+        "time_s": elapsed,
+        "counts": counts,
+        "tables": results,
+    }
+    (out_dir / "publicbi_batch.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print(f"Done in {elapsed:.1f}s: " + ", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+    if counts.get("failed"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,18 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+
+from ingest.generic_ingest import ingest_csv_file, reject_reasons, rejected_row_count
 
 
 def load_report_from_dir(run_dir: Path) -> Optional[dict]:
@@ -58,20 +65,100 @@ def extract_metric(report: dict, fmt: str, metric: str) -> Optional[float]:
     return None
 
 
+def _read_csv_options(args) -> Dict[str, Any]:
+    opts: Dict[str, Any] = {}
+    if args.csv_sample_size is not None:
+        opts["sample_size"] = args.csv_sample_size
+    if args.csv_all_varchar:
+        opts["all_varchar"] = True
+    if args.csv_ignore_errors:
+        opts["ignore_errors"] = True
+    if args.csv_delimiter:
+        opts["delim"] = args.csv_delimiter
+    if args.csv_header in {"true", "false"}:
+        opts["header"] = args.csv_header == "true"
+    if args.csv_nullstr is not None:
+        opts["nullstr"] = args.csv_nullstr
+    return opts
+
+
+def ingest_base(
+    input_csv: Path,
+    db_path: Path,
+    read_csv_options: Dict[str, Any],
+    schema: Optional[Path],
+    reuse: bool = True,
+) -> Dict[str, Any]:
+    """
+    Ingest the CSV once into a persistent DuckDB database (table base_table).
+
+    A sidecar JSON remembers the input's size/mtime, the read options and the schema;
+    when they match, the existing database is reused and nothing is re-parsed.
+    Compressed inputs (NYC_1.csv.bz2) are decompressed on the fly; input_size_bytes is
+    the decompressed CSV size. With ignore_errors, rows DuckDB skips are counted into
+    input_rows / dropped_rows (with reject_reasons); without it a bad row fails the ingest.
+    """
+    stat = input_csv.stat()
+    fingerprint = {
+        "input": str(input_csv),
+        "size_bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "read_csv_options": read_csv_options,
+        "schema": str(schema) if schema else None,
+        "schema_mtime_ns": schema.stat().st_mtime_ns if schema else None,
+    }
+    meta_path = db_path.with_suffix(".json")
+    if reuse and db_path.exists() and meta_path.exists():
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("fingerprint") == fingerprint:
+            return {**meta, "reused": True}
+
+    db_path.unlink(missing_ok=True)
+    Path(str(db_path) + ".wal").unlink(missing_ok=True)
+    con = duckdb.connect(database=str(db_path))
+    try:
+        t0 = time.perf_counter()
+        info = ingest_csv_file(
+            con,
+            "base_table",
+            str(input_csv),
+            schema_sql_path=str(schema) if schema else None,
+            read_csv_options=read_csv_options or None,
+            store_rejects=True,
+            measure=False,
+        )
+        table = info["table"]
+        if table != "base_table":
+            con.execute(f"ALTER TABLE {table} RENAME TO base_table;")
+        ingest_time_s = time.perf_counter() - t0
+        rows = con.execute("SELECT count(*) FROM base_table").fetchone()[0]
+        dropped_rows = rejected_row_count(con)
+        reasons = reject_reasons(con)
+    finally:
+        con.close()
+    meta = {
+        "fingerprint": fingerprint,
+        "rows": rows,
+        "input_rows": rows + dropped_rows,
+        "dropped_rows": dropped_rows,
+        "reject_reasons": reasons,
+        "ingest_time_s": ingest_time_s,
+        "input_size_bytes": info["size_bytes"],
+        "decompression": info["decompression"],
+    }
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return {**meta, "reused": False}
+
+
 def run_benchmark(
     run_py: Path,
-    input_csv: Path,
+    base_db: Path,
     out_dir: Path,
     row_limit: Optional[int],
-    csv_delimiter: Optional[str],
-    csv_header: Optional[str],
-    csv_nullstr: Optional[str],
-    csv_sample_size: Optional[int],
-    csv_ignore_errors: bool,
-    csv_all_varchar: bool,
+    dataset_label: str,
+    input_size_bytes: Optional[int],
     validate_io: Optional[bool],
     auto_cols: bool,
-    schema: Optional[Path],
     threads: Optional[int],
     repeats: Optional[int],
     warmup: Optional[int],
@@ -81,9 +168,13 @@ def run_benchmark(
         sys.executable,
         str(run_py),
         "--input",
-        str(input_csv),
+        str(base_db),
         "--input-type",
-        "csv",
+        "duckdb",
+        "--input-table",
+        "base_table",
+        "--dataset-label",
+        dataset_label,
         "--out",
         str(out_dir),
         "--table",
@@ -91,24 +182,12 @@ def run_benchmark(
     ]
     if row_limit is not None:
         cmd += ["--row-limit", str(row_limit)]
-    if csv_delimiter:
-        cmd += ["--csv-delimiter", csv_delimiter]
-    if csv_header in {"true", "false"}:
-        cmd += ["--csv-header", csv_header]
-    if csv_nullstr:
-        cmd += ["--csv-nullstr", csv_nullstr]
-    if csv_sample_size is not None:
-        cmd += ["--csv-sample-size", str(csv_sample_size)]
-    if csv_ignore_errors:
-        cmd += ["--csv-ignore-errors"]
-    if csv_all_varchar:
-        cmd += ["--csv-all-varchar"]
+    if input_size_bytes is not None:
+        cmd += ["--input-size-bytes", str(input_size_bytes)]
     if validate_io is not None:
         cmd.append("--validate-io" if validate_io else "--no-validate-io")
     if auto_cols:
         cmd += ["--auto-cols"]
-    if schema:
-        cmd += ["--schema", str(schema)]
     if threads is not None:
         cmd += ["--threads", str(threads)]
     if repeats is not None:
@@ -153,6 +232,18 @@ def main() -> None:
     ap.add_argument("--repeats", type=int, default=None)
     ap.add_argument("--warmup", type=int, default=None)
     ap.add_argument("--parquet-codecs", default=None)
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help="Row counts benchmarked concurrently (default: half the cores). Cores are split between them unless --threads is set.",
+    )
+    ap.add_argument(
+        "--reuse-base",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Reuse out-root/row_scaling_base.duckdb when the input and read options are unchanged (default: true)",
+    )
     ap.add_argument(
         "--include-duckdb",
         action="store_true",
@@ -172,9 +263,15 @@ def main() -> None:
     out_root = Path(args.out_root).expanduser().resolve()
     out_root.mkdir(parents=True, exist_ok=True)
     row_counts = parse_counts(args.row_counts)
+    dataset_label = input_csv.name.split(".")[0]
 
     reports_by_count: Dict[int, dict] = {}
+    base_db = out_root / "row_scaling_base.duckdb"
+    base: Optional[Dict[str, Any]] = None
     if args.rebuild_summary_only:
+        meta_path = base_db.with_suffix(".json")
+        if meta_path.exists():
+            base = json.loads(meta_path.read_text(encoding="utf-8"))
         for run_dir in sorted(out_root.glob("rows_*")):
             try:
                 count = int(run_dir.name.replace("rows_", ""))
@@ -187,29 +284,49 @@ def main() -> None:
             raise FileNotFoundError("No rows_* reports found to rebuild summary.")
     else:
         run_py = Path(__file__).parent / "run.py"
-        for count in row_counts:
+        base = ingest_base(
+            input_csv,
+            base_db,
+            _read_csv_options(args),
+            Path(args.schema).resolve() if args.schema else None,
+            reuse=args.reuse_base,
+        )
+        total_rows = base["rows"]
+        input_bytes = base.get("input_size_bytes") or base["fingerprint"]["size_bytes"]
+        workers = max(1, min(args.workers, len(row_counts)))
+        threads = args.threads
+        if threads is None and workers > 1:
+            # Split the cores between concurrent runs instead of oversubscribing them.
+            threads = max(1, (os.cpu_count() or 1) // workers)
+        print(
+            f"Base table: {total_rows:,} rows ({'reused' if base['reused'] else 'ingested'} {base_db}); "
+            f"{len(row_counts)} counts on {workers} worker(s)"
+        )
+
+        def _run(count: int) -> Tuple[int, dict]:
             run_out = out_root / f"rows_{count}"
             run_out.mkdir(parents=True, exist_ok=True)
+            slice_rows = min(count, total_rows)
             report_path = run_benchmark(
                 run_py=run_py,
-                input_csv=input_csv,
+                base_db=base_db,
                 out_dir=run_out,
                 row_limit=count,
-                csv_delimiter=args.csv_delimiter,
-                csv_header=args.csv_header,
-                csv_nullstr=args.csv_nullstr,
-                csv_sample_size=args.csv_sample_size,
-                csv_ignore_errors=args.csv_ignore_errors,
-                csv_all_varchar=args.csv_all_varchar,
+                dataset_label=dataset_label,
+                # Slices have no CSV of their own; prorate the input bytes by rows.
+                input_size_bytes=int(input_bytes * slice_rows / total_rows) if total_rows else None,
                 validate_io=args.validate_io,
                 auto_cols=args.auto_cols,
-                schema=Path(args.schema).resolve() if args.schema else None,
-                threads=args.threads,
+                threads=threads,
                 repeats=args.repeats,
                 warmup=args.warmup,
                 parquet_codecs=args.parquet_codecs,
             )
-            reports_by_count[count] = json.loads(report_path.read_text(encoding="utf-8"))
+            return count, json.loads(report_path.read_text(encoding="utf-8"))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for count, report in pool.map(_run, row_counts):
+                reports_by_count[count] = report
 
     metrics = [
         {"key": "compression_ratio", "label": "Compression ratio", "unit": "ratio"},
@@ -244,14 +361,20 @@ def main() -> None:
                 value = extract_metric(report, fmt, metric["key"])
                 series[metric["key"]][fmt].append(value)
 
+    # Slices are cut from the already-ingested table, so rows dropped while parsing the CSV
+    # are recorded once for the shared base rather than per slice.
+    base_summary = None
+    if base:
+        base_summary = {key: base.get(key) for key in ("rows", "input_rows", "dropped_rows", "reject_reasons")}
     summary = {
-        "dataset": "NYC_1",
+        "dataset": dataset_label,
         "row_counts": sorted(reports_by_count.keys()),
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "metrics": metrics,
         "formats": formats,
         "series": series,
-        "reports": {str(count): f"rows_{count}/report_NYC_1.json" for count in reports_by_count.keys()},
+        "base": base_summary,
+        "reports": {str(count): f"rows_{count}/report_{dataset_label}.json" for count in reports_by_count.keys()},
     }
     (out_root / "row_scaling_summary.json").write_text(
         json.dumps(summary, indent=2), encoding="utf-8"
@@ -0,0 +1,6 @@
+# bench/tests/conftest.py
+# The bench scripts import each other as top-level modules (run with bench/ on sys.path).
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
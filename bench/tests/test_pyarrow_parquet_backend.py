@@ -0,0 +1,30 @@
+# bench/tests/test_pyarrow_parquet_backend.py
+import duckdb
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from backends import parquet_backend, pyarrow_parquet_backend  # noqa: E402
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    con.execute("CREATE TABLE base AS SELECT range AS id, 'v' || (range % 7) AS s FROM range(1000)")
+    yield con
+    con.close()
+
+
+@pytest.mark.parametrize("codec", parquet_backend.DEFAULT_CODECS)
+def test_writes_every_default_codec(con, tmp_path, codec):
+    meta = pyarrow_parquet_backend.write(con, "base", str(tmp_path / f"{codec}.parquet"), {"codec": codec})
+
+    assert meta["codec"] == codec
+    written = pq.ParquetFile(meta["parquet_path"]).metadata.row_group(0).column(0).compression
+    assert written == codec.upper()
+    assert con.execute(f"SELECT count(*) FROM read_parquet('{meta['parquet_path']}')").fetchone()[0] == 1000
+
+
+def test_rejects_unknown_codec():
+    with pytest.raises(ValueError):
+        pyarrow_parquet_backend.pyarrow_codec("lzo")
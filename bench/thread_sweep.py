@@ -0,0 +1,81 @@
+# bench/thread_sweep.py
+"""Thread-scaling sweep.
+
+Re-times a format's bound workload at several `PRAGMA threads` settings and
+derives speedup and parallel efficiency per query family (workload template
+name). A family's time at each thread count is the geometric mean of its query
+medians, so every bound query weighs the same and the family speedup equals the
+geometric mean of the per-query speedups.
+"""
+from __future__ import annotations
+
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+
+from utils_run import timed_query
+
+
+def default_thread_counts(max_threads: Optional[int] = None) -> List[int]:
+    """1, 2, 4, ... up to the core count (the core count itself is always included)."""
+    top = max(1, max_threads or os.cpu_count() or 1)
+    counts = []
+    t = 1
+    while t < top:
+        counts.append(t)
+        t *= 2
+    counts.append(top)
+    return counts
+
+
+def _geomean(values: List[float]) -> Optional[float]:
+    vals = [v for v in values if v is not None and v > 0]
+    if not vals:
+        return None
+    return math.exp(sum(math.log(v) for v in vals) / len(vals))
+
+
+def run_thread_sweep(
+    con: duckdb.DuckDBPyConnection,
+    queries: List[Tuple[str, str]],
+    thread_counts: List[int],
+    repeats: int,
+    warmup: int,
+) -> Dict[str, Any]:
+    """
+    Time (family, sql) queries at each thread count; the connection's thread setting is restored afterwards.
+
+    Returns {"threads": [...], "families": {family: {"median_ms", "speedup", "efficiency"}},
+    "overall": {...}} where every list is aligned with "threads" and speedup is relative
+    to the first (smallest) thread count.
+    """
+    original = con.execute("SELECT current_setting('threads')").fetchone()[0]
+    family_ms: Dict[str, List[Optional[float]]] = {}
+    try:
+        for t in thread_counts:
+            con.execute(f"PRAGMA threads={int(t)};")
+            medians: Dict[str, List[float]] = {}
+            for family, sql in queries:
+                m = timed_query(con, sql, repeats=repeats, warmup=warmup)
+                medians.setdefault(family, []).append(m["median_ms"])
+            for family, vals in medians.items():
+                family_ms.setdefault(family, []).append(_geomean(vals))
+    finally:
+        con.execute(f"PRAGMA threads={int(original)};")
+
+    def _curves(ms: List[Optional[float]]) -> Dict[str, List[Optional[float]]]:
+        base = ms[0] if ms else None
+        speedup = [(base / v) if base and v else None for v in ms]
+        base_t = thread_counts[0]
+        efficiency = [(s * base_t / t) if s is not None else None for s, t in zip(speedup, thread_counts)]
+        return {"median_ms": ms, "speedup": speedup, "efficiency": efficiency}
+
+    families = {family: _curves(ms) for family, ms in family_ms.items()}
+    overall_ms = [_geomean([ms[i] for ms in family_ms.values()]) for i in range(len(thread_counts))]
+    return {
+        "threads": list(thread_counts),
+        "families": families,
+        "overall": _curves(overall_ms),
+    }
@@ -0,0 +1,140 @@
+# bench/throughput.py
+"""Concurrent-client throughput.
+
+N client threads, each on its own cursor of the benchmark connection, replay the
+workload's bound queries round-robin (every client starts at a different offset)
+for a fixed duration. DuckDB releases the GIL while executing, so the clients
+really run concurrently and share the database's thread pool, like dashboards
+hitting the same files. Reported per client count: QPS, latency p50/p95/p99
+under load (overall and per query family) and scaling efficiency against the
+single-client rate.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+
+# A client-count step that adds less than this fraction of QPS counts as saturated.
+SATURATION_GAIN = 0.10
+
+
+def _percentile(sorted_vals: List[float], p: float) -> Optional[float]:
+    if not sorted_vals:
+        return None
+    return sorted_vals[int(p * (len(sorted_vals) - 1))]
+
+
+def _latency_fields(latencies_ms: List[float]) -> Dict[str, Any]:
+    vals = sorted(latencies_ms)
+    return {
+        "count": len(vals),
+        "p50_ms": _percentile(vals, 0.50),
+        "p95_ms": _percentile(vals, 0.95),
+        "p99_ms": _percentile(vals, 0.99),
+    }
+
+
+def _run_level(
+    con: duckdb.DuckDBPyConnection,
+    queries: List[Tuple[str, str]],
+    clients: int,
+    duration_s: float,
+    setup_sql: Optional[List[str]],
+) -> Dict[str, Any]:
+    samples: List[List[Tuple[str, float]]] = [[] for _ in range(clients)]
+    errors: List[str] = []
+    cursors = []
+    for _ in range(clients):
+        cur = con.cursor()
+        for stmt in setup_sql or []:
+            cur.execute(stmt)
+        cursors.append(cur)
+    barrier = threading.Barrier(clients + 1)
+    deadline = [0.0]
+
+    def _client(idx: int) -> None:
+        cur = cursors[idx]
+        out = samples[idx]
+        i = idx * max(1, len(queries) // clients)
+        barrier.wait()
+        while time.perf_counter() < deadline[0]:
+            name, sql = queries[i % len(queries)]
+            i += 1
+            t0 = time.perf_counter()
+            try:
+                cur.execute(sql).fetchall()
+            except Exception as exc:
+                errors.append(f"{name}: {exc}")
+                continue
+            out.append((name, (time.perf_counter() - t0) * 1000.0))
+
+    threads = [threading.Thread(target=_client, args=(idx,), daemon=True) for idx in range(clients)]
+    for t in threads:
+        t.start()
+    deadline[0] = time.perf_counter() + duration_s
+    t0 = time.perf_counter()
+    barrier.wait()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    for cur in cursors:
+        cur.close()
+
+    all_ms: List[float] = []
+    by_family: Dict[str, List[float]] = {}
+    for client_samples in samples:
+        for name, ms in client_samples:
+            all_ms.append(ms)
+            by_family.setdefault(name, []).append(ms)
+    return {
+        "clients": clients,
+        "elapsed_s": elapsed,
+        "completed": len(all_ms),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "qps": (len(all_ms) / elapsed) if elapsed > 0 else None,
+        **{k: v for k, v in _latency_fields(all_ms).items() if k != "count"},
+        "per_query": {name: _latency_fields(vals) for name, vals in sorted(by_family.items())},
+    }
+
+
+def run_throughput(
+    con: duckdb.DuckDBPyConnection,
+    queries: List[Tuple[str, str]],
+    client_counts: List[int],
+    duration_s: float,
+    setup_sql: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Measure QPS and latency under load for each client count.
+
+    queries are (family, sql) pairs; setup_sql runs on every client cursor first
+    (e.g. to recreate connection-local temp views). Each level also gets
+    scaling_efficiency = qps / (clients * qps at the smallest level / its clients),
+    and saturation_clients is the first count whose QPS gain over the previous
+    level drops below SATURATION_GAIN.
+    """
+    levels = [_run_level(con, queries, n, duration_s, setup_sql) for n in client_counts]
+    base = levels[0] if levels else None
+    per_client_qps = (base["qps"] / base["clients"]) if base and base["qps"] else None
+    saturation = None
+    prev_qps = None
+    for level in levels:
+        qps = level["qps"]
+        level["scaling_efficiency"] = (qps / (level["clients"] * per_client_qps)) if qps and per_client_qps else None
+        if saturation is None and prev_qps and qps is not None and qps < prev_qps * (1.0 + SATURATION_GAIN):
+            saturation = level["clients"]
+        prev_qps = qps
+    mix: Dict[str, int] = {}
+    for name, _ in queries:
+        mix[name] = mix.get(name, 0) + 1
+    return {
+        "duration_s": duration_s,
+        "query_mix": mix,
+        "levels": levels,
+        "peak_qps": max((lvl["qps"] for lvl in levels if lvl["qps"] is not None), default=None),
+        "saturation_clients": saturation,
+    }
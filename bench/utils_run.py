@@ -1,14 +1,273 @@
 # bench/utils_run.py
 from __future__ import annotations
 
+import contextlib
+import json
+import os
+import random
 import statistics
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import duckdb
 
+from ingest.generic_ingest import csv_files
+from ingest.stream_decompress import compression_of, measure_decompression, strip_compression_suffix
+
+try:
+    import resource
+except Exception:  # not available on Windows
+    resource = None
+
+
+def _read_proc_kv(path: str) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                key, _, val = line.partition(":")
+                out[key.strip()] = val.strip()
+    except OSError:
+        pass
+    return out
+
+
+# Open memory phases (see MemoryPhases); each holds the highest VmHWM seen while it is open.
+_peak_watchers: List[Dict[str, Optional[int]]] = []
+
+
+def _fold_peak_rss() -> None:
+    if not _peak_watchers:
+        return
+    hwm = _kb_field(_read_proc_kv("/proc/self/status"), "VmHWM")
+    if hwm is None:
+        return
+    for w in _peak_watchers:
+        if w["peak"] is None or hwm > w["peak"]:
+            w["peak"] = hwm
+
+
+def _reset_peak_rss() -> bool:
+    # Linux: writing 5 to clear_refs resets VmHWM to the current RSS.
+    # Open phases record the old high-water mark first, so nested resets don't hide their peak.
+    _fold_peak_rss()
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="utf-8") as fh:
+            fh.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _kb_field(status: Dict[str, str], key: str) -> Optional[int]:
+    val = status.get(key)
+    if not val:
+        return None
+    try:
+        return int(val.split()[0]) * 1024
+    except ValueError:
+        return None
+
+
+def _resource_snapshot(io_first: bool) -> Dict[str, Any]:
+    # Reading /proc/self/status shows up in rchar; keep it outside the measured window
+    # (before-snapshot reads io last, after-snapshot reads io first).
+    if io_first:
+        io = _read_proc_kv("/proc/self/io")
+        status = _read_proc_kv("/proc/self/status")
+    else:
+        status = _read_proc_kv("/proc/self/status")
+        io = _read_proc_kv("/proc/self/io")
+    snap: Dict[str, Any] = {
+        "rchar": int(io["rchar"]) if "rchar" in io else None,
+        "read_bytes": int(io["read_bytes"]) if "read_bytes" in io else None,
+        "rss": _kb_field(status, "VmRSS"),
+        "hwm": _kb_field(status, "VmHWM"),
+        "utime": None,
+        "stime": None,
+        "maxrss": None,
+    }
+    if resource is not None:
+        ru = resource.getrusage(resource.RUSAGE_SELF)
+        snap["utime"] = ru.ru_utime
+        snap["stime"] = ru.ru_stime
+        snap["maxrss"] = ru.ru_maxrss * 1024  # KiB on Linux
+    return snap
+
+
+# Per-run rchar below this is not a file scan (config reads, /proc, Python imports).
+MIN_SCAN_BYTES_PER_RUN = 1024 * 1024
+
+
+def _resource_metrics(
+    before: Dict[str, Any],
+    after: Dict[str, Any],
+    runs: int,
+    median_ms: Optional[float],
+    peak_reset: bool,
+) -> Dict[str, Any]:
+    """
+    Per-run I/O and CPU from two snapshots around the timed repeats.
+
+    read_bytes_per_run counts bytes returned by read syscalls (/proc rchar, page
+    cache hits included); disk_read_bytes_per_run counts bytes fetched from storage.
+    rchar covers every read the process makes, so scan_bandwidth_mb_s and cpu_s_per_gb
+    are only derived when it reaches MIN_SCAN_BYTES_PER_RUN. Below that, e.g. for
+    in-memory tables or scans answered from metadata, they would measure syscall noise
+    and are None.
+    """
+    def _per_run(key: str) -> Optional[float]:
+        if before.get(key) is None or after.get(key) is None or runs <= 0:
+            return None
+        return (after[key] - before[key]) / runs
+
+    read_b = _per_run("rchar")
+    user_s = _per_run("utime")
+    sys_s = _per_run("stime")
+    cpu_s = (user_s or 0.0) + (sys_s or 0.0) if user_s is not None or sys_s is not None else None
+    if peak_reset and after.get("hwm") is not None and before.get("rss") is not None:
+        peak_delta = max(after["hwm"] - before["rss"], 0)
+    elif before.get("maxrss") is not None and after.get("maxrss") is not None:
+        peak_delta = after["maxrss"] - before["maxrss"]
+    else:
+        peak_delta = None
+    scan_b = read_b if read_b is not None and read_b >= MIN_SCAN_BYTES_PER_RUN else None
+    bandwidth = None
+    if scan_b and median_ms:
+        bandwidth = (scan_b / (1024 * 1024)) / (median_ms / 1000.0)
+    cpu_per_gb = None
+    if scan_b and cpu_s is not None:
+        cpu_per_gb = cpu_s / (scan_b / 1e9)
+    return {
+        "read_bytes_per_run": read_b,
+        "disk_read_bytes_per_run": _per_run("read_bytes"),
+        "cpu_user_s_per_run": user_s,
+        "cpu_sys_s_per_run": sys_s,
+        "peak_rss_delta_bytes": peak_delta,
+        "scan_bandwidth_mb_s": bandwidth,
+        "cpu_s_per_gb": cpu_per_gb,
+    }
+
+
+def configure_connection(
+    con: duckdb.DuckDBPyConnection,
+    threads: Optional[int] = None,
+    memory_limit: Optional[str] = None,
+    temp_directory: Optional[str] = None,
+) -> None:
+    """Apply thread count, memory limit (e.g. '4GB') and spill directory to a connection."""
+    if threads is not None:
+        con.execute(f"PRAGMA threads={int(threads)};")
+    if memory_limit:
+        con.execute(f"SET memory_limit={format_value_sql(memory_limit)};")
+    if temp_directory:
+        Path(temp_directory).mkdir(parents=True, exist_ok=True)
+        con.execute(f"SET temp_directory={format_value_sql(str(temp_directory))};")
+
+
+def duckdb_memory_usage(con: duckdb.DuckDBPyConnection) -> Dict[str, Optional[int]]:
+    """Buffer-managed memory and spilled temporary storage currently held by the database."""
+    try:
+        mem, spill = con.execute(
+            "SELECT sum(memory_usage_bytes), sum(temporary_storage_bytes) FROM duckdb_memory()"
+        ).fetchone()
+    except duckdb.Error:
+        return {"duckdb_memory_bytes": None, "duckdb_temp_bytes": None}
+    return {
+        "duckdb_memory_bytes": int(mem) if mem is not None else None,
+        "duckdb_temp_bytes": int(spill) if spill is not None else None,
+    }
+
+
+class MemoryPhases:
+    """
+    Peak process memory per named phase.
+
+    `with phases.phase("ingest"): ...` records wall time, the process peak RSS
+    while the phase was open (VmHWM, reset at phase start; ru_maxrss, a
+    process-lifetime peak, where /proc is unavailable), the RSS at the end and
+    DuckDB's buffer-managed memory and spilled temp storage at the end.
+    """
+
+    def __init__(self, con: Optional[duckdb.DuckDBPyConnection] = None):
+        self.con = con
+        self.phases: Dict[str, Dict[str, Any]] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        watcher: Dict[str, Optional[int]] = {"peak": None}
+        peak_reset = _reset_peak_rss()
+        _peak_watchers.append(watcher)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            _fold_peak_rss()
+            _peak_watchers[:] = [w for w in _peak_watchers if w is not watcher]
+            snap = _resource_snapshot(io_first=False)
+            peak, source = watcher["peak"], "vmhwm"
+            if not peak_reset or peak is None:
+                peak, source = snap.get("maxrss"), "ru_maxrss"
+            entry: Dict[str, Any] = {
+                "time_s": elapsed,
+                "peak_rss_bytes": peak,
+                "peak_source": source,
+                "rss_end_bytes": snap.get("rss"),
+            }
+            if self.con is not None:
+                entry.update(duckdb_memory_usage(self.con))
+            self.phases[name] = entry
+
+
+@dataclass
+class AdaptiveRepeats:
+    """Stop rule for adaptive timing: sample until the median's CI is narrow enough or the budget is spent."""
+    target_rel_width: float = 0.05   # (ci_high - ci_low) / median
+    time_budget_s: float = 10.0      # wall time for the timed runs of one query
+    min_runs: int = 5
+    max_runs: int = 1000
+    confidence: float = 0.95
+    resamples: int = 1000
+
+
+def _bootstrap_median_ci(
+    samples: List[float],
+    confidence: float = 0.95,
+    resamples: int = 1000,
+    seed: int = 42,
+) -> Tuple[Optional[float], Optional[float]]:
+    """Percentile bootstrap CI of the median (seeded, so reruns give the same bounds)."""
+    n = len(samples)
+    if n < 2:
+        return None, None
+    rng = random.Random(seed)
+    medians = sorted(statistics.median(rng.choices(samples, k=n)) for _ in range(resamples))
+    alpha = (1.0 - confidence) / 2.0
+    lo = medians[int(alpha * (resamples - 1))]
+    hi = medians[int((1.0 - alpha) * (resamples - 1))]
+    return lo, hi
+
+
+def _spread_metrics(times_ms: List[float], confidence: float = 0.95, resamples: int = 1000) -> Dict[str, Any]:
+    median = statistics.median(times_ms)
+    mean = statistics.mean(times_ms)
+    cv = (statistics.stdev(times_ms) / mean) if len(times_ms) > 1 and mean > 0 else None
+    lo, hi = _bootstrap_median_ci(times_ms, confidence, resamples)
+    rel = ((hi - lo) / median) if lo is not None and median > 0 else None
+    return {
+        "cv": cv,
+        "ci_low_ms": lo,
+        "ci_high_ms": hi,
+        "ci_rel_width": rel,
+        "ci_confidence": confidence,
+    }
+
 
 def timed_query(
     con: duckdb.DuckDBPyConnection,
@@ -16,46 +275,240 @@ def timed_query(
     repeats: int,
     warmup: int,
     include_cold: bool = False,
+    cold_runner: Optional[Callable[[str], Dict[str, Any]]] = None,
+    adaptive: Optional[AdaptiveRepeats] = None,
 ) -> Dict[str, Any]:
+    """
+    Time a query: optional cold run, warmup runs, then the timed runs.
+
+    By default the cold run is the first execution on this connection. A
+    cold_runner (see cold_cache.run_cold_query) replaces it with a true cold
+    measurement and must return cold_ms plus any extra fields to record.
+
+    Without `adaptive` exactly `repeats` runs are timed. With it, runs continue
+    past adaptive.min_runs until the bootstrap CI of the median is within
+    adaptive.target_rel_width, or the time budget / max_runs is reached; the CI
+    is re-checked each time the sample grows by ~25% to keep bootstrap cost low.
+    """
     cold_ms = None
-    if include_cold:
+    cold_extra: Dict[str, Any] = {}
+    result_value = None
+    if include_cold and cold_runner is not None:
+        cold_extra = dict(cold_runner(sql))
+        cold_ms = cold_extra.pop("cold_ms", None)
+    elif include_cold:
         t0 = time.perf_counter()
         res = con.execute(sql).fetchone()
         t1 = time.perf_counter()
         cold_ms = (t1 - t0) * 1000.0
         result_value = res[0] if res else None
-    else:
-        result_value = None
+        cold_extra = {"cold_method": "connection"}
     for _ in range(warmup):
         con.execute(sql).fetchall()
 
     times_ms: List[float] = []
-    for _ in range(repeats):
-        t0 = time.perf_counter()
-        res = con.execute(sql).fetchone()
-        t1 = time.perf_counter()
-        times_ms.append((t1 - t0) * 1000.0)
-        result_value = res[0] if res else result_value
-
+    converged: Optional[bool] = None
+    target_runs = adaptive.min_runs if adaptive else repeats
+    peak_reset = _reset_peak_rss()
+    before = _resource_snapshot(io_first=False)
+    started = time.perf_counter()
+    while True:
+        while len(times_ms) < target_runs:
+            t0 = time.perf_counter()
+            res = con.execute(sql).fetchone()
+            t1 = time.perf_counter()
+            times_ms.append((t1 - t0) * 1000.0)
+            result_value = res[0] if res else result_value
+        if adaptive is None:
+            break
+        lo, hi = _bootstrap_median_ci(times_ms, adaptive.confidence, adaptive.resamples)
+        median = statistics.median(times_ms)
+        if lo is not None and median > 0 and (hi - lo) / median <= adaptive.target_rel_width:
+            converged = True
+            break
+        if time.perf_counter() - started >= adaptive.time_budget_s or len(times_ms) >= adaptive.max_runs:
+            converged = False
+            break
+        target_runs = min(adaptive.max_runs, len(times_ms) + max(1, len(times_ms) // 4))
+    after = _resource_snapshot(io_first=True)
+
+    runs = len(times_ms)
     times_ms_sorted = sorted(times_ms)
     median = statistics.median(times_ms_sorted)
-    p95 = times_ms_sorted[int(0.95 * (len(times_ms_sorted) - 1))]
+    p95 = times_ms_sorted[int(0.95 * (runs - 1))]
+    spread = (
+        _spread_metrics(times_ms, adaptive.confidence, adaptive.resamples) if adaptive else _spread_metrics(times_ms)
+    )
     return {
         "median_ms": median,
         "p95_ms": p95,
-        "runs": repeats,
+        "runs": runs,
         "result_value": result_value,
         "cold_ms": cold_ms,
+        **cold_extra,
+        **spread,
+        "repeat_mode": "adaptive" if adaptive else "fixed",
+        "converged": converged,
+        **_resource_metrics(before, after, runs, median, peak_reset),
+    }
+
+
+_SCAN_OPERATOR_HINTS = ("SCAN", "READ_", "PARQUET", "VORTEX")
+# Scans over materialized plan-time data, not over the table/file.
+_NON_STORAGE_SCANS = {"COLUMN_DATA_SCAN", "DUMMY_SCAN", "EMPTY_RESULT"}
+
+
+def _profile_node_fields(node: Dict[str, Any]) -> Dict[str, Any]:
+    # Key names differ across DuckDB versions (operator_timing vs timing, ...).
+    extra = node.get("extra_info")
+    if isinstance(extra, str):
+        extra = {"text": extra} if extra.strip() else {}
+    timing = node.get("operator_timing", node.get("timing"))
+    return {
+        "name": node.get("operator_name") or node.get("operator_type") or node.get("name"),
+        "timing_ms": (timing * 1000.0) if timing is not None else None,
+        "rows_emitted": node.get("operator_cardinality", node.get("cardinality")),
+        "rows_scanned": node.get("operator_rows_scanned"),
+        "extra_info": extra or {},
+    }
+
+
+def _is_scan_operator(op: Dict[str, Any]) -> bool:
+    name = str(op.get("name") or "").upper()
+    if name in _NON_STORAGE_SCANS:
+        return False
+    return any(h in name for h in _SCAN_OPERATOR_HINTS) or "Function" in op.get("extra_info", {})
+
+
+def _read_json_profile(con: duckdb.DuckDBPyConnection, sql: str) -> Optional[Dict[str, Any]]:
+    fd, path = tempfile.mkstemp(suffix=".json", prefix="duckdb_profile_")
+    os.close(fd)
+    try:
+        con.execute("PRAGMA enable_profiling='json';")
+        con.execute(f"PRAGMA profiling_output='{path}';")
+        try:
+            con.execute(sql).fetchall()
+        finally:
+            con.execute("PRAGMA disable_profiling;")
+        text = Path(path).read_text(encoding="utf-8")
+    finally:
+        Path(path).unlink(missing_ok=True)
+    raw = json.loads(text) if text.strip() else None
+    if not raw or raw.get("result") == "error" or not raw.get("children"):
+        return None
+    return raw
+
+
+def query_profile(
+    con: duckdb.DuckDBPyConnection,
+    sql: str,
+    table_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run sql once with DuckDB JSON profiling and summarize the plan.
+
+    Returns query-level latency/CPU, a flat operator list (name, timing, rows
+    emitted/scanned) and, per scan operator, the pushed-down filters and how many
+    rows were skipped relative to table_rows (zone-map / row-group pruning).
+    Queries DuckDB answers at plan time (e.g. MIN from Parquet statistics) have
+    no runtime profile; for those the EXPLAIN plan is summarized instead and
+    `metadata_only` is set when no storage scan remains.
+    """
+    try:
+        raw = _read_json_profile(con, sql)
+        source = "profile"
+        if raw is None:
+            plan = json.loads(con.execute(f"EXPLAIN (FORMAT JSON) {sql}").fetchall()[0][1])
+            raw = {"children": plan if isinstance(plan, list) else [plan]}
+            source = "explain"
+    except Exception as exc:
+        return {"error": str(exc)}
+
+    operators: List[Dict[str, Any]] = []
+
+    def _walk(node: Dict[str, Any], depth: int) -> None:
+        for child in node.get("children", []) or []:
+            op = _profile_node_fields(child)
+            op["depth"] = depth
+            operators.append(op)
+            _walk(child, depth + 1)
+
+    _walk(raw, 0)
+    scans = []
+    for op in operators:
+        if not _is_scan_operator(op):
+            continue
+        extra = op["extra_info"]
+        filters = extra.get("Filters") or extra.get("Filter")
+        scanned = op.get("rows_scanned")
+        if scanned is not None and (op["rows_emitted"] or 0) > scanned:
+            # Early-terminated scans (LIMIT) can report fewer rows scanned than emitted.
+            scanned = None
+        pruned = None
+        if table_rows and scanned is not None:
+            pruned = max(table_rows - scanned, 0)
+        scans.append(
+            {
+                "name": op["name"],
+                "rows_scanned": scanned,
+                "rows_emitted": op["rows_emitted"],
+                "filters": filters,
+                "filter_pushdown": bool(filters),
+                "pruned_rows": pruned,
+                "pruned_fraction": (pruned / table_rows) if pruned is not None and table_rows else None,
+                "extra_info": extra,
+            }
+        )
+    latency = raw.get("latency", raw.get("timing"))
+    return {
+        "source": source,
+        "metadata_only": not scans,
+        "latency_ms": (latency * 1000.0) if latency is not None else None,
+        "cpu_time_s": raw.get("cpu_time"),
+        "rows_returned": raw.get("rows_returned"),
+        "rows_scanned": raw.get("cumulative_rows_scanned"),
+        "bytes_read": raw.get("total_bytes_read"),
+        "operators": operators,
+        "scans": scans,
     }
 
 
 def quantile_thresholds(
     con: duckdb.DuckDBPyConnection, table_name: str, col: str, ps: List[float]
 ) -> List[Tuple[float, Any]]:
-    qcol = _quote_ident(col)
-    select_expr = ", ".join([f"quantile_cont({qcol}, {p}) AS q_{str(p).replace('.','_')}" for p in ps])
-    row = con.execute(f"SELECT {select_expr} FROM {table_name};").fetchone()
-    return [(p, row[i]) for i, p in enumerate(ps)]
+    return threshold_plan(con, table_name, [col], ps)["by_col"][col]
+
+
+def threshold_plan(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    cols: List[str],
+    ps: List[float],
+    approx: bool = False,
+) -> Dict[str, Any]:
+    """
+    Compute selectivity thresholds for all columns in a single aggregate scan.
+
+    Exact mode uses quantile_cont; approx mode uses approx_quantile (t-digest),
+    which keeps memory bounded when many select columns are planned at once.
+    """
+    fn = "approx_quantile" if approx else "quantile_cont"
+    ps_sql = "[" + ", ".join(str(p) for p in ps) + "]"
+    by_col: Dict[str, List[Tuple[float, Any]]] = {}
+    t0 = time.perf_counter()
+    if cols and ps:
+        select_expr = ", ".join([f"{fn}({_quote_ident(c)}, {ps_sql})" for c in cols])
+        row = con.execute(f"SELECT {select_expr} FROM {table_name};").fetchone()
+        for i, col in enumerate(cols):
+            values = row[i] or [None] * len(ps)
+            by_col[col] = [(p, values[j]) for j, p in enumerate(ps)]
+    t1 = time.perf_counter()
+    return {
+        "mode": "approx" if approx else "exact",
+        "ps": ps,
+        "time_s": t1 - t0,
+        "by_col": by_col,
+    }
 
 
 def format_value_sql(v: Any) -> str:
@@ -109,8 +562,14 @@ def _select_cols(select_col: str, select_cols: Optional[str]) -> List[str]:
     return out
 
 
-def _auto_pick_cols(con: duckdb.DuckDBPyConnection, table_name: str) -> Tuple[str, str, Any, str]:
-    desc = con.execute(f"DESCRIBE {table_name};").fetchall()
+def _auto_pick_cols(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    profile: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, str, Any, str]:
+    if profile is None:
+        profile = _profile_columns(con, table_name)
+    stats = profile["columns"]
     numeric_types = {
         "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
         "FLOAT", "DOUBLE", "REAL", "DECIMAL",
@@ -118,12 +577,12 @@ def _auto_pick_cols(con: duckdb.DuckDBPyConnection, table_name: str) -> Tuple[st
     date_types = {"DATE", "TIMESTAMP", "TIMESTAMP_TZ", "TIME"}
     text_types = {"VARCHAR", "TEXT"}
 
-    numeric_cols = [c for c, t, *_ in desc if t.upper() in numeric_types]
-    date_cols = [c for c, t, *_ in desc if t.upper() in date_types]
-    text_cols = [c for c, t, *_ in desc if t.upper() in text_types]
-    all_cols = [c for c, *_ in desc]
+    numeric_cols = [c for c, s in stats.items() if s["type"] in numeric_types]
+    date_cols = [c for c, s in stats.items() if s["type"] in date_types]
+    text_cols = [c for c, s in stats.items() if s["type"] in text_types]
+    all_cols = list(stats.keys())
 
-    n_total = con.execute(f"SELECT COUNT(*) FROM {table_name};").fetchone()[0]
+    n_total = profile["rows"]
 
     # Pick filter_col by cardinality and reasonable text length.
     min_ndv = 10
@@ -132,16 +591,13 @@ def _auto_pick_cols(con: duckdb.DuckDBPyConnection, table_name: str) -> Tuple[st
     target_ndv = 1_000
     filter_candidates: List[Tuple[float, str]] = []
     for col in text_cols + numeric_cols + date_cols:
-        qcol = _quote_ident(col)
-        ndv, n = con.execute(
-            f"SELECT COUNT(DISTINCT {qcol}), COUNT(*) FROM {table_name};"
-        ).fetchone()
-        if ndv is None or n is None:
+        ndv = stats[col]["ndv"]
+        if ndv is None:
             continue
         if ndv < min_ndv or ndv > max_ndv:
             continue
         if col in text_cols:
-            avg_len = con.execute(f"SELECT AVG(LENGTH({qcol})) FROM {table_name};").fetchone()[0]
+            avg_len = stats[col].get("avg_len")
             if avg_len is not None and avg_len > max_avg_len:
                 continue
         score = abs((ndv or 0) - target_ndv)
@@ -178,14 +634,9 @@ def _auto_pick_cols(con: duckdb.DuckDBPyConnection, table_name: str) -> Tuple[st
         best_col = None
         best_nn = -1
         for col in candidates:
-            qcol = _quote_ident(col)
-            nn, minv, maxv = con.execute(
-                f"SELECT COUNT({qcol}), MIN({qcol}), MAX({qcol}) FROM {table_name};"
-            ).fetchone()
-            if nn is None or minv is None or maxv is None:
-                continue
-            if maxv == minv:
+            if not _has_range(stats[col]):
                 continue
+            nn = stats[col]["non_null"]
             if nn > best_nn:
                 best_nn = nn
                 best_col = col
@@ -199,48 +650,51 @@ def _auto_pick_cols(con: duckdb.DuckDBPyConnection, table_name: str) -> Tuple[st
     return min_col, filter_col, filter_val, select_col
 
 
-def _auto_select_cols(con: duckdb.DuckDBPyConnection, table_name: str) -> List[str]:
-    desc = con.execute(f"DESCRIBE {table_name};").fetchall()
+def _auto_select_cols(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    profile: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    if profile is None:
+        profile = _profile_columns(con, table_name)
     numeric_types = {
         "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
         "FLOAT", "DOUBLE", "REAL", "DECIMAL",
     }
     date_types = {"DATE", "TIMESTAMP", "TIMESTAMP_TZ", "TIME"}
-    candidates = [c for c, t, *_ in desc if t.upper() in numeric_types or t.upper() in date_types]
     out = []
-    for col in candidates:
-        qcol = _quote_ident(col)
-        nn, minv, maxv = con.execute(
-            f"SELECT COUNT({qcol}), MIN({qcol}), MAX({qcol}) FROM {table_name};"
-        ).fetchone()
-        if nn is None or minv is None or maxv is None:
+    for col, s in profile["columns"].items():
+        if s["type"] not in numeric_types and s["type"] not in date_types:
             continue
-        if maxv == minv:
+        if not _has_range(s):
             continue
         out.append(col)
     return out
 
 
-def _pick_random_access(con: duckdb.DuckDBPyConnection, table_name: str) -> Tuple[Optional[str], Optional[Any]]:
-    desc = con.execute(f"DESCRIBE {table_name};").fetchall()
+def _pick_random_access(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    profile: Optional[Dict[str, Any]] = None,
+) -> Tuple[Optional[str], Optional[Any]]:
+    if profile is None:
+        profile = _profile_columns(con, table_name)
     numeric_types = {
         "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
         "FLOAT", "DOUBLE", "REAL", "DECIMAL",
     }
     date_types = {"DATE", "TIMESTAMP", "TIMESTAMP_TZ", "TIME"}
     text_types = {"VARCHAR", "TEXT"}
-    candidates = [c for c, t, *_ in desc if t.upper() in numeric_types | date_types | text_types]
     best_col = None
     best_ndv = -1
-    for col in candidates:
-        qcol = _quote_ident(col)
-        ndv, nn = con.execute(
-            f"SELECT COUNT(DISTINCT {qcol}), COUNT({qcol}) FROM {table_name};"
-        ).fetchone()
-        if ndv is None or nn is None or nn == 0:
+    for col, s in profile["columns"].items():
+        if s["type"] not in numeric_types | date_types | text_types:
+            continue
+        ndv = s["ndv"]
+        if ndv is None or not s["non_null"]:
             continue
-        if col in text_types:
-            avg_len = con.execute(f"SELECT AVG(LENGTH({qcol})) FROM {table_name};").fetchone()[0]
+        if s["type"] in text_types:
+            avg_len = s.get("avg_len")
             if avg_len is not None and avg_len > 128:
                 continue
         if ndv > best_ndv:
@@ -283,21 +737,96 @@ def _column_type_counts(con: duckdb.DuckDBPyConnection, table_name: str) -> Dict
     return counts
 
 
+def _has_range(stats: Dict[str, Any]) -> bool:
+    if not stats.get("non_null"):
+        return False
+    minv, maxv = stats.get("min"), stats.get("max")
+    return minv is not None and maxv is not None and minv != maxv
+
+
+def _profile_columns(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    approx: bool = False,
+    batch_cols: int = 64,
+) -> Dict[str, Any]:
+    """
+    Profile every column of a table in batched aggregate scans.
+
+    Each scan covers up to `batch_cols` columns and computes NDV, non-null count,
+    min/max (for orderable scalar types) and average text length. With
+    `approx=True`, NDV uses approx_count_distinct (HyperLogLog) instead of an
+    exact COUNT(DISTINCT).
+    """
+    col_types = _describe_types(con, table_name)
+    cols = list(col_types.keys())
+    ndv_fn = "approx_count_distinct({})" if approx else "COUNT(DISTINCT {})"
+    rows = con.execute(f"SELECT COUNT(*) FROM {table_name};").fetchone()[0]
+    stats: Dict[str, Dict[str, Any]] = {}
+    step = batch_cols if batch_cols and batch_cols > 0 else max(len(cols), 1)
+    t0 = time.perf_counter()
+    for i in range(0, len(cols), step):
+        batch = cols[i:i + step]
+        select_parts: List[str] = []
+        layout: List[Tuple[str, List[str]]] = []
+        for col in batch:
+            qcol = _quote_ident(col)
+            bucket = _type_bucket(col_types[col])
+            fields = ["ndv", "non_null"]
+            select_parts.append(ndv_fn.format(qcol))
+            select_parts.append(f"COUNT({qcol})")
+            if bucket in {"numeric", "date", "text", "bool"}:
+                fields += ["min", "max"]
+                select_parts.append(f"MIN({qcol})")
+                select_parts.append(f"MAX({qcol})")
+            if bucket == "text":
+                fields.append("avg_len")
+                select_parts.append(f"AVG(LENGTH({qcol}))")
+            layout.append((col, fields))
+        row = con.execute(f"SELECT {', '.join(select_parts)} FROM {table_name};").fetchone()
+        idx = 0
+        for col, fields in layout:
+            entry: Dict[str, Any] = {
+                "type": col_types[col],
+                "bucket": _type_bucket(col_types[col]),
+                "min": None,
+                "max": None,
+                "avg_len": None,
+            }
+            for field in fields:
+                entry[field] = row[idx]
+                idx += 1
+            if approx and entry["ndv"] is not None:
+                # HyperLogLog can overshoot slightly; never report more distinct values than rows.
+                entry["ndv"] = min(entry["ndv"], entry["non_null"])
+            entry["null_count"] = rows - entry["non_null"]
+            stats[col] = entry
+    t1 = time.perf_counter()
+    return {
+        "mode": "approx" if approx else "exact",
+        "rows": rows,
+        "scans": (len(cols) + step - 1) // step,
+        "time_s": t1 - t0,
+        "columns": stats,
+    }
+
+
 def _ndv_ratio_by_col(
     con: duckdb.DuckDBPyConnection,
     table_name: str,
     rowcount: int,
+    profile: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
-    col_types = _describe_types(con, table_name)
+    if profile is None:
+        profile = _profile_columns(con, table_name)
     out: List[Dict[str, Any]] = []
-    for col, t in col_types.items():
-        qcol = _quote_ident(col)
-        ndv = con.execute(f"SELECT COUNT(DISTINCT {qcol}) FROM {table_name};").fetchone()[0]
+    for col, s in profile["columns"].items():
+        ndv = s["ndv"]
         ratio = (ndv / rowcount) if rowcount else None
         out.append(
             {
                 "col": col,
-                "type": _type_bucket(t),
+                "type": s["bucket"],
                 "ndv": ndv,
                 "ndv_ratio": ratio,
             }
@@ -359,7 +888,7 @@ def _dataset_label(input_path: str) -> str:
     p = Path(input_path)
     name = p.name if p.name else "dataset"
     if p.is_file():
-        name = p.stem
+        name = Path(strip_compression_suffix(p.name)).stem
     return "".join(ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in name)
 
 
@@ -388,7 +917,17 @@ def _row(
         "time_ms_median": qmeta.get("median_ms"),
         "time_ms_p95": qmeta.get("p95_ms"),
         "runs": qmeta.get("runs"),
+        "cv": qmeta.get("cv"),
+        "ci_low_ms": qmeta.get("ci_low_ms"),
+        "ci_high_ms": qmeta.get("ci_high_ms"),
         "result_value": qmeta.get("result_value"),
+        "read_bytes_per_run": qmeta.get("read_bytes_per_run"),
+        "disk_read_bytes_per_run": qmeta.get("disk_read_bytes_per_run"),
+        "cpu_user_s_per_run": qmeta.get("cpu_user_s_per_run"),
+        "cpu_sys_s_per_run": qmeta.get("cpu_sys_s_per_run"),
+        "peak_rss_delta_bytes": qmeta.get("peak_rss_delta_bytes"),
+        "scan_bandwidth_mb_s": qmeta.get("scan_bandwidth_mb_s"),
+        "cpu_s_per_gb": qmeta.get("cpu_s_per_gb"),
     }
     if extras:
         row.update(extras)
@@ -397,24 +936,50 @@ def _row(
 
 def _iter_csv_files(p: Path) -> List[Path]:
     if p.is_dir():
-        return list(p.rglob("*.csv"))
+        return csv_files(str(p))
     return [p]
 
 
-def _count_csv_rows_and_size(input_path: str, has_header: bool) -> Tuple[int, int]:
-    p = Path(input_path)
-    total_lines = 0
-    total_size = 0
-    for f in _iter_csv_files(p):
-        if not f.exists():
-            continue
-        total_size += f.stat().st_size
-        with f.open("rb") as fh:
-            for _ in fh:
-                total_lines += 1
-        if has_header and total_lines > 0:
-            total_lines -= 1
-    return total_lines, total_size
+# Large reads keep newline counting I/O-bound instead of per-line Python overhead.
+_COUNT_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def _count_file_lines(path: Path) -> Tuple[int, int]:
+    """(lines, CSV text bytes); compressed files are decompressed on the fly."""
+    if compression_of(str(path)):
+        stats = measure_decompression(str(path), count_lines=True)
+        return stats["lines"], stats["decompressed_bytes"]
+    lines = 0
+    last = b""
+    with path.open("rb", buffering=0) as fh:
+        while True:
+            chunk = fh.read(_COUNT_CHUNK_BYTES)
+            if not chunk:
+                break
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last and last != b"\n":
+        lines += 1  # final line without a trailing newline
+    return lines, path.stat().st_size
+
+
+def _count_csv_rows_and_size(input_path: str, has_header: bool, max_workers: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Physical line count (minus one header line per file) and total size of a CSV file or directory.
+
+    Files are read in 16 MiB chunks and counted in a thread pool (file reads release the GIL).
+    Compressed files are streamed through their decompressor and count their decompressed size.
+    Quoted fields containing newlines count as extra lines; the ingest-side count
+    (--csv-row-count ingest) does not have that limitation.
+    """
+    files = [f for f in _iter_csv_files(Path(input_path)) if f.exists()]
+    if not files:
+        return 0, 0
+    workers = max(1, min(len(files), max_workers or os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        counts = list(pool.map(_count_file_lines, files))
+    total_lines = sum(max(n - 1, 0) if has_header else n for n, _ in counts)
+    return total_lines, sum(size for _, size in counts)
 
 
 def _markdown_summary(report: Dict[str, Any]) -> str:
@@ -433,6 +998,32 @@ def _markdown_summary(report: Dict[str, Any]) -> str:
             lines.append(f"- Drop note: {note}")
     if ds.get("input_size_bytes") is not None:
         lines.append(f"- Input size: **{_format_mb(ds['input_size_bytes'])} MB**")
+    ingest_files = ds.get("ingest_files")
+    if ingest_files:
+        mb_s = ingest_files.get("throughput_mb_s")
+        lines.append(
+            f"- Ingest: {len(ingest_files.get('files', []))} files on {ingest_files.get('workers')} workers, "
+            f"{ingest_files.get('time_s', 0):.2f}s" + (f", {mb_s:.1f} MB/s" if mb_s else "")
+        )
+        for f in ingest_files.get("files", []):
+            if f.get("rejected_rows"):
+                reasons = ", ".join(f"{r['error_type']}={r['rows']}" for r in f.get("reject_reasons", []))
+                lines.append(
+                    f"  - `{Path(f['file']).name}`: {_format_int(f['rows'])} rows, "
+                    f"{_format_int(f['rejected_rows'])} rejected ({reasons})"
+                )
+    dec = ds.get("decompression")
+    if dec:
+        parts = [f"{dec['codec']} via {dec.get('decompressor') or 'duckdb'} ({dec['method']})"]
+        if dec.get("decompressed_bytes") is not None:
+            parts.append(
+                f"{dec['compressed_bytes'] / (1024 * 1024):.1f} MB -> {dec['decompressed_bytes'] / (1024 * 1024):.1f} MB"
+            )
+        if dec.get("decompress_mb_s"):
+            parts.append(f"decompress {dec['decompress_mb_s']:.1f} MB/s")
+        if dec.get("parse_mb_s"):
+            parts.append(f"parse {dec['parse_mb_s']:.1f} MB/s")
+        lines.append("- Decompression: " + ", ".join(parts))
     type_counts = ds.get("column_type_counts")
     if type_counts:
         parts = []
@@ -524,26 +1115,32 @@ def _markdown_summary(report: Dict[str, Any]) -> str:
             lines.append(
                 f"- full_scan_min median_ms: **{q['full_scan_min']['median_ms']:.2f}** "
                 f"(p95 **{q['full_scan_min']['p95_ms']:.2f}**"
-                f"{_format_cold(q['full_scan_min'])})"
+                f"{_format_cold(q['full_scan_min'])}{_format_ci(q['full_scan_min'])})"
             )
             if "selective_predicate" in q:
                 lines.append(
                     f"- selective_predicate median_ms: **{q['selective_predicate']['median_ms']:.2f}** "
                     f"(p95 **{q['selective_predicate']['p95_ms']:.2f}**"
-                    f"{_format_cold(q['selective_predicate'])})"
+                    f"{_format_cold(q['selective_predicate'])}{_format_ci(q['selective_predicate'])})"
                 )
             if "random_access" in q:
                 lines.append(
                     f"- random_access median_ms: **{q['random_access']['median_ms']:.2f}** "
                     f"(p95 **{q['random_access']['p95_ms']:.2f}**"
-                    f"{_format_cold(q['random_access'])})"
+                    f"{_format_cold(q['random_access'])}{_format_ci(q['random_access'])})"
                 )
             elif "point_lookup" in q:
                 lines.append(
                     f"- random_access median_ms: **{q['point_lookup']['median_ms']:.2f}** "
                     f"(p95 **{q['point_lookup']['p95_ms']:.2f}**"
-                    f"{_format_cold(q['point_lookup'])})"
+                    f"{_format_cold(q['point_lookup'])}{_format_ci(q['point_lookup'])})"
                 )
+            profiled = [k for k in ("full_scan_min", "selective_predicate", "random_access") if (q.get(k) or {}).get("profile")]
+            if profiled:
+                lines.append("- query_profile:")
+                for k in profiled:
+                    lines.append(f"  - {k}:")
+                    lines.extend("  " + line for line in _format_profile(q[k]))
             if body.get("best_select_col"):
                 lines.append(
                     f"- best_select_col: `{body.get('best_select_col')}` "
@@ -607,14 +1204,386 @@ def _markdown_summary(report: Dict[str, Any]) -> str:
         else:
             lines.append(f"- {body.get('note','')}")
         lines.append("")
+    lines.extend(_throughput_section(report))
+    lines.extend(_thread_scaling_section(report))
+    lines.extend(_memory_limit_sweep_section(report))
+    lines.extend(_row_group_sweep_section(report))
+    lines.extend(_layout_sweep_section(report))
+    lines.extend(_variant_sweep_section(report))
+    lines.extend(_vortex_native_section(report))
+    lines.extend(_level_sweep_section(report))
+    lines.extend(_memory_section(report))
     return "\n".join(lines)
 
 
+def _memory_section(report: Dict[str, Any]) -> List[str]:
+    mem = report.get("memory")
+    if not mem:
+        return []
+    lines = ["## Memory by phase", ""]
+    storage = f"database `{mem['db_path']}`" if mem.get("db_path") else "in-memory database"
+    lines.append(
+        f"{storage}, memory_limit {mem.get('memory_limit')}, temp_directory `{mem.get('temp_directory')}`. "
+        "Peak RSS is the process high-water mark while the phase ran; DuckDB memory and spill are at phase end."
+    )
+    lines.append("")
+    lines.append("| phase | time_s | peak_rss_mb | duckdb_mb | spilled_mb |")
+    lines.append("|---|---:|---:|---:|---:|")
+    phases = list(mem.get("phases", {}).items())
+    for fmt, body in report["formats"].items():
+        phases.extend((f"{fmt} {name}", ph) for name, ph in (body.get("memory") or {}).items())
+    for name, ph in phases:
+        lines.append(
+            f"| {name} | {ph['time_s']:.2f} | {_format_mb(ph.get('peak_rss_bytes'))} | "
+            f"{_format_mb(ph.get('duckdb_memory_bytes'))} | {_format_mb(ph.get('duckdb_temp_bytes'))} |"
+        )
+    lines.append("")
+    return lines
+
+
+def _level_sweep_section(report: Dict[str, Any]) -> List[str]:
+    sweep = report.get("compression_level_sweep")
+    if not sweep:
+        return []
+    lines = ["## Parquet compression-level sweep", ""]
+    lines.append(
+        "Pareto front over write time, size and full-read time (all minimized), per codec and writer; "
+        "`*` marks Pareto-optimal levels."
+    )
+    lines.append("")
+    lines.append("| codec-level | writer | size_mb | write_s | full_read_s | selective ms | pareto |")
+    lines.append("|---|---|---:|---:|---:|---:|:---:|")
+
+    def _f(val: Any, digits: int = 3) -> str:
+        return f"{val:.{digits}f}" if isinstance(val, (int, float)) else "n/a"
+
+    for pt in sweep.get("points", []):
+        if pt.get("error"):
+            lines.append(f"| {pt.get('label')} | {pt.get('writer')} | error: {pt['error']} | | | | |")
+            continue
+        q = pt.get("queries_median_ms", {})
+        lines.append(
+            f"| {pt.get('label')} | {pt.get('writer')} | {_format_mb(pt.get('output_size_bytes'))} | "
+            f"{_f(pt.get('compression_time_s'))} | {_f(pt.get('full_read_s'))} | "
+            f"{_f(q.get('selective_predicate'), 2)} | {'*' if pt.get('pareto') else ''} |"
+        )
+    lines.append("")
+    fronts = sweep.get("pareto_fronts") or {}
+    for group, front in fronts.items():
+        if front:
+            lines.append(f"- pareto_front {group}: `{', '.join(front)}`")
+    if any(fronts.values()):
+        lines.append("")
+    return lines
+
+
+def _layout_sweep_section(report: Dict[str, Any]) -> List[str]:
+    sweep = report.get("parquet_layouts")
+    if not sweep:
+        return []
+    lines = [f"## Parquet file layouts (parquet_{sweep.get('codec')})", ""]
+    lines.append(
+        f"Speedups are single-file time / layout time. Full reads run on {sweep.get('threads')} threads and on 1 thread; "
+        "`files read` counts files holding rows that match the selective predicate."
+    )
+    lines.append("")
+    lines.append(
+        "| layout | files | size_mb | vs single | write_s | full_read_s | 1-thread s | parallel x "
+        "| selective ms | selective x | random_access ms | random_access x | files read |"
+    )
+    lines.append("|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|")
+
+    def _f(val: Any, digits: int = 2) -> str:
+        return f"{val:.{digits}f}" if isinstance(val, (int, float)) else "n/a"
+
+    for e in sweep.get("layouts", []):
+        if e.get("error"):
+            lines.append(f"| {e['layout']} | error: {e['error']} | | | | | | | | | | | |")
+            continue
+        q = e.get("queries_median_ms", {})
+        speedup = e.get("query_speedup", {})
+        files = e.get("pruning", {}).get("selective_files")
+        files_read = f"{files['files_matching']}/{files['files']}" if files else "n/a"
+        lines.append(
+            f"| {e['layout']} | {_format_int(e.get('file_count'))} | {_format_mb(e.get('output_size_bytes'))} | "
+            f"{_f(e.get('size_vs_single'), 3)} | {_f(e.get('compression_time_s'), 3)} | {_f(e.get('full_read_s'), 3)} | "
+            f"{_f(e.get('full_read_1t_s'), 3)} | {_f(e.get('parallel_speedup'))} | {_f(q.get('selective_predicate'))} | "
+            f"{_f(speedup.get('selective_predicate'))} | {_f(q.get('random_access'))} | "
+            f"{_f(speedup.get('random_access'))} | {files_read} |"
+        )
+    lines.append("")
+    return lines
+
+
+def _variant_sweep_section(report: Dict[str, Any]) -> List[str]:
+    sweep = report.get("parquet_variants")
+    if not sweep:
+        return []
+    lines = [f"## Parquet lookup variants (parquet_{sweep.get('codec')})", ""]
+    lines.append(
+        "Each variant is compared with its writer's plain file (no bloom filters, no page index): overhead is "
+        "extra bytes over that file, speedups are plain time / variant time. `rg skipped` is row groups ruled "
+        "out by min/max stats + by bloom filters for the random-access value. DuckDB does not read page indexes."
+    )
+    lines.append("")
+    lines.append(
+        "| variant | size_mb | overhead | bloom_mb | bloom columns | selective ms | selective x "
+        "| random_access ms | random_access x | rg skipped |"
+    )
+    lines.append("|---|---:|---:|---:|---|---:|---:|---:|---:|---:|")
+
+    def _f(val: Any, digits: int = 2) -> str:
+        return f"{val:.{digits}f}" if isinstance(val, (int, float)) else "n/a"
+
+    for e in sweep.get("variants", []):
+        if e.get("error"):
+            lines.append(f"| {e['variant']} | error: {e['error']} | | | | | | | | |")
+            continue
+        q = e.get("queries_median_ms", {})
+        speedup = e.get("query_speedup", {})
+        pruning = e.get("pruning", {})
+        stats = pruning.get("random_access") or {}
+        bloom = pruning.get("random_access_bloom") or {}
+        skipped = (
+            f"{stats.get('pruned_row_groups')} + {bloom.get('excluded_row_groups')} / {stats.get('row_groups')}"
+            if stats.get("row_groups") is not None
+            else "n/a"
+        )
+        overhead = e.get("size_overhead")
+        lines.append(
+            f"| {e['variant']} | {_format_mb(e.get('output_size_bytes'))} | "
+            f"{f'{overhead:+.1%}' if isinstance(overhead, float) else 'n/a'} | {_format_mb(e.get('bloom_filter_bytes'))} | "
+            f"{', '.join(e.get('bloom_filter_columns') or []) or '-'} | {_f(q.get('selective_predicate'))} | "
+            f"{_f(speedup.get('selective_predicate'))} | {_f(q.get('random_access'))} | "
+            f"{_f(speedup.get('random_access'))} | {skipped} |"
+        )
+    lines.append("")
+    return lines
+
+
+def _vortex_native_section(report: Dict[str, Any]) -> List[str]:
+    native = report.get("vortex_native")
+    if not native:
+        return []
+    lines = ["## Vortex: native Python scans vs DuckDB extension", ""]
+    if not native.get("available"):
+        lines.extend([f"- {native.get('error')}", ""])
+        return lines
+    lines.append(
+        f"vortex {native.get('vortex')}. Native scans push projection and filter into Vortex and return Arrow; "
+        "the extension runs the same query over `read_vortex()` on the same file, also fetched as Arrow. "
+        "Overhead is extension ms / native ms."
+    )
+    if native.get("extension_error"):
+        lines.append(f"DuckDB Vortex extension unavailable ({native['extension_error']}); native timings only.")
+    lines.append("")
+
+    def _f(val: Any, digits: int = 2) -> str:
+        return f"{val:.{digits}f}" if isinstance(val, (int, float)) else "n/a"
+
+    lines.append("| strategy | size_mb | vs default | compression_ratio | write_s |")
+    lines.append("|---|---:|---:|---:|---:|")
+    for e in native.get("strategies", []):
+        if e.get("error"):
+            lines.append(f"| {e['strategy']} | error: {e['error']} | | | |")
+            continue
+        lines.append(
+            f"| {e['strategy']} | {_format_mb(e.get('output_size_bytes'))} | {_f(e.get('size_vs_default'), 3)} | "
+            f"{_f(e.get('compression_ratio'))} | {_f(e.get('compression_time_s'), 3)} |"
+        )
+    lines.append("")
+    lines.append("| strategy | query | native ms | extension ms | overhead | matches base |")
+    lines.append("|---|---|---:|---:|---:|:---:|")
+    for e in native.get("strategies", []):
+        for name, nat in (e.get("native") or {}).items():
+            ext = (e.get("extension") or {}).get(name) or {}
+            match = (e.get("results_match") or {}).get(name)
+            lines.append(
+                f"| {e['strategy']} | {name} | {_f(nat.get('median_ms'))} | {_f(ext.get('median_ms'))} | "
+                f"{_f((e.get('extension_overhead') or {}).get(name))} | {'yes' if match else 'NO'} |"
+            )
+    lines.append("")
+    return lines
+
+
+def _row_group_sweep_section(report: Dict[str, Any]) -> List[str]:
+    sweep = report.get("row_group_sweep")
+    if not sweep:
+        return []
+    lines = ["## Parquet row-group size sweep", ""]
+
+    def _ms(val: Any) -> str:
+        return f"{val:.2f}" if isinstance(val, (int, float)) else "n/a"
+
+    def _pruned(p: Optional[Dict[str, Any]]) -> str:
+        if not p or p.get("row_groups") is None:
+            return "n/a"
+        return f"{p.get('pruned_row_groups')}/{p.get('row_groups')}"
+
+    for codec, entries in sweep.get("by_codec", {}).items():
+        lines.append(f"### parquet_{codec}")
+        lines.append(
+            "| row_group_size | row groups | size_mb | write_s | full_scan ms | selective ms | random_access ms "
+            "| pruned (selective) | pruned (random) |"
+        )
+        lines.append("|---:|---:|---:|---:|---:|---:|---:|---:|---:|")
+        for e in entries:
+            q = e.get("queries_median_ms", {})
+            pr = e.get("pruning", {})
+            lines.append(
+                f"| {_format_int(e.get('row_group_size'))} | {_format_int(e.get('row_group_count'))} | "
+                f"{_format_mb(e.get('output_size_bytes'))} | {_ms(e.get('compression_time_s'))} | "
+                f"{_ms(q.get('full_scan_min'))} | {_ms(q.get('selective_predicate'))} | {_ms(q.get('random_access'))} | "
+                f"{_pruned(pr.get('selective_predicate'))} | {_pruned(pr.get('random_access'))} |"
+            )
+        lines.append("")
+    rec = sweep.get("recommendation")
+    if rec:
+        lines.append(
+            f"- recommended row_group_size: **{_format_int(rec.get('row_group_size'))}** ({rec.get('reason')})"
+        )
+        lines.append("")
+    return lines
+
+
+def _memory_limit_sweep_section(report: Dict[str, Any]) -> List[str]:
+    bodies = [
+        (name, body["memory_limit_sweep"]) for name, body in report["formats"].items() if body.get("memory_limit_sweep")
+    ]
+    if not bodies:
+        return []
+    lines = ["## Memory-limit sweep", ""]
+    lines.append(
+        "Workload plus a full materialization re-run per DuckDB memory_limit. Slowdown is relative to the largest "
+        "limit; peak_spill is the most temp storage DuckDB held during any one query."
+    )
+    lines.append("")
+    lines.append("| format | memory_limit | geomean ms | slowdown | peak_spill_mb | ok | oom | errors |")
+    lines.append("|---|---:|---:|---:|---:|---:|---:|---:|")
+
+    def _f(val: Any, digits: int = 2) -> str:
+        return f"{val:.{digits}f}" if isinstance(val, (int, float)) else "n/a"
+
+    for name, sweep in bodies:
+        for o in sweep.get("overall", []):
+            lines.append(
+                f"| {name} | {o.get('limit')} | {_f(o.get('median_ms'))} | {_f(o.get('slowdown'))}x | "
+                f"{_format_mb(o.get('peak_spill_bytes'))} | {o.get('ok')} | {o.get('oom')} | {o.get('errors')} |"
+            )
+    lines.append("")
+    for name, sweep in bodies:
+        degraded = sweep.get("degraded_at")
+        oom = sweep.get("first_oom_at")
+        lines.append(
+            f"- {name}: "
+            + (f"degrades at **{degraded}**" if degraded else "no degradation within the tested limits")
+            + (f", first OOM at **{oom}**" if oom else "")
+        )
+    lines.append("")
+    return lines
+
+
+def _thread_scaling_section(report: Dict[str, Any]) -> List[str]:
+    bodies = [(name, body["thread_scaling"]) for name, body in report["formats"].items() if body.get("thread_scaling")]
+    if not bodies:
+        return []
+    lines = ["## Thread scaling", ""]
+    lines.append("Cells: geomean median ms / speedup vs. the smallest thread count / parallel efficiency.")
+    lines.append("")
+    for name, sweep in bodies:
+        threads = sweep.get("threads", [])
+        lines.append(f"### {name}")
+        lines.append("| query family | " + " | ".join(f"{t} threads" for t in threads) + " |")
+        lines.append("|---|" + "---:|" * len(threads))
+        rows = list(sweep.get("families", {}).items()) + [("overall", sweep.get("overall", {}))]
+        for family, curves in rows:
+            cells = []
+            for ms, sp, eff in zip(curves.get("median_ms", []), curves.get("speedup", []), curves.get("efficiency", [])):
+                if ms is None or sp is None or eff is None:
+                    cells.append("n/a")
+                else:
+                    cells.append(f"{ms:.2f} / {sp:.2f}x / {eff * 100:.0f}%")
+            label = f"**{family}**" if family == "overall" else family
+            lines.append(f"| {label} | " + " | ".join(cells) + " |")
+        lines.append("")
+    return lines
+
+
+def _throughput_section(report: Dict[str, Any]) -> List[str]:
+    bodies = [(name, body["throughput"]) for name, body in report["formats"].items() if body.get("throughput")]
+    if not bodies:
+        return []
+    lines = ["## Throughput (concurrent clients)", ""]
+    duration = bodies[0][1].get("duration_s")
+    lines.append(f"Each client count replays the workload for {duration}s; latencies are under load.")
+    lines.append("")
+    lines.append("| format | clients | QPS | p50 ms | p95 ms | p99 ms | efficiency | errors |")
+    lines.append("|---|---:|---:|---:|---:|---:|---:|---:|")
+
+    def _f(val: Any, digits: int = 2) -> str:
+        return f"{val:.{digits}f}" if isinstance(val, (int, float)) else "n/a"
+
+    for name, tp in bodies:
+        for level in tp.get("levels", []):
+            lines.append(
+                f"| {name} | {level.get('clients')} | {_f(level.get('qps'), 1)} | {_f(level.get('p50_ms'))} | "
+                f"{_f(level.get('p95_ms'))} | {_f(level.get('p99_ms'))} | {_f(level.get('scaling_efficiency'))} | "
+                f"{level.get('errors', 0)} |"
+            )
+    lines.append("")
+    for name, tp in bodies:
+        sat = tp.get("saturation_clients")
+        sat_s = f"saturates at {sat} clients" if sat is not None else "no saturation within the tested range"
+        lines.append(f"- {name}: peak QPS **{_f(tp.get('peak_qps'), 1)}**, {sat_s}")
+    lines.append("")
+    return lines
+
+
 def _null_count(con: duckdb.DuckDBPyConnection, from_expr: str, col: str) -> int:
     qcol = _quote_ident(col)
     return con.execute(f"SELECT COUNT(*) FROM {from_expr} WHERE {qcol} IS NULL;").fetchone()[0]
 
 
+def _validation_counts(
+    con: duckdb.DuckDBPyConnection,
+    from_expr: str,
+    min_col: str,
+    filter_col: str,
+    filter_val_sql: str,
+    min_col_expr: Optional[str] = None,
+) -> Dict[str, Any]:
+    min_expr = min_col_expr or _quote_ident(min_col)
+    return {
+        "count": con.execute(f"SELECT COUNT(*) FROM {from_expr};").fetchone()[0],
+        "min": con.execute(f"SELECT min({min_expr}) FROM {from_expr};").fetchone()[0],
+        "nulls_min_col": _null_count(con, from_expr, min_col),
+        "nulls_filter_col": _null_count(con, from_expr, filter_col),
+        "filtered_count": con.execute(
+            f"SELECT COUNT(*) FROM {from_expr} WHERE {_quote_ident(filter_col)} = {filter_val_sql};"
+        ).fetchone()[0],
+    }
+
+
+def _validation_report(base: Dict[str, Any], fmt: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "base_count": base["count"],
+        "format_count": fmt["count"],
+        "base_min": base["min"],
+        "format_min": fmt["min"],
+        "count_match": base["count"] == fmt["count"],
+        "min_match": base["min"] == fmt["min"],
+        "base_filtered_count": base["filtered_count"],
+        "format_filtered_count": fmt["filtered_count"],
+        "filtered_count_match": base["filtered_count"] == fmt["filtered_count"],
+        "base_nulls_min_col": base["nulls_min_col"],
+        "format_nulls_min_col": fmt["nulls_min_col"],
+        "min_nulls_match": base["nulls_min_col"] == fmt["nulls_min_col"],
+        "base_nulls_filter_col": base["nulls_filter_col"],
+        "format_nulls_filter_col": fmt["nulls_filter_col"],
+        "filter_nulls_match": base["nulls_filter_col"] == fmt["nulls_filter_col"],
+    }
+
+
 def _recommendations(report: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
     best_storage = None
     best_storage_ratio = None
@@ -713,10 +1682,46 @@ def _format_mb(val: Any) -> str:
 def _format_cold(qmeta: Dict[str, Any]) -> str:
     cold_ms = qmeta.get("cold_ms")
     if cold_ms is None:
-        return ""
+        return f", cold failed ({qmeta['cold_error']})" if qmeta.get("cold_error") else ""
     return f", cold **{cold_ms:.2f}**"
 
 
+def _format_ci(qmeta: Dict[str, Any]) -> str:
+    lo, hi = qmeta.get("ci_low_ms"), qmeta.get("ci_high_ms")
+    if lo is None or hi is None:
+        return ""
+    conf = int(round((qmeta.get("ci_confidence") or 0.95) * 100))
+    return f", {conf}% CI [{lo:.2f}, {hi:.2f}], n={qmeta.get('runs')}"
+
+
+def _format_profile(qmeta: Dict[str, Any]) -> List[str]:
+    prof = qmeta.get("profile")
+    if not prof or prof.get("error"):
+        return []
+    out = []
+    top = sorted(
+        [op for op in prof.get("operators", []) if op.get("timing_ms") is not None],
+        key=lambda op: op["timing_ms"],
+        reverse=True,
+    )[:3]
+    if top:
+        out.append("  - top operators: " + ", ".join(f"{op['name']} {op['timing_ms']:.2f}ms" for op in top))
+    if prof.get("metadata_only"):
+        out.append("  - answered from metadata (no storage scan)")
+    for scan in prof.get("scans", []):
+        pruned = scan.get("pruned_fraction")
+        pruned_s = f"{pruned * 100:.1f}%" if pruned is not None else "n/a"
+        scanned = scan.get("rows_scanned")
+        scanned_s = _format_int(scanned) if scanned is not None else "n/a"
+        filters = scan.get("filters")
+        pushdown_s = f"pushdown `{filters}`" if filters else "no pushdown"
+        out.append(
+            f"  - {scan.get('name')}: scanned {scanned_s} -> emitted {_format_int(scan.get('rows_emitted'))}, "
+            f"pruned {pruned_s}, {pushdown_s}"
+        )
+    return out
+
+
 _LIKE_ESCAPE_CHAR = "!"
 
 
@@ -729,6 +1734,31 @@ def _string_columns(con: duckdb.DuckDBPyConnection, table_name: str) -> List[str
     return [c for c, t in col_types.items() if t in {"VARCHAR", "TEXT"}]
 
 
+def _like_match_counts(
+    con: duckdb.DuckDBPyConnection,
+    from_expr: str,
+    col: str,
+    patterns: List[str],
+    batch_size: int = 64,
+) -> Dict[str, int]:
+    """Count matches for many LIKE patterns with one FILTER aggregate per pattern, batch_size per scan."""
+    qcol = _quote_ident(col)
+    out: Dict[str, int] = {}
+    step = batch_size if batch_size and batch_size > 0 else max(len(patterns), 1)
+    for i in range(0, len(patterns), step):
+        batch = patterns[i:i + step]
+        select_expr = ", ".join(
+            [
+                f"COUNT(*) FILTER (WHERE {qcol} LIKE {format_value_sql(pattern)} ESCAPE '{_LIKE_ESCAPE_CHAR}')"
+                for pattern in batch
+            ]
+        )
+        row = con.execute(f"SELECT {select_expr} FROM {from_expr};").fetchone()
+        for pattern, cnt in zip(batch, row):
+            out[pattern] = cnt
+    return out
+
+
 def _like_pattern_specs_for_col(
     con: duckdb.DuckDBPyConnection,
     table_name: str,
@@ -737,6 +1767,7 @@ def _like_pattern_specs_for_col(
     total_rows: int,
     max_candidates: int = 50,
     pattern_len: int = 3,
+    batch_size: int = 64,
 ) -> List[Dict[str, Any]]:
     if total_rows <= 0:
         return []
@@ -768,20 +1799,15 @@ def _like_pattern_specs_for_col(
         if not mid.endswith(_LIKE_ESCAPE_CHAR):
             patterns_by_type["contains"].add("%" + mid + "%")
 
+    candidates_by_type = {t: sorted(patterns)[:max_candidates] for t, patterns in patterns_by_type.items()}
+    all_patterns = sorted({p for patterns in candidates_by_type.values() for p in patterns})
+    counts = _like_match_counts(con, table_name, col, all_patterns, batch_size=batch_size)
+
     specs_map: Dict[Tuple[str, str], Dict[str, Any]] = {}
-    for pattern_type, patterns in patterns_by_type.items():
+    for pattern_type, patterns in candidates_by_type.items():
         if not patterns:
             continue
-        candidates = []
-        for pattern in list(patterns)[:max_candidates]:
-            pattern_sql = format_value_sql(pattern)
-            cnt = con.execute(
-                f"SELECT COUNT(*) FROM {table_name} WHERE {qcol} LIKE {pattern_sql} ESCAPE '!';"
-            ).fetchone()[0]
-            sel = (cnt / total_rows) if total_rows else 0.0
-            candidates.append((pattern, sel))
-        if not candidates:
-            continue
+        candidates = [(pattern, counts[pattern] / total_rows) for pattern in patterns]
         for target in targets:
             best = min(candidates, key=lambda x: abs(x[1] - target))
             key = (pattern_type, best[0])
@@ -791,6 +1817,7 @@ def _like_pattern_specs_for_col(
                     "pattern_type": pattern_type,
                     "pattern": best[0],
                     "target_selectivities": [],
+                    "calibrated_selectivity": best[1],
                 }
                 specs_map[key] = entry
             entry["target_selectivities"].append(target)
@@ -804,20 +1831,54 @@ def _like_pattern_specs_by_col(
     total_rows: int,
     max_candidates: int = 50,
     pattern_len: int = 3,
+    sample_rows: Optional[int] = None,
+    batch_size: int = 64,
 ) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Pick LIKE patterns per text column whose selectivity is closest to each target.
+
+    With sample_rows set (and smaller than the table), candidates are calibrated on a
+    reservoir sample and only the chosen patterns are recounted on the full table.
+    calibrated_selectivity is the selectivity on the calibration table (the sample, or
+    the full table without one); actual_selectivity is always the full-table count.
+    """
+    text_cols = _string_columns(con, table_name)
+    calib_table = table_name
+    calib_rows = total_rows
+    sampled = bool(sample_rows) and 0 < sample_rows < total_rows
+    if sampled and text_cols:
+        calib_table = "like_calibration_sample"
+        cols_sql = ", ".join(_quote_ident(c) for c in text_cols)
+        con.execute(
+            f"CREATE OR REPLACE TEMP TABLE {calib_table} AS SELECT {cols_sql} FROM {table_name} "
+            f"USING SAMPLE reservoir({int(sample_rows)} ROWS) REPEATABLE (42);"
+        )
+        calib_rows = con.execute(f"SELECT COUNT(*) FROM {calib_table};").fetchone()[0]
+
     out: Dict[str, List[Dict[str, Any]]] = {}
-    for col in _string_columns(con, table_name):
+    for col in text_cols:
         specs = _like_pattern_specs_for_col(
             con,
-            table_name,
+            calib_table,
             col,
             targets,
-            total_rows,
+            calib_rows,
             max_candidates=max_candidates,
             pattern_len=pattern_len,
+            batch_size=batch_size,
         )
+        if specs and sampled:
+            exact = _like_match_counts(con, table_name, col, [s["pattern"] for s in specs], batch_size=batch_size)
+            for spec in specs:
+                spec["calibration_sample_rows"] = calib_rows
+                spec["actual_selectivity"] = (exact[spec["pattern"]] / total_rows) if total_rows else None
+        else:
+            for spec in specs:
+                spec["actual_selectivity"] = spec["calibrated_selectivity"]
         if specs:
             out[col] = specs
+    if sampled and text_cols:
+        con.execute(f"DROP TABLE IF EXISTS {calib_table};")
     return out
 
 
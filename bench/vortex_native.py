@@ -0,0 +1,163 @@
+# bench/vortex_native.py
+"""Native Vortex comparison.
+
+Writes the base table once per Vortex write strategy with the vortex Python
+package (backends/vortex_native_backend), then times the workload's point and
+scan queries two ways on the same file:
+
+  native     vortex scan with projection/filter pushdown into an Arrow table
+  extension  the equivalent SQL over DuckDB's read_vortex(), fetched as Arrow
+
+Both paths end in an Arrow table, so extension_overhead (extension / native
+median) is what the DuckDB integration adds on top of the format itself. Every
+result is checked against the same query on the base table.
+"""
+from __future__ import annotations
+
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import duckdb
+
+from backends import vortex_backend, vortex_native_backend as native
+from utils_run import _describe_types, _quote_ident, format_value_sql
+
+# (name, native scan of a dataset, SQL template over {scan}, result of that SQL's Arrow table)
+_Query = Tuple[str, Callable[[Any], Any], str, Callable[[Any], Any]]
+
+
+def _median_ms(fn: Callable[[], Any], repeats: int, warmup: int) -> Dict[str, Any]:
+    for _ in range(warmup):
+        fn()
+    times_ms: List[float] = []
+    result = None
+    for _ in range(max(1, repeats)):
+        t0 = time.perf_counter()
+        result = fn()
+        times_ms.append((time.perf_counter() - t0) * 1000.0)
+    return {"median_ms": statistics.median(times_ms), "runs": len(times_ms), "result": result}
+
+
+def _typed_value(con: duckdb.DuckDBPyConnection, value_sql: str, col_type: str) -> Any:
+    """The Python value of a SQL literal cast to the column type, for Arrow filter expressions."""
+    return con.execute(f"SELECT CAST({value_sql} AS {col_type})").fetchone()[0]
+
+
+def _first_value(table: Any) -> Any:
+    return table.column(0)[0].as_py() if table.num_rows else None
+
+
+def _num_rows(table: Any) -> int:
+    return table.num_rows
+
+
+def _queries(con: duckdb.DuckDBPyConnection, rc) -> List[_Query]:
+    ctx = rc.workload_ctx
+    col_types = _describe_types(con, rc.table)
+    min_col = ctx.min_col
+    min_sql = _quote_ident(min_col)
+    filter_value = _typed_value(con, rc.filter_val_sql, col_types[ctx.filter_col])
+    queries: List[_Query] = [
+        (
+            "full_scan_min",
+            lambda ds: native.column_min(native.scan(ds, [min_col]), min_col),
+            f"SELECT min({min_sql}) FROM {{scan}}",
+            _first_value,
+        ),
+        (
+            "selective_predicate",
+            lambda ds: native.column_min(
+                native.scan(ds, [min_col], native.equals(ctx.filter_col, filter_value)), min_col
+            ),
+            f"SELECT min({min_sql}) FROM {{scan}} WHERE {_quote_ident(ctx.filter_col)} = {rc.filter_val_sql}",
+            _first_value,
+        ),
+    ]
+    if ctx.random_access_col and ctx.random_access_col in col_types:
+        ra_sql = format_value_sql(ctx.random_access_val)
+        ra_value = _typed_value(con, ra_sql, col_types[ctx.random_access_col])
+        queries.append((
+            "random_access",
+            lambda ds: native.scan(ds, filter=native.equals(ctx.random_access_col, ra_value), limit=1).num_rows,
+            f"SELECT * FROM {{scan}} WHERE {_quote_ident(ctx.random_access_col)} = {ra_sql} LIMIT 1",
+            _num_rows,
+        ))
+    queries.append(("full_read", lambda ds: native.scan(ds).num_rows, "SELECT * FROM {scan}", _num_rows))
+    return queries
+
+
+def _extension_scan(con: duckdb.DuckDBPyConnection) -> Optional[str]:
+    """Load DuckDB's Vortex extension; None (with the reason) when it is unavailable."""
+    try:
+        vortex_backend._ensure_vortex_loaded(con)
+    except duckdb.Error as exc:
+        return str(exc).splitlines()[0]
+    return None
+
+
+def run_vortex_native(con: duckdb.DuckDBPyConnection, rc, strategies: List[str]) -> Dict[str, Any]:
+    """
+    Write and measure one Vortex file per strategy.
+
+    Each entry records the write (size, time, compression_ratio), per-query native and
+    extension medians with their results, extension_overhead per query and whether
+    each result matches the base table. size_vs_default compares with the default
+    strategy. Files are deleted afterwards.
+    """
+    args = rc.args
+    if not native.available():
+        return {"available": False, "error": "vortex Python package not installed (pip install vortex-data)"}
+    queries = _queries(con, rc)
+    expected = {
+        name: result_of(con.execute(sql.replace("{scan}", rc.table)).to_arrow_table())
+        for name, _, sql, result_of in queries
+    }
+    extension_error = _extension_scan(con)
+    entries: List[Dict[str, Any]] = []
+    for strategy in strategies:
+        out = Path(rc.out_dir) / f"vortex_native_{strategy}_{rc.run_tag}.vortex"
+        entry: Dict[str, Any] = {"strategy": strategy}
+        try:
+            meta = native.write(con, rc.source_table, str(out), {"strategy": strategy})
+            entry["write"] = meta
+            entry["output_size_bytes"] = meta["output_size_bytes"]
+            entry["compression_time_s"] = meta["compression_time_s"]
+            entry["compression_ratio"] = (
+                rc.input_size_bytes / meta["output_size_bytes"]
+                if rc.input_size_bytes and meta["output_size_bytes"]
+                else None
+            )
+            dataset = native.open_dataset(meta["vortex_path"])
+            scan = vortex_backend.scan_expr(meta["vortex_path"])
+            entry["native"], entry["extension"], entry["extension_overhead"], entry["results_match"] = {}, {}, {}, {}
+            for name, run_native, sql, result_of in queries:
+                nat = _median_ms(lambda: run_native(dataset), args.repeats, args.warmup)
+                entry["native"][name] = nat
+                entry["results_match"][name] = nat["result"] == expected[name]
+                if extension_error is not None:
+                    continue
+                bound = sql.replace("{scan}", scan)
+                ext = _median_ms(lambda: result_of(con.execute(bound).to_arrow_table()), args.repeats, args.warmup)
+                entry["extension"][name] = ext
+                entry["extension_overhead"][name] = (
+                    ext["median_ms"] / nat["median_ms"] if nat["median_ms"] else None
+                )
+        except Exception as exc:  # the vortex package raises its own error types
+            entry["error"] = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+        finally:
+            out.unlink(missing_ok=True)
+        entries.append(entry)
+
+    default = next((e for e in entries if e["strategy"] == "default" and not e.get("error")), None)
+    for e in entries:
+        if default is not None and e.get("output_size_bytes"):
+            e["size_vs_default"] = e["output_size_bytes"] / default["output_size_bytes"]
+    return {
+        "available": True,
+        **native.get_version_info(),
+        "extension_error": extension_error,
+        "expected": expected,
+        "strategies": entries,
+    }
@@ -0,0 +1,265 @@
+# bench/workload.py
+"""Declarative query workloads.
+
+A workload file (JSON, or YAML when PyYAML is installed) lists query templates.
+Each template is bound to a ScanBinding (the FROM expression and column
+expressions a backend provides) and executed the same way for every format,
+producing the per-format `queries` section of the report and the CSV rows.
+
+Template placeholders:
+  {scan}               FROM expression of the format
+  {min_col}            aggregate column (numeric expression for the format)
+  {filter_col}         equality filter column, {filter_val} its SQL literal
+  {random_access_col}  point-lookup column, {random_access_val} its SQL literal
+  {select_col}         selectivity column, {threshold} its SQL literal   (kind: selectivity)
+  {like_col}           text column, {pattern} the LIKE pattern literal   (kind: like)
+
+Kinds:
+  scalar       one timing stored under queries[report_key]
+  selectivity  one timing per select column and threshold -> queries[report_key][col]
+  like         one timing per text column and calibrated pattern -> queries[report_key][col]
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from utils_run import _quote_ident, _row, format_value_sql
+
+DEFAULT_WORKLOAD = Path(__file__).parent / "workloads" / "default.json"
+
+_KINDS = {"scalar", "selectivity", "like"}
+# CSV rows are written grouped by kind in this order (the pre-workload run.py layout),
+# whatever order the templates are timed in.
+_CSV_KIND_ORDER = ("selectivity", "scalar", "like")
+_CONTEXT_FIELDS = {"random_access_col", "random_access_val", "select_cols", "like_specs_by_col"}
+
+
+@dataclass
+class ScanBinding:
+    fmt: str                 # CSV "format" column: duckdb, parquet, vortex
+    variant: str             # report["formats"] key, e.g. parquet_zstd
+    scan: str                # FROM expression
+    write_meta: Dict[str, Any]
+    filter_val_sql: str
+    # Per-column expression overrides for {min_col}/{select_col}, e.g. TRY_CAST for Vortex.
+    numeric_exprs: Dict[str, str] = field(default_factory=dict)
+    # Restrict LIKE columns to these (None = all calibrated columns).
+    text_cols: Optional[Set[str]] = None
+
+    def numeric_expr(self, col: str) -> str:
+        return self.numeric_exprs.get(col, _quote_ident(col))
+
+
+@dataclass
+class WorkloadContext:
+    min_col: str
+    filter_col: str
+    random_access_col: Optional[str]
+    random_access_val: Any
+    select_cols: List[str]
+    thresholds_by_col: Dict[str, List[Any]]
+    like_specs_by_col: Dict[str, List[Dict[str, Any]]]
+    rowcount: int
+
+
+@dataclass
+class BoundQuery:
+    template: Dict[str, Any]
+    sql: str
+    selectivity: Optional[float] = None
+    select_col: Optional[str] = None
+    threshold: Any = None
+    spec: Optional[Dict[str, Any]] = None
+
+    @property
+    def kind(self) -> str:
+        return self.template["kind"]
+
+    @property
+    def name(self) -> str:
+        return self.template["name"]
+
+    @property
+    def report_key(self) -> str:
+        return self.template.get("report_key") or self.template["name"]
+
+
+def load_workload(path: Optional[str] = None) -> Dict[str, Any]:
+    p = Path(path) if path else DEFAULT_WORKLOAD
+    text = p.read_text(encoding="utf-8")
+    if p.suffix.lower() in {".yaml", ".yml"}:
+        try:
+            import yaml
+        except Exception as exc:
+            raise SystemExit(f"YAML workload {p} requires PyYAML: {exc}")
+        workload = yaml.safe_load(text)
+    else:
+        workload = json.loads(text)
+    queries = workload.get("queries") if isinstance(workload, dict) else None
+    if not queries:
+        raise SystemExit(f"Workload {p} defines no queries")
+    seen = set()
+    for q in queries:
+        name = q.get("name")
+        if not name or not q.get("sql"):
+            raise SystemExit(f"Workload {p}: every query needs a name and sql")
+        q.setdefault("kind", "scalar")
+        if q["kind"] not in _KINDS:
+            raise SystemExit(f"Workload {p}: query '{name}' has unknown kind '{q['kind']}'")
+        unknown = set(q.get("requires", [])) - _CONTEXT_FIELDS
+        if unknown:
+            raise SystemExit(f"Workload {p}: query '{name}' requires unknown fields {sorted(unknown)}")
+        key = q.get("report_key") or name
+        if key in seen:
+            raise SystemExit(f"Workload {p}: duplicate report key '{key}'")
+        seen.add(key)
+    return workload
+
+
+def _requirements_met(template: Dict[str, Any], ctx: WorkloadContext) -> bool:
+    for req in template.get("requires", []):
+        val = getattr(ctx, req)
+        if val is None or (isinstance(val, (list, dict)) and not val):
+            return False
+    return True
+
+
+def bind_workload(workload: Dict[str, Any], binding: ScanBinding, ctx: WorkloadContext) -> List[BoundQuery]:
+    """Expand every template into concrete SQL for one format."""
+    base = {
+        "scan": binding.scan,
+        "min_col": binding.numeric_expr(ctx.min_col),
+        "filter_col": _quote_ident(ctx.filter_col),
+        "filter_val": binding.filter_val_sql,
+        "random_access_col": _quote_ident(ctx.random_access_col) if ctx.random_access_col else "NULL",
+        "random_access_val": format_value_sql(ctx.random_access_val),
+    }
+    bound: List[BoundQuery] = []
+    for template in workload["queries"]:
+        if not _requirements_met(template, ctx):
+            continue
+        kind = template["kind"]
+        sql = template["sql"]
+        if kind == "scalar":
+            bound.append(BoundQuery(template, sql.format(**base)))
+        elif kind == "selectivity":
+            for sel_col in ctx.select_cols:
+                for p, thr in ctx.thresholds_by_col.get(sel_col, []):
+                    bound.append(
+                        BoundQuery(
+                            template,
+                            sql.format(**base, select_col=binding.numeric_expr(sel_col), threshold=format_value_sql(thr)),
+                            selectivity=p,
+                            select_col=sel_col,
+                            threshold=thr,
+                        )
+                    )
+        elif kind == "like":
+            for col, specs in ctx.like_specs_by_col.items():
+                if binding.text_cols is not None and col not in binding.text_cols:
+                    continue
+                for spec in specs:
+                    bound.append(
+                        BoundQuery(
+                            template,
+                            sql.format(**base, like_col=_quote_ident(col), pattern=format_value_sql(spec["pattern"])),
+                            select_col=col,
+                            spec=spec,
+                        )
+                    )
+    return bound
+
+
+def run_workload(
+    workload: Dict[str, Any],
+    binding: ScanBinding,
+    ctx: WorkloadContext,
+    time_fn: Callable[[str], Dict[str, Any]],
+    args,
+    rows_csv: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Time every bound query for one format.
+
+    Returns the report body fields (queries, best_select_col, ...) and appends one CSV
+    row per timing to rows_csv: selectivity rows first, then scalar, then LIKE rows,
+    each group in template order.
+    """
+    queries: Dict[str, Any] = {}
+    for template in workload["queries"]:
+        key = template.get("report_key") or template["name"]
+        queries[key] = None if template["kind"] == "scalar" else {}
+    rows_by_kind: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in _CSV_KIND_ORDER}
+
+    for bq in bind_workload(workload, binding, ctx):
+        m = time_fn(bq.sql)
+        if bq.kind == "scalar":
+            queries[bq.report_key] = m
+            rows_by_kind["scalar"].append(_row(args, binding.fmt, binding.variant, bq.name, None, binding.write_meta, m))
+        elif bq.kind == "selectivity":
+            queries[bq.report_key].setdefault(bq.select_col, []).append({"p": bq.selectivity, "threshold": bq.threshold, **m})
+            rows_by_kind["selectivity"].append(
+                _row(
+                    args,
+                    binding.fmt,
+                    binding.variant,
+                    bq.name,
+                    bq.selectivity,
+                    binding.write_meta,
+                    m,
+                    select_col=bq.select_col,
+                )
+            )
+        elif bq.kind == "like":
+            spec = bq.spec or {}
+            match_count = m.get("result_value")
+            sel = (match_count / ctx.rowcount) if ctx.rowcount else None
+            item = {**spec, "match_count": match_count, "selectivity": sel, **m}
+            queries[bq.report_key].setdefault(bq.select_col, []).append(item)
+            targets = spec.get("target_selectivities")
+            targets_str = ",".join([str(t) for t in targets]) if isinstance(targets, list) else None
+            rows_by_kind["like"].append(
+                _row(
+                    args,
+                    binding.fmt,
+                    binding.variant,
+                    bq.name,
+                    sel,
+                    binding.write_meta,
+                    m,
+                    select_col=bq.select_col,
+                    extras={
+                        "pattern_type": spec.get("pattern_type"),
+                        "pattern": spec.get("pattern"),
+                        "target_selectivities": targets_str,
+                        "match_count": match_count,
+                    },
+                )
+            )
+
+    for kind in _CSV_KIND_ORDER:
+        rows_csv.extend(rows_by_kind[kind])
+
+    # best_select_col comes from the first selectivity-kind template.
+    best_select_col = None
+    sel_key = next(
+        (t.get("report_key") or t["name"] for t in workload["queries"] if t["kind"] == "selectivity"),
+        None,
+    )
+    if sel_key is not None:
+        avg_selectivity_ms: Dict[str, float] = {}
+        for col, items in queries[sel_key].items():
+            ms_values = [r["median_ms"] for r in items if r.get("median_ms") is not None]
+            if ms_values:
+                avg_selectivity_ms[col] = sum(ms_values) / len(ms_values)
+        if avg_selectivity_ms:
+            best_select_col = min(avg_selectivity_ms.items(), key=lambda kv: kv[1])
+
+    return {
+        "queries": queries,
+        "best_select_col": best_select_col[0] if best_select_col else None,
+        "best_select_col_avg_median_ms": best_select_col[1] if best_select_col else None,
+    }